@@ -0,0 +1,104 @@
+"""Throughput of GET /api/v1/workstations/ with concurrent clients.
+
+Compares the previous style of handler (`async def` calling the blocking sync
+Session on the event loop thread) with the async session the routers now use.
+A per-statement delay (--latency-ms) emulates a networked database server; it is
+applied inside the DBAPI call, so it blocks the event loop only on the sync path.
+Concurrency is kept within the pool size (5 + 10 overflow): beyond it the sync
+path deadlocks, since a handler waiting for a connection blocks the loop that
+would release one.
+
+    python benchmarks/bench_async_db.py --rows 5000 --latency-ms 2
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Timer, configure_temp_database, report, seed_workstations  # noqa: E402
+
+
+def install_latency(engine, async_engine, latency: float) -> None:
+    """Sleep `latency` seconds in the DBAPI thread for every statement executed."""
+    from sqlalchemy import event
+
+    def _sleep(statement):
+        time.sleep(latency)
+
+    @event.listens_for(engine, "connect")
+    def _sync_latency(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(_sleep)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _async_latency(dbapi_connection, connection_record):
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(_sleep))
+
+
+def build_blocking_app():
+    """An app serving the list endpoint the way it was written before the async session."""
+    from typing import List
+    from fastapi import Depends, FastAPI
+    from sqlmodel import Session, select
+    from byocruda.core.database import get_db_session
+    from byocruda.models.models import Workstation, WorkstationPublic
+
+    app = FastAPI()
+
+    @app.get("/api/v1/workstations/", response_model=List[WorkstationPublic])
+    async def get_workstations(session: Session = Depends(get_db_session), skip: int = 0, limit: int = 100):
+        return session.exec(select(Workstation).offset(skip).limit(limit)).all()
+
+    return app
+
+
+async def drive(app, concurrency: int, requests: int, limit: int, rows: int) -> float:
+    """Issue `requests` list requests from `concurrency` clients, returning requests/sec."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    remaining = iter(range(requests))
+
+    async def worker(client):
+        for i in remaining:
+            response = await client.get("/api/v1/workstations/", params={"skip": (i * limit) % rows, "limit": limit})
+            response.raise_for_status()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        with Timer() as timer:
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return requests / timer.elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--concurrency", default="1,4,8,15")
+    args = parser.parse_args()
+
+    configure_temp_database()
+    from byocruda.core.database import async_engine, engine
+    from byocruda.main import app
+
+    seed_workstations(engine, args.rows)
+    install_latency(engine, async_engine, args.latency_ms / 1000)
+    blocking_app = build_blocking_app()
+
+    results = []
+    for concurrency in [int(c) for c in args.concurrency.split(",")]:
+        blocking = asyncio.run(drive(blocking_app, concurrency, args.requests, args.limit, args.rows))
+        async_ = asyncio.run(drive(app, concurrency, args.requests, args.limit, args.rows))
+        results.append([concurrency, f"{blocking:.0f}", f"{async_:.0f}", f"{async_ / blocking:.2f}x"])
+    report(
+        f"GET /api/v1/workstations/ limit={args.limit}, {args.latency_ms} ms per statement (requests/sec)",
+        ["clients", "sync session", "async session", "speedup"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Concurrent read/write throughput of SQLite under each database profile.
+
+Reader threads page through workstations while writer threads update random
+rows, each on its own pooled connection of a sync engine built from the profile.
+"baseline" is the configuration before profiles existed: rollback journal, so
+readers wait behind writers and some operations fail with "database is locked".
+`bulk_load` keeps a deliberately small pool for a single writer, so with many
+readers its writers mostly wait for a connection.
+
+    python benchmarks/bench_db_profile.py --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import configure_temp_database, report, seed_workstations  # noqa: E402
+
+
+def run_profile(url: str, profile, args) -> list:
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from byocruda.core.config import DatabaseSettings
+    from byocruda.core.database import create_db_engine
+
+    # No profile: the pool settings that used to be hardcoded and only the foreign keys PRAGMA
+    database = DatabaseSettings(url=url, echo=False, profile=profile)
+    engine = create_db_engine(database)
+    seed_workstations(engine, args.rows)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def reader():
+        while time.perf_counter() < deadline:
+            offset = random.randrange(0, args.rows - 50)
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT * FROM workstations ORDER BY workstation_id LIMIT 50 OFFSET :o"), {"o": offset}
+                    ).all()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def writer():
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    for _ in range(args.batch):
+                        conn.execute(
+                            text("UPDATE workstations SET notes = :n WHERE workstation_id = :i"),
+                            {"n": str(time.time()), "i": random.randrange(1, args.rows + 1)},
+                        )
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return [
+        profile or "baseline",
+        database.sqlite.journal_mode or "DELETE",
+        f"{counts['reads'] / args.seconds:.0f}",
+        f"{counts['writes'] / args.seconds:.0f}",
+        counts["errors"],
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=10, help="updates per write transaction")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--profiles", default="baseline,dev,read_heavy,bulk_load")
+    args = parser.parse_args()
+
+    tmp_dir = configure_temp_database()
+    results = []
+    for name in args.profiles.split(","):
+        profile = None if name == "baseline" else name
+        results.append(run_profile(f"sqlite:///{tmp_dir / f'{name}.db'}", profile, args))
+    report(
+        f"{args.readers} readers / {args.writers} writers for {args.seconds}s on {args.rows} rows",
+        ["profile", "journal", "reads/sec", "write txns/sec", "errors"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Load test of the main endpoints against a seeded dataset.
+
+Seeds a deterministic inventory of --size workstations (10k, 100k, 1m or any
+number; users and departments scale with it), then drives the real ASGI app
+through an in-process client with --concurrency concurrent clients, one
+scenario at a time:
+
+    list_workstations   GET  /api/v1/workstations/?department_id=..&limit=100
+    list_users          GET  /api/v1/users/?department_id=..&limit=100
+    workstation_detail  GET  /api/v1/workstations/{id}     (user and department)
+    user_detail         GET  /api/v1/users/{id}            (department and workstations)
+    create_workstation  POST /api/v1/workstations/
+    patch_workstation   PATCH /api/v1/workstations/{id}
+
+Latency percentiles (p50/p95/p99) and throughput per scenario are printed and
+written to --output as JSON; --baseline compares against an earlier result file.
+
+    python benchmarks/bench_load.py --size 100k --requests 1000 --output results.json
+    python benchmarks/bench_load.py --size 100k --baseline results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import REPO_ROOT, Timer, configure_temp_database, percentiles, report, seed_inventory  # noqa: E402
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# A scenario turns a request number into (method, url, json body)
+Scenario = Callable[[int], Tuple[str, str, Any]]
+
+
+def build_scenarios(counts: Dict[str, int], seed: int) -> Dict[str, Scenario]:
+    rng = random.Random(seed)
+    # Warm-up requests use the scenarios too, so new hostnames come from one sequence
+    created = itertools.count()
+    departments, users, workstations = counts["departments"], counts["users"], counts["workstations"]
+    return {
+        "list_workstations": lambda i: ("GET", f"/api/v1/workstations/?department_id={rng.randint(1, departments)}&limit=100", None),
+        "list_users": lambda i: ("GET", f"/api/v1/users/?department_id={rng.randint(1, departments)}&limit=100", None),
+        "workstation_detail": lambda i: ("GET", f"/api/v1/workstations/{rng.randint(1, workstations)}", None),
+        "user_detail": lambda i: ("GET", f"/api/v1/users/{rng.randint(1, users)}", None),
+        "create_workstation": lambda i: ("POST", "/api/v1/workstations/", {
+            "hostname": f"load{seed}-{next(created):08d}", "type_id": rng.randint(1, counts["workstation_types"]),
+            "user_id": rng.randint(1, users), "department_id": rng.randint(1, departments), "video_ram_gb": 16,
+        }),
+        "patch_workstation": lambda i: ("PATCH", f"/api/v1/workstations/{rng.randint(1, workstations)}", {
+            "notes": f"load test {i}",
+        }),
+    }
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    next_request = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in next_request:
+            method, url, body = scenario(i)
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "requests": requests,
+        "errors": errors,
+        "concurrency": concurrency,
+        "throughput_rps": requests / timer.elapsed,
+        "latency_ms": {name: value * 1000 for name, value in percentiles(latencies).items()},
+    }
+
+
+async def drive(app, scenarios: Dict[str, Scenario], requests: int, concurrency: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    # Handler exceptions count as 500s instead of stopping the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, scenario in scenarios.items():
+            await run_scenario(client, scenario, min(50, requests), concurrency)  # warm up
+            results[name] = await run_scenario(client, scenario, requests, concurrency)
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="10k", help="workstations: 10k, 100k, 1m or a number")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", default=None, help="database profile, e.g. read_heavy")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier --output file to compare with")
+    args = parser.parse_args()
+    size = SIZES.get(args.size.lower()) or int(args.size)
+
+    replacements = {'profile = "dev"': f'profile = "{args.profile}"'} if args.profile else {}
+    configure_temp_database(replacements=replacements)
+    from byocruda.core.config import settings
+    from byocruda.core.database import engine
+    from byocruda.main import app
+
+    with Timer() as seeding:
+        counts = seed_inventory(engine, size, seed=args.seed)
+    print(f"Seeded {counts} in {seeding.elapsed:.1f}s")
+
+    results = asyncio.run(drive(app, build_scenarios(counts, args.seed), args.requests, args.concurrency))
+    document = {
+        "meta": {
+            "version": settings.api.version,
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database_profile": settings.database.profile,
+            "seed": args.seed,
+        },
+        "dataset": counts,
+        "results": results,
+    }
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+    columns = ["scenario", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors"] + (["p95 vs baseline"] if baseline else [])
+    rows = []
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        row = [name, f"{result['throughput_rps']:.0f}", f"{latency['p50']:.1f}", f"{latency['p95']:.1f}",
+               f"{latency['p99']:.1f}", result["errors"]]
+        if baseline:
+            before = baseline.get(name, {}).get("latency_ms", {}).get("p95")
+            row.append(f"{latency['p95'] / before:.2f}x" if before else "-")
+        rows.append(row)
+    report(f"{size} workstations, {args.concurrency} concurrent clients, {args.requests} requests per scenario", columns, rows)
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Requests/sec of GET / with logging off, in development mode and in production mode.
+
+GET / logs one INFO record per request. "off" raises the level above it;
+"development" writes colorized text to stderr and the log file on the request's
+thread; "production" formats JSON and hands it to loguru's background writer.
+stderr is sent to /dev/null so the terminal does not set the pace.
+
+    python benchmarks/bench_logging.py --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Timer, configure_temp_database, report  # noqa: E402
+
+
+async def drive(app, requests: int, concurrency: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                (await client.get("/")).raise_for_status()
+
+        with Timer() as timer:
+            await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return requests / timer.elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    configure_temp_database(replacements={'level = "WARNING"': 'level = "INFO"'})
+    sys.stderr = open(os.devnull, "w")
+    from byocruda.core.config import settings
+    from byocruda.core.logging import log, setup_logging
+    from byocruda.main import create_application
+
+    app = create_application()
+    original = settings.logging
+    results = []
+    for name, changes in (
+        ("off", {"level": "ERROR"}),
+        ("development", {"mode": "development"}),
+        ("production", {"mode": "production"}),
+    ):
+        settings.logging = original.model_copy(update=changes)
+        setup_logging()
+        asyncio.run(drive(app, 200, args.concurrency))  # warm up
+        results.append(asyncio.run(drive(app, args.requests, args.concurrency)))
+        log.complete()
+    off = results[0]
+    report(
+        f"GET / with logging (req/s, {args.concurrency} concurrent clients)",
+        ["off", "development", "production", "development cost", "production cost"],
+        [[f"{r:.0f}" for r in results] + [f"{(1 / r - 1 / off) * 1e6:.0f} us/req" for r in results[1:]]],
+    )
+
+
+if __name__ == "__main__":
+    main()
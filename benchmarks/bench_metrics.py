@@ -0,0 +1,61 @@
+"""Overhead of the request metrics middleware.
+
+Times `RequestMetrics.record()` on its own, then requests/sec of GET / (the
+cheapest route, so the middleware's share is as large as it gets) on an
+application built with `[metrics] enabled = false` and one built with it on.
+
+    python benchmarks/bench_metrics.py --requests 5000
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Timer, configure_temp_database, report  # noqa: E402
+
+
+async def drive(app, requests: int) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        with Timer() as timer:
+            for _ in range(requests):
+                (await client.get("/")).raise_for_status()
+    return requests / timer.elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    configure_temp_database()
+    from byocruda.core.config import settings
+    from byocruda.core.metrics import RequestMetrics
+    from byocruda.main import create_application
+
+    metrics = RequestMetrics(settings.metrics.latency_buckets, settings.metrics.size_buckets)
+    with Timer() as timer:
+        for _ in range(args.records):
+            metrics.record("GET", "/api/v1/users/{user_id}", 200, 0.003, 512)
+    record_us = timer.elapsed / args.records * 1e6
+
+    results = []
+    for enabled in (False, True):
+        settings.metrics.enabled = enabled
+        app = create_application()
+        asyncio.run(drive(app, 200))  # warm up
+        results.append(asyncio.run(drive(app, args.requests)))
+    disabled, enabled = results
+    report(
+        "Request metrics overhead",
+        ["record() us", "GET / req/s without", "with metrics", "overhead per request"],
+        [[f"{record_us:.2f}", f"{disabled:.0f}", f"{enabled:.0f}", f"{(1 / enabled - 1 / disabled) * 1e6:.0f} us"]],
+    )
+
+
+if __name__ == "__main__":
+    main()
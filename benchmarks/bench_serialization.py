@@ -0,0 +1,66 @@
+"""Rows/sec of GET /api/v1/workstations/ at a large page size, regular vs fast responses.
+
+The regular path loads ORM objects and lets FastAPI validate and serialize each
+row through `response_model`; the fast path (`[api] fast_responses = true`)
+selects only the public columns and encodes the rows straight to JSON bytes
+(with orjson when it is installed).
+
+    python benchmarks/bench_serialization.py --rows 20000 --limit 1000
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import Timer, configure_temp_database, report, seed_workstations  # noqa: E402
+
+
+async def drive(app, requests: int, limit: int, rows: int) -> float:
+    """Page through the table `requests` times with cursors, returning rows/sec."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    received = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        with Timer() as timer:
+            cursor = None
+            for _ in range(requests):
+                params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+                response = await client.get("/api/v1/workstations/", params=params)
+                response.raise_for_status()
+                received += len(response.json())
+                cursor = response.headers.get("X-Next-Cursor")
+    return received / timer.elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    configure_temp_database()
+    from byocruda.core.config import settings
+    from byocruda.core.database import engine
+    from byocruda.core.serialization import orjson
+    from byocruda.main import app
+
+    seed_workstations(engine, args.rows)
+
+    results = []
+    for fast in (False, True):
+        settings.api.fast_responses = fast
+        asyncio.run(drive(app, 2, args.limit, args.rows))  # warm up
+        results.append(asyncio.run(drive(app, args.requests, args.limit, args.rows)))
+    regular, fast = results
+    report(
+        f"GET /api/v1/workstations/ limit={args.limit} (rows/sec, encoder: {'orjson' if orjson else 'json'})",
+        ["regular", "fast", "speedup"],
+        [[f"{regular:.0f}", f"{fast:.0f}", f"{fast / regular:.2f}x"]],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Process startup cost: import time, lifespan startup and time to the first request.
+
+Every run is a fresh interpreter, as a new worker or CLI job would be:
+
+    cli import      import byocruda.core.database (what the CLI commands need)
+    app import      import byocruda.main (settings, models, routers, app)
+    startup         the lifespan: init_db() and friends
+    first request   GET /api/v1/workstations/ right after startup
+    process         wall time of the whole child process, interpreter start included
+
+"new database" starts each run without a database file, so the schema is
+created; "existing database" reuses a database initialized by an earlier run.
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from common import REPO_ROOT, configure_temp_database, report  # noqa: E402
+
+CLI_CHILD = """
+import json, time
+start = time.perf_counter()
+import byocruda.core.database
+print(json.dumps({"cli import": time.perf_counter() - start}))
+"""
+
+APP_CHILD = """
+import json, time
+start = time.perf_counter()
+import byocruda.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(byocruda.main.app)
+begin = time.perf_counter()
+with client:
+    started = time.perf_counter()
+    client.get("/api/v1/workstations/?limit=10").raise_for_status()
+    answered = time.perf_counter()
+print(json.dumps({
+    "app import": imported - start,
+    "startup": started - begin,
+    "first request": answered - started,
+}))
+"""
+
+
+def run_child(code: str) -> Dict[str, float]:
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT / "src"))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process"] = time.perf_counter() - start
+    return timings
+
+
+def median_ms(runs: List[Dict[str, float]], name: str) -> str:
+    return f"{statistics.median(run[name] for run in runs) * 1000:.0f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    database = configure_temp_database() / "bench.db"
+    run_child(APP_CHILD)  # warm the OS file cache and the bytecode cache
+
+    rows = []
+    cli_runs = [run_child(CLI_CHILD) for _ in range(args.runs)]
+    rows.append(["cli", median_ms(cli_runs, "cli import"), "-", "-", "-", median_ms(cli_runs, "process")])
+    for name, fresh in (("new database", True), ("existing database", False)):
+        runs = []
+        for _ in range(args.runs):
+            if fresh:
+                for path in database.parent.glob(database.name + "*"):  # with its -wal and -shm files
+                    path.unlink()
+            runs.append(run_child(APP_CHILD))
+        rows.append([name, "-", median_ms(runs, "app import"), median_ms(runs, "startup"),
+                     median_ms(runs, "first request"), median_ms(runs, "process")])
+    report(
+        f"Startup (median ms of {args.runs} runs)",
+        ["case", "cli import", "app import", "startup", "first request", "process"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
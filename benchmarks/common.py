@@ -0,0 +1,94 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database: call `configure_temp_database()`
+before importing anything from `byocruda` so the global settings pick it up.
+"""
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def configure_temp_database(extra_toml: str = "", replacements: Optional[Dict[str, str]] = None) -> Path:
+    """Write a copy of config/config.toml pointing at a temporary database and select it."""
+    tmp_dir = Path(tempfile.mkdtemp(prefix="byocruda-bench-"))
+    config = (REPO_ROOT / "config" / "config.toml").read_text()
+    config = config.replace('url = "sqlite:///./byocruda.db"', f'url = "sqlite:///{tmp_dir / "bench.db"}"')
+    config = config.replace("debug = true", "debug = false")
+    config = config.replace('level = "DEBUG"', 'level = "WARNING"')
+    config = config.replace('file_path = "logs/byocruda.log"', f'file_path = "{tmp_dir / "byocruda.log"}"')
+    config = config.replace('slow_query_file_path = "logs/slow_queries.log"', f'slow_query_file_path = "{tmp_dir / "slow_queries.log"}"')
+    for old, new in (replacements or {}).items():
+        config = config.replace(old, new)
+    (tmp_dir / "config.toml").write_text(config + extra_toml)
+    os.environ["BYOCRUDA_CONFIG"] = str(tmp_dir / "config.toml")
+    return tmp_dir
+
+
+def seed_workstations(engine, rows: int, users: int = 500, departments: int = 20, types: int = 8) -> None:
+    """Create the schema and fill it with `rows` workstations using executemany inserts."""
+    from sqlmodel import SQLModel
+    from byocruda.models.models import Department, User, Workstation, WorkstationType
+
+    SQLModel.metadata.drop_all(bind=engine)
+    SQLModel.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Department.__table__.insert(), [{"name": f"department{i}"} for i in range(1, departments + 1)])
+        conn.execute(WorkstationType.__table__.insert(), [{"workstation_type": f"Type{i}"} for i in range(1, types + 1)])
+        conn.execute(User.__table__.insert(), [
+            {"userDN": f"user{i}", "name": f"User {i}", "department_id": i % departments + 1, "status": 1}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(Workstation.__table__.insert(), [
+            {
+                "hostname": f"ws{i:08d}",
+                "type_id": i % types + 1,
+                "user_id": i % users + 1,
+                "department_id": i % departments + 1,
+                "video_ram_gb": 8 * (i % 6),
+                "system_ram_gb": 16 * (i % 8 + 1),
+                "total_storage_tb": (i % 4 + 1) / 2,
+                "hardware_description": f"Workstation model {i % 13} with {8 * (i % 6)} GB GPU",
+            }
+            for i in range(1, rows + 1)
+        ])
+
+
+def seed_inventory(engine, workstations: int, seed: int = 0) -> Dict[str, int]:
+    """Replace the database contents with the deterministic inventory of `byocruda seed`; returns the row counts."""
+    from byocruda.core.seeding import SeedPlan, seed_database
+
+    return seed_database(engine, SeedPlan(workstations), seed=seed, drop_indexes=workstations >= 100_000)
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99, mean and max of `samples`."""
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else list(samples) * 99
+    return {
+        "p50": cuts[49], "p95": cuts[94], "p99": cuts[98],
+        "mean": statistics.fmean(samples), "max": max(samples),
+    }
+
+
+def report(title: str, columns: List[str], rows: List[List[object]]) -> None:
+    """Print a fixed-width results table."""
+    print(f"\n{title}")
+    widths = [max(len(str(c)), *(len(str(r[i])) for r in rows)) for i, c in enumerate(columns)]
+    print("  ".join(str(c).rjust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(v).rjust(w) for v, w in zip(row, widths)))
+
+
+class Timer:
+    """Context manager measuring wall-clock seconds."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,51 @@
+import json
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Type
+
+from fastapi import HTTPException, Request
+from sqlmodel import SQLModel
+
+from byocruda.core.bulk import BulkError, InvalidPatch
+
+
+def bulk_openapi_body(create_model: Type[SQLModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody accepting either a JSON array or NDJSON of `create_model` records."""
+    schema = {"type": "array", "items": create_model.model_json_schema()}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": schema},
+                "application/x-ndjson": {"schema": {"type": "string", "description": f"One {create_model.__name__} JSON object per line"}},
+            },
+        }
+    }
+
+
+async def read_records(request: Request, max_records: int) -> List[Any]:
+    """Read a bulk request body sent either as a JSON array or as NDJSON."""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            records = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            records = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    if len(records) > max_records:
+        raise HTTPException(status_code=413, detail=f"At most {max_records} records are accepted per request")
+    return records
+
+
+@contextmanager
+def bulk_errors() -> Iterator[None]:
+    """Answer the bulk core's errors with 400, or 422 for a patch the data rejects."""
+    try:
+        yield
+    except InvalidPatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except BulkError as e:
+        raise HTTPException(status_code=400, detail=str(e))
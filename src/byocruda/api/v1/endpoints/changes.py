@@ -0,0 +1,88 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.changes import (
+    CHANGE_SEQ_HEADER,
+    ChangesExpired,
+    UnknownTables,
+    change_events,
+    check_retained,
+    parse_tables,
+    read_changes,
+    settled_seq,
+)
+from byocruda.core.config import settings
+from byocruda.core.database import AsyncSessionLocal, change_feed, get_read_session
+from byocruda.models.models import ChangePublic
+
+router = APIRouter()
+
+def _parse_tables(tables: Optional[str]) -> List[str]:
+    try:
+        return parse_tables(tables)
+    except UnknownTables as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _check_retained(session: AsyncSession, since: int) -> None:
+    try:
+        await check_retained(session, since)
+    except ChangesExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+@router.get("/", response_model=List[ChangePublic])
+async def get_changes(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    response: Response,
+    since: Optional[int] = None,
+    limit: int = 100,
+    tables: Optional[str] = None
+):
+    """Inserts, updates and deletes after seq `since`, oldest first; X-Change-Seq is the `since` of the next call.
+
+    Without `since` only the current X-Change-Seq is returned: take it before a full
+    reload, then poll (or stream) from it. A `since` older than the retained log answers 410.
+    The position stops before a seq still missing on PostgreSQL, see `contiguous`.
+    """
+    table_names = _parse_tables(tables)
+    # Read first, so changes committed meanwhile are not skipped by the returned position
+    head = await settled_seq(session, settings.changes.gap_wait_seconds)
+    changes = []
+    if since is not None:
+        await _check_retained(session, since)
+        changes = await read_changes(session, since, tables=table_names, limit=limit, until=head)
+    if len(changes) == limit:
+        response.headers[CHANGE_SEQ_HEADER] = str(changes[-1]["seq"])
+    else:
+        # A replica behind the client's position must not move it backwards
+        response.headers[CHANGE_SEQ_HEADER] = str(max(head, since or 0))
+    return changes
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_changes(
+    *,
+    request: Request,
+    since: Optional[int] = None,
+    tables: Optional[str] = None
+):
+    """Server-sent events (text/event-stream) of the changes after `since`, then live ones as they are made.
+
+    Each event's id is its seq, so a reconnecting EventSource resumes with Last-Event-ID.
+    Streams share one tail of the change log per worker process.
+    """
+    table_names = _parse_tables(tables)
+    last_event_id = request.headers.get("last-event-id", "")
+    if since is None and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is not None:
+        # The primary, which the feed tails too; no session is held for the life of the stream
+        async with AsyncSessionLocal() as session:
+            await _check_retained(session, since)
+    return StreamingResponse(
+        change_events(change_feed, since, table_names, heartbeat_seconds=settings.changes.heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from byocruda.core.logging import log
 
@@ -11,21 +13,108 @@ from byocruda.models.models import (
     Department, 
     DepartmentCreate, 
     DepartmentPublicWithUsers,
+    DepartmentPublicExpanded,
     DepartmentUpdate
     )
-from byocruda.core.database import get_db_session
+from byocruda.core.cache import DEPARTMENTS, cache_key, invalidate_departments, reference_cache
+from byocruda.core.conditional import compute_row_validators, compute_validators, conditional_response
+from byocruda.core.database import get_async_db_session, get_read_session, load_on_primary, reads_from_primary
+from byocruda.core.export import ExportFormat, export_response, select_public_columns
+from byocruda.core.expand import expand_options, expand_rows, parse_expand
+from byocruda.core.fieldsets import parse_fields, sparse_columns, sparse_detail
+from byocruda.core.pagination import NEXT_CURSOR_HEADER, next_cursor, order_by_sort, paginate
+from byocruda.core.serialization import FastJSONResponse, select_fast_columns
 
 
 router = APIRouter()
 
-@router.get("/", response_model=List[DepartmentPublic])
+# Columns the list endpoint may be sorted (and keyset paged) by, besides the primary key
+DEPARTMENT_SORT_COLUMNS = {
+    "name": Department.name,
+}
+# Relationships that can be requested with ?expand=
+DEPARTMENT_RELATIONSHIPS = {
+    "users": Department.users,
+    "workstations": Department.workstations,
+}
+
+@router.get("/", response_model=List[DepartmentPublicExpanded], response_model_exclude_unset=True)
 async def get_departments(
-    session: Session = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    expand_names = parse_expand(expand, DEPARTMENT_RELATIONSHIPS)
+    field_names = parse_fields(fields, DepartmentPublic, "department_id", expand_names)
+
+    async def load_projected_page(session: AsyncSession):
+        columns = sparse_columns(field_names, columns=DEPARTMENT_SORT_COLUMNS, primary_key=Department.department_id, sort=sort)
+        statement = paginate(
+            select_fast_columns(Department, DepartmentPublic, columns),
+            columns=DEPARTMENT_SORT_COLUMNS,
+            primary_key=Department.department_id,
+            sort=sort, cursor=cursor, skip=skip, limit=limit
+        )
+        departments = (await session.exec(statement)).all()
+        page_cursor = next_cursor(departments, columns=DEPARTMENT_SORT_COLUMNS, primary_key=Department.department_id, sort=sort, limit=limit)
+        validators = compute_row_validators("departments", departments, "department_id")
+        return [{name: getattr(row, name) for name in field_names} for row in departments], page_cursor, validators
+
+    async def load_page(session: AsyncSession):
+        if field_names:
+            return await load_projected_page(session)
+        statement = paginate(
+            select(Department).options(*expand_options(expand_names, DEPARTMENT_RELATIONSHIPS)),
+            columns=DEPARTMENT_SORT_COLUMNS,
+            primary_key=Department.department_id,
+            sort=sort, cursor=cursor, skip=skip, limit=limit
+        )
+        departments = (await session.exec(statement)).all()
+        page_cursor = next_cursor(departments, columns=DEPARTMENT_SORT_COLUMNS, primary_key=Department.department_id, sort=sort, limit=limit)
+        rows = expand_rows(departments, DepartmentPublicExpanded, expand_names)
+        validators = compute_validators(departments, expand_names)
+        return [row.model_dump(exclude_unset=True) for row in rows], page_cursor, validators
+
+    # Expanded pages embed users and workstations, which change too often to cache
+    if expand_names:
+        rows, page_cursor, validators = await load_page(session)
+    else:
+        rows, page_cursor, validators = await reference_cache.get_or_load(
+            cache_key(DEPARTMENTS, "list", skip, limit, sort, cursor, ",".join(field_names)),
+            lambda: load_on_primary(load_page)
+        )
+    if page_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
+    not_modified = conditional_response(request, response, validators)
+    if not_modified:
+        return not_modified
+    if field_names:
+        # Projected rows lack required fields of the response model
+        return FastJSONResponse(rows, headers=dict(response.headers))
+    return rows
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_departments(
+    *,
+    request: Request,
+    format: ExportFormat = "ndjson",
+    sort: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    departments=session.exec(select(Department).offset(skip).limit(limit)).all()
-    return departments
+    """Stream every department as NDJSON or CSV without materializing the table in memory."""
+    statement = order_by_sort(
+        select_public_columns(Department, DepartmentPublic, parse_fields(fields, DepartmentPublic, "department_id")),
+        columns=DEPARTMENT_SORT_COLUMNS,
+        primary_key=Department.department_id,
+        sort=sort
+    )
+    return export_response(statement, format=format, filename="departments", use_primary=reads_from_primary(request))
 
 # @router.get("/{department_id}", response_model=DepartmentPublic)
 # async def get_department(
@@ -43,51 +132,74 @@ async def get_departments(
 async def get_department(
     *,
     department_id: int,
-    session: Session = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
     
 ):
-    department = session.get(Department, department_id)
-    if not department:
-        raise HTTPException(status_code=404, detail="Department not found")
+    field_names = parse_fields(fields, DepartmentPublic, "department_id")
+    if field_names:
+        return await sparse_detail(
+            session, request, response, model=Department, public_model=DepartmentPublic,
+            primary_key="department_id", identity=department_id, fields=field_names, not_found="Department not found"
+        )
+
+    async def load_department(session: AsyncSession):
+        department = await session.get(Department, department_id, options=expand_options(["users"], DEPARTMENT_RELATIONSHIPS))
+        if not department:
+            raise HTTPException(status_code=404, detail="Department not found")
+        validators = compute_validators([department], ["users"], detail=True)
+        return DepartmentPublicWithUsers.model_validate(department).model_dump(), validators
+
+    department, validators = await reference_cache.get_or_load(
+        cache_key(DEPARTMENTS, "detail", department_id), lambda: load_on_primary(load_department)
+    )
+    not_modified = conditional_response(request, response, validators)
+    if not_modified:
+        return not_modified
     return department
 
 
 
 @router.post("/", response_model=DepartmentPublic)
-async def create_department(*, session: Session = Depends(get_db_session), department: DepartmentCreate):
+async def create_department(*, session: AsyncSession = Depends(get_async_db_session), department: DepartmentCreate):
     db_department = Department.model_validate(department)
     session.add(db_department)
-    session.commit()
-    session.refresh(db_department)
+    await session.commit()
+    await session.refresh(db_department)
+    invalidate_departments(db_department.department_id)
     return db_department
 
 @router.delete("/{department_id}")
 async def delete_department(
     *,
-    session : Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     department_id: int
 ):
-    department = session.get(Department, department_id)
+    department = await session.get(Department, department_id)
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
-    session.delete(department)
-    session.commit()
+    await session.delete(department)
+    await session.commit()
+    invalidate_departments(department_id)
     return { "deleted": True }
 
 @router.patch("/{department_id}", response_model=DepartmentPublic)
 async def update_department(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     department_id: int,
     department: DepartmentUpdate
 ):
-    db_department = session.get(Department, department_id)
+    db_department = await session.get(Department, department_id)
     if not db_department:
         raise HTTPException(status_code=404, detail="Department not found")
     department_data = department.model_dump(exclude_unset=True)
     for key, value in department_data.items():
         setattr(db_department, key, value)
     session.add(db_department)
-    session.commit()
-    session.refresh(db_department)
-    return db_department
\ No newline at end of file
+    await session.commit()
+    await session.refresh(db_department)
+    invalidate_departments(department_id)
+    return db_department
@@ -1,5 +1,8 @@
-from byocruda.models.models import *
-
 from byocruda.api.v1.endpoints.departments import router as departments_router
 from byocruda.api.v1.endpoints.users import router as users_router
 from byocruda.api.v1.endpoints.workstations import router as workstations_router
+from byocruda.api.v1.endpoints.imports import router as imports_router
+from byocruda.api.v1.endpoints.search import router as search_router
+from byocruda.api.v1.endpoints.stats import router as stats_router
+from byocruda.api.v1.endpoints.changes import router as changes_router
+from byocruda.api.v1.endpoints.other_assets import router as other_assets_router
@@ -0,0 +1,109 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from byocruda.core.config import settings
+from byocruda.core.database import get_async_db_session
+from byocruda.core.imports import (
+    ImportFormat,
+    ImportResourceName,
+    create_import_job,
+    infer_format,
+    run_import_job,
+)
+from byocruda.models.models import (
+    ImportJob,
+    ImportJobError,
+    ImportJobErrorPublic,
+    ImportJobPublic,
+)
+
+router = APIRouter()
+
+async def spool_upload(request: Request) -> Path:
+    """Stream a request body to a file in the upload directory without buffering it in memory."""
+    upload_dir = Path(settings.imports.upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=upload_dir, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in request.stream():
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        # E.g. the client disconnected mid-upload
+        Path(name).unlink(missing_ok=True)
+        raise
+    return Path(name)
+
+@router.post("/{resource}", response_model=ImportJobPublic, status_code=202)
+async def create_import(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    request: Request,
+    background_tasks: BackgroundTasks,
+    resource: ImportResourceName,
+    format: Optional[ImportFormat] = None,
+    filename: Optional[str] = None,
+    upsert: bool = False
+):
+    """Upload a CSV or NDJSON file as the raw request body and import it in the background."""
+    content_type = request.headers.get("content-type", "")
+    format = format or infer_format(filename or "") or ("csv" if "csv" in content_type else "ndjson" if "ndjson" in content_type else None)
+    if format is None:
+        raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=csv or format=ndjson")
+    path = await spool_upload(request)
+    try:
+        job = await session.run_sync(create_import_job, resource, format, filename, upsert)
+    except BaseException:
+        # No job will ever read (and remove) the spooled file
+        path.unlink(missing_ok=True)
+        raise
+    # Runs in the threadpool after the response is sent, using its own sync session
+    background_tasks.add_task(run_import_job, job.import_job_id, path, remove_file=True)
+    return job
+
+@router.get("/", response_model=List[ImportJobPublic])
+async def get_imports(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    skip: int = 0,
+    limit: int = 100
+):
+    statement = select(ImportJob).order_by(ImportJob.import_job_id.desc()).offset(skip).limit(limit)
+    return (await session.exec(statement)).all()
+
+@router.get("/{import_job_id}", response_model=ImportJobPublic)
+async def get_import(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    import_job_id: int
+):
+    job = await session.get(ImportJob, import_job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+@router.get("/{import_job_id}/errors", response_model=List[ImportJobErrorPublic])
+async def get_import_errors(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    import_job_id: int,
+    skip: int = 0,
+    limit: int = 100
+):
+    if not await session.get(ImportJob, import_job_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    statement = (
+        select(ImportJobError)
+        .where(ImportJobError.import_job_id == import_job_id)
+        .order_by(ImportJobError.row_number)
+        .offset(skip)
+        .limit(limit)
+    )
+    return (await session.exec(statement)).all()
@@ -1,5 +1,143 @@
-from fastapi import APIRouter
+from typing import List, Optional
 
-router = APIRouter()
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.assets import CompiledAsset
+from byocruda.core.conditional import compute_row_validators, compute_validators, conditional_response
+from byocruda.core.database import get_async_db_session, get_read_session, reads_from_primary
+from byocruda.core.export import ExportFormat, export_response, select_public_columns
+from byocruda.core.fieldsets import parse_fields, sparse_columns, sparse_detail
+from byocruda.core.filters import filter_params
+from byocruda.core.pagination import NEXT_CURSOR_HEADER, next_cursor, order_by_sort, paginate
+from byocruda.core.serialization import fast_rows_response, select_fast_columns
+from byocruda.models.models import ASSETS
+
+
+def asset_router(asset: CompiledAsset) -> APIRouter:
+    """CRUD endpoints of one configured asset type, the same as the hand-written routers offer."""
+    router = APIRouter(tags=[asset.table])
+    Model, Public, Create, Update = asset.model, asset.public, asset.create, asset.update
+    primary_key = getattr(Model, asset.primary_key)
+    sort_columns = {name: getattr(Model, name) for name in asset.sort}
+    filters_dependency = filter_params({name: getattr(Model, name) for name in asset.filters})
+    not_found = f"{Model.__name__} not found"
+
+    @router.get("/", response_model=List[Public])
+    async def list_assets(
+        *,
+        session: AsyncSession = Depends(get_read_session),
+        request: Request,
+        response: Response,
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        filters: List = Depends(filters_dependency)
+    ):
+        field_names = parse_fields(fields, Public, asset.primary_key)
+        if field_names:
+            columns = sparse_columns(field_names, columns=sort_columns, primary_key=primary_key, sort=sort)
+            statement = select_fast_columns(Model, Public, columns)
+        else:
+            statement = select(Model)
+        statement = paginate(
+            statement.where(*filters),
+            columns=sort_columns,
+            primary_key=primary_key,
+            sort=sort, cursor=cursor, skip=skip, limit=limit
+        )
+        rows = (await session.exec(statement)).all()
+        cursor = next_cursor(rows, columns=sort_columns, primary_key=primary_key, sort=sort, limit=limit)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        if field_names:
+            validators = compute_row_validators(asset.table, rows, asset.primary_key)
+        else:
+            validators = compute_validators(rows)
+        not_modified = conditional_response(request, response, validators)
+        if not_modified:
+            return not_modified
+        if field_names:
+            return fast_rows_response(rows, Public, response, field_names)
+        return rows
+
+    @router.get("/export", response_class=StreamingResponse)
+    async def export_assets(
+        *,
+        request: Request,
+        format: ExportFormat = "ndjson",
+        sort: Optional[str] = None,
+        fields: Optional[str] = None,
+        filters: List = Depends(filters_dependency)
+    ):
+        statement = order_by_sort(
+            select_public_columns(Model, Public, parse_fields(fields, Public, asset.primary_key)).where(*filters),
+            columns=sort_columns,
+            primary_key=primary_key,
+            sort=sort
+        )
+        return export_response(statement, format=format, filename=asset.table, use_primary=reads_from_primary(request))
 
+    @router.get("/{asset_id}", response_model=Public)
+    async def get_asset(
+        *,
+        session: AsyncSession = Depends(get_read_session),
+        request: Request,
+        response: Response,
+        asset_id: int,
+        fields: Optional[str] = None
+    ):
+        field_names = parse_fields(fields, Public, asset.primary_key)
+        if field_names:
+            return await sparse_detail(
+                session, request, response, model=Model, public_model=Public,
+                primary_key=asset.primary_key, identity=asset_id, fields=field_names, not_found=not_found
+            )
+        db_asset = await session.get(Model, asset_id)
+        if not db_asset:
+            raise HTTPException(status_code=404, detail=not_found)
+        not_modified = conditional_response(request, response, compute_validators([db_asset], detail=True))
+        if not_modified:
+            return not_modified
+        return db_asset
 
+    @router.post("/", response_model=Public)
+    async def create_asset(*, session: AsyncSession = Depends(get_async_db_session), asset: Create):
+        db_asset = Model.model_validate(asset)
+        session.add(db_asset)
+        await session.commit()
+        await session.refresh(db_asset)
+        return db_asset
+
+    @router.patch("/{asset_id}", response_model=Public)
+    async def update_asset(*, session: AsyncSession = Depends(get_async_db_session), asset_id: int, asset: Update):
+        db_asset = await session.get(Model, asset_id)
+        if not db_asset:
+            raise HTTPException(status_code=404, detail=not_found)
+        for key, value in asset.model_dump(exclude_unset=True).items():
+            setattr(db_asset, key, value)
+        session.add(db_asset)
+        await session.commit()
+        await session.refresh(db_asset)
+        return db_asset
+
+    @router.delete("/{asset_id}")
+    async def delete_asset(*, session: AsyncSession = Depends(get_async_db_session), asset_id: int):
+        db_asset = await session.get(Model, asset_id)
+        if not db_asset:
+            raise HTTPException(status_code=404, detail=not_found)
+        await session.delete(db_asset)
+        await session.commit()
+        return {"deleted": True}
+
+    return router
+
+
+# One router per asset type in [assets.types], mounted under /api/v1/assets/<table>/
+router = APIRouter()
+for table, asset in ASSETS.items():
+    router.include_router(asset_router(asset), prefix=f"/{table}")
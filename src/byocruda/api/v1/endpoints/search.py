@@ -0,0 +1,22 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.database import get_read_session
+from byocruda.core.search import search
+from byocruda.schemas.schemas import SearchResult
+
+router = APIRouter()
+
+@router.get("/", response_model=List[SearchResult])
+async def search_inventory(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    q: str = Query(min_length=1, max_length=200, description="Free text; every word must match, the last one as a prefix"),
+    kind: Optional[List[Literal["users", "workstations"]]] = Query(None, description="Restrict to these kinds of records"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Full-text search over workstation hostnames, hardware descriptions and notes, and user names, notes and office locations."""
+    return await search(session, q, kinds=kind, limit=limit, offset=offset)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.database import get_read_session
+from byocruda.core.stats import get_stats
+from byocruda.schemas.schemas import InventoryStats
+
+router = APIRouter()
+
+@router.get("/", response_model=InventoryStats)
+async def get_inventory_stats(
+    *,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """Workstations and hardware totals per department and type, and users per status.
+
+    Served from summary tables kept current by every write, so the cost does not grow with the inventory.
+    """
+    return await get_stats(session)
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi import APIRouter, Request, Response, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from typing import List, Optional, Annotated, TYPE_CHECKING
 
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from byocruda.core.database import get_db_session
+from byocruda.api.v1.bulk import bulk_errors, bulk_openapi_body, read_records
+from byocruda.core.bulk import bulk_update, bulk_write, validate_records
+from byocruda.core.cache import invalidate_departments
+from byocruda.core.conditional import compute_row_validators, compute_validators, conditional_response
+from byocruda.core.config import settings
+from byocruda.core.database import get_async_db_session, get_read_session, reads_from_primary
+from byocruda.core.export import ExportFormat, export_response, select_public_columns
+from byocruda.core.expand import expand_options, expand_rows, parse_expand
+from byocruda.core.fieldsets import parse_fields, sparse_columns, sparse_detail
+from byocruda.core.filters import filter_params
+from byocruda.core.lookup import distinct_keys, lookup_response, lookup_rows, parse_ids
+from byocruda.core.pagination import NEXT_CURSOR_HEADER, next_cursor, order_by_sort, paginate
+from byocruda.core.serialization import fast_rows_response, select_fast_columns
 
+from byocruda.schemas.schemas import BulkResult, BulkUpdateResult, LookupResult, UserLookup
 from byocruda.models.models import (
     UserBase, 
     User,
@@ -13,72 +28,249 @@ from byocruda.models.models import (
     UserCreate, 
     UserPublicWithDepartment,
     UserPublicWithEverything,
+    UserPublicExpanded,
     UserUpdate
 )
 
 
 router = APIRouter()
 
-@router.get("/", response_model=List[UserPublic])
+# Columns the list endpoint may be sorted (and keyset paged) by, besides the primary key
+USER_SORT_COLUMNS = {
+    "userDN": User.userDN,
+    "name": User.name,
+}
+# Columns the list endpoint may be filtered by (eq, gt/gte/lt/lte and in)
+USER_FILTERS = filter_params({
+    "department_id": User.department_id,
+    "status": User.status,
+})
+# Relationships that can be requested with ?expand=
+USER_RELATIONSHIPS = {
+    "department": User.department,
+    "workstations": User.workstations,
+}
+
+@router.get("/", response_model=List[UserPublicExpanded], response_model_exclude_unset=True)
 async def get_users(
     *, 
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
+    request: Request,
+    response: Response,
     limit: int = 100,
-    skip: int = 0
+    skip: int = 0,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    filters: List = Depends(USER_FILTERS)
     ):
-    users=session.exec(select(User).offset(skip).limit(limit)).all()
-    return users
+    expand_names = parse_expand(expand, USER_RELATIONSHIPS)
+    field_names = parse_fields(fields, UserPublic, "user_id", expand_names)
+    # Projected pages always take the row path: only the requested columns are selected
+    if (settings.api.fast_responses or field_names) and not expand_names:
+        return await _get_users_fast(session, request, response, filters, field_names, skip=skip, limit=limit, sort=sort, cursor=cursor)
+    statement = paginate(
+        select(User).where(*filters).options(*expand_options(expand_names, USER_RELATIONSHIPS)),
+        columns=USER_SORT_COLUMNS,
+        primary_key=User.user_id,
+        sort=sort, cursor=cursor, skip=skip, limit=limit
+    )
+    users = (await session.exec(statement)).all()
+    cursor = next_cursor(users, columns=USER_SORT_COLUMNS, primary_key=User.user_id, sort=sort, limit=limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    not_modified = conditional_response(request, response, compute_validators(users, expand_names))
+    if not_modified:
+        return not_modified
+    return expand_rows(users, UserPublicExpanded, expand_names)
+
+async def _get_users_fast(session: AsyncSession, request: Request, response: Response, filters: List, fields: List[str], **page) -> Response:
+    """List page served from plain rows of the public columns (or only `fields`), encoded without pydantic."""
+    columns = sparse_columns(fields, columns=USER_SORT_COLUMNS, primary_key=User.user_id, sort=page["sort"])
+    statement = paginate(
+        select_fast_columns(User, UserPublic, columns).where(*filters),
+        columns=USER_SORT_COLUMNS,
+        primary_key=User.user_id,
+        **page
+    )
+    rows = (await session.exec(statement)).all()
+    cursor = next_cursor(rows, columns=USER_SORT_COLUMNS, primary_key=User.user_id, sort=page["sort"], limit=page["limit"])
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    not_modified = conditional_response(request, response, compute_row_validators("users", rows, "user_id"))
+    if not_modified:
+        return not_modified
+    return fast_rows_response(rows, UserPublic, response, fields)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    *,
+    request: Request,
+    format: ExportFormat = "ndjson",
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    filters: List = Depends(USER_FILTERS)
+):
+    """Stream every (matching) user as NDJSON or CSV without materializing the table in memory."""
+    statement = order_by_sort(
+        select_public_columns(User, UserPublic, parse_fields(fields, UserPublic, "user_id")).where(*filters),
+        columns=USER_SORT_COLUMNS,
+        primary_key=User.user_id,
+        sort=sort
+    )
+    return export_response(statement, format=format, filename="users", use_primary=reads_from_primary(request))
+
+@router.get("/batch", response_model=LookupResult)
+async def get_users_by_ids(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    ids: str,
+    fields: Optional[str] = None
+):
+    """Resolve many users by id (ids=1,2,3) in one response, listing the ids not found."""
+    found, missing = await lookup_rows(
+        session, model=User, public_model=UserPublic, key="user_id",
+        keys=parse_ids(ids, settings.lookup.max_keys),
+        fields=parse_fields(fields, UserPublic, "user_id"),
+        chunk_size=settings.lookup.chunk_size
+    )
+    return lookup_response(found, missing)
+
+@router.post("/lookup", response_model=LookupResult)
+async def lookup_users(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    lookup: UserLookup,
+    fields: Optional[str] = None
+):
+    """Resolve many users by userDN in one response, listing the userDNs not found."""
+    found, missing = await lookup_rows(
+        session, model=User, public_model=UserPublic, key="userDN",
+        keys=distinct_keys(lookup.userDN, settings.lookup.max_keys),
+        fields=parse_fields(fields, UserPublic, "user_id"),
+        chunk_size=settings.lookup.chunk_size
+    )
+    return lookup_response(found, missing)
 
 @router.get("/{user_id}", response_model=UserPublicWithEverything)
 async def get_user(
     *,
     user_id: int,
-    session : Session = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
 ):
-    user = session.get(User, user_id)
+    field_names = parse_fields(fields, UserPublic, "user_id")
+    if field_names:
+        return await sparse_detail(
+            session, request, response, model=User, public_model=UserPublic,
+            primary_key="user_id", identity=user_id, fields=field_names, not_found="User not found"
+        )
+    user = await session.get(
+        User,
+        user_id,
+        options=expand_options(["department", "workstations"], USER_RELATIONSHIPS)
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    not_modified = conditional_response(request, response, compute_validators([user], ["department", "workstations"], detail=True))
+    if not_modified:
+        return not_modified
     return user
 
 @router.post("/", response_model=UserPublic)
 async def create_user(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     user: UserCreate
 ):
     db_user = User.model_validate(user)
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+    # Department details embed their users
+    invalidate_departments(db_user.department_id)
     return db_user
 
+@router.post("/bulk", response_model=BulkResult, openapi_extra=bulk_openapi_body(UserCreate))
+async def bulk_create_users(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    request: Request,
+    response: Response,
+    upsert: bool = False,
+    atomic: Optional[bool] = None
+):
+    """Create (or with upsert=true, create or update by userDN) many records from a JSON array or NDJSON body."""
+    records = await read_records(request, settings.bulk.max_records)
+    rows, errors = validate_records(records, UserCreate, "userDN")
+    with bulk_errors():
+        result = await session.run_sync(
+            bulk_write, User, rows, errors,
+            natural_key="userDN",
+            primary_key="user_id",
+            upsert=upsert,
+            atomic=settings.bulk.atomic if atomic is None else atomic,
+            chunk_size=settings.bulk.chunk_size
+        )
+    if result.atomic and result.failed:
+        response.status_code = 422
+    if result.created or result.updated:
+        invalidate_departments()
+    return result
+
 @router.delete("/{user_id}")
 async def delete_user(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     user_id: int
 ):
-    user=session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    session.delete(user)
-    session.commit()
+    await session.delete(user)
+    await session.commit()
+    invalidate_departments(user.department_id)
     return {"deleted": True}
 
+@router.patch("/", response_model=BulkUpdateResult)
+async def bulk_update_users(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    patch: UserUpdate,
+    ids: Optional[str] = None,
+    return_ids: bool = False,
+    filters: List = Depends(USER_FILTERS)
+):
+    """Apply one patch to every user matching the filters (and/or ids=1,2,3) with a single UPDATE."""
+    if ids:
+        filters = [*filters, User.user_id.in_(parse_ids(ids, settings.lookup.max_keys))]
+    with bulk_errors():
+        result = await bulk_update(
+            session, User, patch.model_dump(exclude_unset=True), filters, primary_key="user_id", return_ids=return_ids
+        )
+    # Department details embed their users
+    invalidate_departments()
+    return result
+
 @router.patch("/{user_id}", response_model=UserPublic)
 async def update_user(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     user_id: int,
     user: UserUpdate
 ):
-    db_user = session.get(User, user_id)
+    db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_department_id = db_user.department_id
     user_data = user.model_dump(exclude_unset=True)
     for key,value in user_data.items():
         setattr(db_user, key, value)
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
+    invalidate_departments(previous_department_id, db_user.department_id)
     return db_user
@@ -1,8 +1,23 @@
 from typing import List, Optional, Annotated, TYPE_CHECKING
-from fastapi import APIRouter, Request, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Request, Response, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from byocruda.core.database import get_db_session
+from byocruda.api.v1.bulk import bulk_errors, bulk_openapi_body, read_records
+from byocruda.core.bulk import bulk_update, bulk_write, validate_records
+from byocruda.core.cache import WORKSTATION_TYPES, cache_key, reference_cache
+from byocruda.core.conditional import compute_row_validators, compute_validators, conditional_response
+from byocruda.core.config import settings
+from byocruda.core.database import get_async_db_session, get_read_session, load_on_primary, reads_from_primary
+from byocruda.core.export import ExportFormat, export_response, select_public_columns
+from byocruda.core.expand import expand_options, expand_rows, parse_expand
+from byocruda.core.fieldsets import parse_fields, sparse_columns, sparse_detail
+from byocruda.core.filters import filter_params
+from byocruda.core.lookup import distinct_keys, lookup_response, lookup_rows, parse_ids
+from byocruda.core.pagination import NEXT_CURSOR_HEADER, next_cursor, order_by_sort, paginate
+from byocruda.core.serialization import fast_rows_response, select_fast_columns
+from byocruda.schemas.schemas import BulkResult, BulkUpdateResult, LookupResult, WorkstationLookup
 from byocruda.models.models import (
     Workstation,
     WorkstationBase,
@@ -13,93 +28,290 @@ from byocruda.models.models import (
     WorkstationTypePublic,
     WorkstationTypeBase,
     WorkstationTypeCreate,
-    WorkstationPublicWithUserAndDepartment
+    WorkstationPublicWithUserAndDepartment,
+    WorkstationPublicExpanded
 )
 
 router = APIRouter()
 
-@router.get("/", response_model=List[WorkstationPublic])
+# Columns the list endpoints may be sorted (and keyset paged) by, besides the primary key
+WORKSTATION_SORT_COLUMNS = {
+    "hostname": Workstation.hostname,
+    "video_ram_gb": Workstation.video_ram_gb,
+    "system_ram_gb": Workstation.system_ram_gb,
+    "total_storage_tb": Workstation.total_storage_tb,
+}
+# Columns the list endpoints may be filtered by (eq, gt/gte/lt/lte and in)
+WORKSTATION_FILTERS = filter_params({
+    "type_id": Workstation.type_id,
+    "department_id": Workstation.department_id,
+    "user_id": Workstation.user_id,
+    "video_ram_gb": Workstation.video_ram_gb,
+    "system_ram_gb": Workstation.system_ram_gb,
+    "total_storage_tb": Workstation.total_storage_tb,
+    "reserved": Workstation.reserved,
+})
+WORKSTATION_TYPE_SORT_COLUMNS = {
+    "workstation_type": WorkstationType.workstation_type,
+}
+# Relationships that can be requested with ?expand=
+WORKSTATION_RELATIONSHIPS = {
+    "user": Workstation.user,
+    "department": Workstation.department,
+    "workstation_type": Workstation.workstation_type,
+}
+
+@router.get("/", response_model=List[WorkstationPublicExpanded], response_model_exclude_unset=True)
 async def get_workstations(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_read_session),
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    filters: List = Depends(WORKSTATION_FILTERS)
+):
+    expand_names = parse_expand(expand, WORKSTATION_RELATIONSHIPS)
+    field_names = parse_fields(fields, WorkstationPublic, "workstation_id", expand_names)
+    # Projected pages always take the row path: only the requested columns are selected
+    if (settings.api.fast_responses or field_names) and not expand_names:
+        return await _get_workstations_fast(session, request, response, filters, field_names, skip=skip, limit=limit, sort=sort, cursor=cursor)
+    statement = paginate(
+        select(Workstation).where(*filters).options(*expand_options(expand_names, WORKSTATION_RELATIONSHIPS)),
+        columns=WORKSTATION_SORT_COLUMNS,
+        primary_key=Workstation.workstation_id,
+        sort=sort, cursor=cursor, skip=skip, limit=limit
+    )
+    workstations = (await session.exec(statement)).all()
+    cursor = next_cursor(workstations, columns=WORKSTATION_SORT_COLUMNS, primary_key=Workstation.workstation_id, sort=sort, limit=limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    not_modified = conditional_response(request, response, compute_validators(workstations, expand_names))
+    if not_modified:
+        return not_modified
+    return expand_rows(workstations, WorkstationPublicExpanded, expand_names)
+
+async def _get_workstations_fast(session: AsyncSession, request: Request, response: Response, filters: List, fields: List[str], **page) -> Response:
+    """List page served from plain rows of the public columns (or only `fields`), encoded without pydantic."""
+    columns = sparse_columns(fields, columns=WORKSTATION_SORT_COLUMNS, primary_key=Workstation.workstation_id, sort=page["sort"])
+    statement = paginate(
+        select_fast_columns(Workstation, WorkstationPublic, columns).where(*filters),
+        columns=WORKSTATION_SORT_COLUMNS,
+        primary_key=Workstation.workstation_id,
+        **page
+    )
+    rows = (await session.exec(statement)).all()
+    cursor = next_cursor(rows, columns=WORKSTATION_SORT_COLUMNS, primary_key=Workstation.workstation_id, sort=page["sort"], limit=page["limit"])
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    not_modified = conditional_response(request, response, compute_row_validators("workstations", rows, "workstation_id"))
+    if not_modified:
+        return not_modified
+    return fast_rows_response(rows, WorkstationPublic, response, fields)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_workstations(
+    *,
+    request: Request,
+    format: ExportFormat = "ndjson",
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    filters: List = Depends(WORKSTATION_FILTERS)
+):
+    """Stream every (matching) workstation as NDJSON or CSV without materializing the table in memory."""
+    statement = order_by_sort(
+        select_public_columns(Workstation, WorkstationPublic, parse_fields(fields, WorkstationPublic, "workstation_id")).where(*filters),
+        columns=WORKSTATION_SORT_COLUMNS,
+        primary_key=Workstation.workstation_id,
+        sort=sort
+    )
+    return export_response(statement, format=format, filename="workstations", use_primary=reads_from_primary(request))
+
+@router.get("/batch", response_model=LookupResult)
+async def get_workstations_by_ids(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    ids: str,
+    fields: Optional[str] = None
+):
+    """Resolve many workstations by id (ids=1,2,3) in one response, listing the ids not found."""
+    found, missing = await lookup_rows(
+        session, model=Workstation, public_model=WorkstationPublic, key="workstation_id",
+        keys=parse_ids(ids, settings.lookup.max_keys),
+        fields=parse_fields(fields, WorkstationPublic, "workstation_id"),
+        chunk_size=settings.lookup.chunk_size
+    )
+    return lookup_response(found, missing)
+
+@router.post("/lookup", response_model=LookupResult)
+async def lookup_workstations(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    lookup: WorkstationLookup,
+    fields: Optional[str] = None
 ):
-    workstations = session.exec(select(Workstation).offset(skip).limit(limit)).all()
-    return workstations
+    """Resolve many workstations by hostname in one response, listing the hostnames not found."""
+    found, missing = await lookup_rows(
+        session, model=Workstation, public_model=WorkstationPublic, key="hostname",
+        keys=distinct_keys(lookup.hostname, settings.lookup.max_keys),
+        fields=parse_fields(fields, WorkstationPublic, "workstation_id"),
+        chunk_size=settings.lookup.chunk_size
+    )
+    return lookup_response(found, missing)
 
 @router.get("/{workstation_id}", response_model=WorkstationPublicWithUserAndDepartment)
 async def get_workstation(
     *,
-    session: Session = Depends(get_db_session),
-    workstation_id: int
+    session: AsyncSession = Depends(get_read_session),
+    request: Request,
+    response: Response,
+    workstation_id: int,
+    fields: Optional[str] = None
 ):
-    db_workstation = session.get(Workstation, workstation_id)
+    field_names = parse_fields(fields, WorkstationPublic, "workstation_id")
+    if field_names:
+        return await sparse_detail(
+            session, request, response, model=Workstation, public_model=WorkstationPublic,
+            primary_key="workstation_id", identity=workstation_id, fields=field_names, not_found="Workstation not found"
+        )
+    db_workstation = await session.get(
+        Workstation,
+        workstation_id,
+        options=expand_options(["user", "department"], WORKSTATION_RELATIONSHIPS)
+    )
     if not db_workstation:
         raise HTTPException(status_code=404, detail="Workstation not found")
+    not_modified = conditional_response(request, response, compute_validators([db_workstation], ["user", "department"], detail=True))
+    if not_modified:
+        return not_modified
     return db_workstation
 
 @router.post("/", response_model=WorkstationPublic)
 async def create_workstation(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     workstation: WorkstationCreate
 ):
     db_workstation = Workstation.model_validate(workstation)
     session.add(db_workstation)
-    session.commit()
-    session.refresh(db_workstation)
+    await session.commit()
+    await session.refresh(db_workstation)
     return db_workstation
 
+@router.post("/bulk", response_model=BulkResult, openapi_extra=bulk_openapi_body(WorkstationCreate))
+async def bulk_create_workstations(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    request: Request,
+    response: Response,
+    upsert: bool = False,
+    atomic: Optional[bool] = None
+):
+    """Create (or with upsert=true, create or update by hostname) many records from a JSON array or NDJSON body."""
+    records = await read_records(request, settings.bulk.max_records)
+    rows, errors = validate_records(records, WorkstationCreate, "hostname")
+    with bulk_errors():
+        result = await session.run_sync(
+            bulk_write, Workstation, rows, errors,
+            natural_key="hostname",
+            primary_key="workstation_id",
+            upsert=upsert,
+            atomic=settings.bulk.atomic if atomic is None else atomic,
+            chunk_size=settings.bulk.chunk_size
+        )
+    if result.atomic and result.failed:
+        response.status_code = 422
+    return result
+
 @router.delete("/{workstation_id}")
 async def delete_workstation(
     *,
     workstation_id: int,
-    session: Session = Depends(get_db_session)
+    session: AsyncSession = Depends(get_async_db_session)
 ):
-    db_workstation=session.get(Workstation, workstation_id)
+    db_workstation = await session.get(Workstation, workstation_id)
     if not db_workstation:
         raise HTTPException(status_code=404, detail="Workstation not found")
-    session.delete(db_workstation)
-    session.commit()
+    await session.delete(db_workstation)
+    await session.commit()
     return {"deleted": True}
 
+@router.patch("/", response_model=BulkUpdateResult)
+async def bulk_update_workstations(
+    *,
+    session: AsyncSession = Depends(get_async_db_session),
+    patch: WorkstationUpdate,
+    ids: Optional[str] = None,
+    return_ids: bool = False,
+    filters: List = Depends(WORKSTATION_FILTERS)
+):
+    """Apply one patch to every workstation matching the filters (and/or ids=1,2,3) with a single UPDATE."""
+    if ids:
+        filters = [*filters, Workstation.workstation_id.in_(parse_ids(ids, settings.lookup.max_keys))]
+    with bulk_errors():
+        result = await bulk_update(
+            session, Workstation, patch.model_dump(exclude_unset=True), filters, primary_key="workstation_id", return_ids=return_ids
+        )
+    return result
+
 @router.patch("/{workstation_id}", response_model=WorkstationPublic)
-async def get_workstation(
+async def update_workstation(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     workstation_id: int,
     workstation: WorkstationUpdate
 ):
-    db_workstation = session.get(Workstation, workstation_id)
+    db_workstation = await session.get(Workstation, workstation_id)
     if not db_workstation:
         raise HTTPException(status_code=404, detail="Workstation not found")
     workstation_data=workstation.model_dump(exclude_unset=True)
-    for key, value in workstation_data:
+    for key, value in workstation_data.items():
         setattr(db_workstation, key, value)
     session.add(db_workstation)
-    session.commit()
-    session.refresh(db_workstation)
+    await session.commit()
+    await session.refresh(db_workstation)
     return db_workstation
 
 @router.get("/types/", response_model=List[WorkstationTypePublic])
 async def get_workstation_types(
     *,
-    session : Session = Depends(get_db_session),
+    response: Response,
     offset: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    workstation_types=session.exec(select(WorkstationType).offset(offset).limit(limit)).all()
+    async def load_page(session: AsyncSession):
+        statement = paginate(
+            select(WorkstationType),
+            columns=WORKSTATION_TYPE_SORT_COLUMNS,
+            primary_key=WorkstationType.workstation_type_id,
+            sort=sort, cursor=cursor, skip=offset, limit=limit
+        )
+        workstation_types = (await session.exec(statement)).all()
+        page_cursor = next_cursor(workstation_types, columns=WORKSTATION_TYPE_SORT_COLUMNS, primary_key=WorkstationType.workstation_type_id, sort=sort, limit=limit)
+        return [WorkstationTypePublic.model_validate(t).model_dump() for t in workstation_types], page_cursor
+
+    workstation_types, page_cursor = await reference_cache.get_or_load(
+        cache_key(WORKSTATION_TYPES, "list", offset, limit, sort, cursor), lambda: load_on_primary(load_page)
+    )
+    if page_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
     return workstation_types
 
 @router.post("/types/", response_model=WorkstationTypePublic)
 async def create_workstation_type(
     *,
-    session: Session = Depends(get_db_session),
+    session: AsyncSession = Depends(get_async_db_session),
     workstation_type: WorkstationTypeCreate
 ):
     db_workstation_type = WorkstationType.model_validate(workstation_type)
     session.add(db_workstation_type)
-    session.commit()
-    session.refresh(db_workstation_type)
-    return db_workstation_type
\ No newline at end of file
+    await session.commit()
+    await session.refresh(db_workstation_type)
+    reference_cache.invalidate_prefix(cache_key(WORKSTATION_TYPES, "list"))
+    return db_workstation_type
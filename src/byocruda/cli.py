@@ -0,0 +1,112 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def _import(args: argparse.Namespace) -> int:
+    """Run an import job in the foreground."""
+    from byocruda.core.database import SessionLocal, init_db
+    from byocruda.core.imports import create_import_job, infer_format, run_import_job
+
+    format = args.format or infer_format(args.path.name)
+    if format is None:
+        print(f"Cannot tell the format of {args.path}; pass --format", file=sys.stderr)
+        return 2
+    if not args.path.exists():
+        print(f"File not found: {args.path}", file=sys.stderr)
+        return 2
+    init_db()
+    with SessionLocal() as session:
+        job = create_import_job(session, args.resource, format, str(args.path), args.upsert)
+    job = run_import_job(job.import_job_id, args.path, chunk_size=args.chunk_size)
+    if job is None:
+        print("The import job was deleted while running", file=sys.stderr)
+        return 1
+    print(
+        f"Import job {job.import_job_id} {job.status}: {job.imported_rows} imported, "
+        f"{job.failed_rows} failed of {job.processed_rows} rows"
+    )
+    if job.error:
+        print(job.error, file=sys.stderr)
+    return 0 if job.status == "completed" else 1
+
+
+def _reindex_search(args: argparse.Namespace) -> int:
+    """Rebuild the full-text search index from the users and workstations tables."""
+    from byocruda.core.database import engine, init_db
+    from byocruda.core.search import rebuild_search_index
+
+    init_db()
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+    print("Search index rebuilt")
+    return 0
+
+
+def _rebuild_stats(args: argparse.Namespace) -> int:
+    """Recompute the inventory statistics summary tables from scratch."""
+    from byocruda.core.database import engine, init_db
+    from byocruda.core.stats import rebuild_stats
+
+    init_db()
+    with engine.begin() as connection:
+        rebuild_stats(connection)
+    print("Inventory statistics rebuilt")
+    return 0
+
+
+def _seed(args: argparse.Namespace) -> int:
+    """Replace the database contents with a generated inventory."""
+    from byocruda.core.database import engine, verify_database_connection
+    from byocruda.core.seeding import SeedPlan, seed_database
+
+    if not args.yes:
+        print("This drops every table of the configured database; pass --yes to confirm", file=sys.stderr)
+        return 2
+    if not verify_database_connection():
+        return 1
+    plan = SeedPlan(args.workstations, users=args.users, departments=args.departments)
+    counts = seed_database(engine, plan, seed=args.seed, chunk_size=args.chunk_size, drop_indexes=args.drop_indexes)
+    print("Seeded " + ", ".join(f"{count} {table}" for table, count in counts.items()))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="byocruda", description="BYOCRUDA command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import a CSV or NDJSON file of users or workstations")
+    import_parser.add_argument("resource", choices=["users", "workstations"])
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    import_parser.add_argument("--upsert", action="store_true", help="Update existing rows matched by natural key")
+    import_parser.add_argument("--chunk-size", type=int, help="Rows per transaction (default: imports.chunk_size)")
+    import_parser.set_defaults(func=_import)
+
+    reindex_parser = commands.add_parser("reindex-search", help="Rebuild the full-text search index")
+    reindex_parser.set_defaults(func=_reindex_search)
+
+    stats_parser = commands.add_parser("rebuild-stats", help="Recompute the inventory statistics summary tables")
+    stats_parser.set_defaults(func=_rebuild_stats)
+
+    seed_parser = commands.add_parser("seed", help="Replace the database contents with generated data")
+    seed_parser.add_argument("--workstations", type=int, default=10000)
+    seed_parser.add_argument("--users", type=int, help="Defaults to 60%% of the workstations")
+    seed_parser.add_argument("--departments", type=int, help="Defaults to one per 2000 workstations (at least 5)")
+    seed_parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same data")
+    seed_parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per INSERT and transaction")
+    seed_parser.add_argument("--drop-indexes", action="store_true", help="Drop secondary indexes while loading")
+    seed_parser.add_argument("--yes", action="store_true", help="Confirm that existing data may be dropped")
+    seed_parser.set_defaults(func=_seed)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
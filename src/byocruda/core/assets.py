@@ -0,0 +1,178 @@
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Type
+
+from sqlmodel import SQLModel
+
+from byocruda.core.config import AssetFieldSettings, AssetsSettings, AssetTypeSettings
+from byocruda.core.logging import log
+
+# Bumped whenever the generated code changes, so cached modules of older compilers are not reused
+COMPILER_VERSION = 1
+
+_HEADER = '''\
+# Generated by byocruda.core.assets from the [assets.types] configuration; do not edit.
+# Definitions hash: {digest}
+from datetime import date, datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+from byocruda.models.versioning import Versioned
+'''
+
+
+@dataclass
+class CompiledAsset:
+    """The generated models of one asset type, as used by its router."""
+    table: str
+    primary_key: str
+    model: Type[SQLModel]
+    public: Type[SQLModel]
+    create: Type[SQLModel]
+    update: Type[SQLModel]
+    sort: List[str]
+    filters: List[str]
+
+
+def model_name(table: str, asset: AssetTypeSettings) -> str:
+    """Class name prefix of an asset type: `model_name`, or the table name in CamelCase without
+    its trailing "s" ("docking_stations" -> "DockingStation"); set model_name for irregular plurals."""
+    if asset.model_name:
+        return asset.model_name
+    return "".join(part.capitalize() for part in table.removesuffix("s").split("_"))
+
+
+def primary_key_name(table: str, asset: AssetTypeSettings) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", model_name(table, asset)).lower() + "_id"
+
+
+def definitions_hash(assets: AssetsSettings) -> str:
+    """Digest of the asset definitions and the compiler version: the cache key of the generated module."""
+    payload = {
+        "compiler": COMPILER_VERSION,
+        "types": {table: asset.model_dump() for table, asset in assets.types.items()},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _field_source(field: AssetFieldSettings, *, update: bool = False) -> str:
+    annotation = field.type
+    options = []
+    if update or field.optional or field.default is not None:
+        annotation = f"Optional[{annotation}]"
+        options.append(f"default={None if update else field.default!r}")
+    if field.max_length is not None:
+        options.append(f"max_length={field.max_length}")
+    if not update:
+        if field.foreign_key:
+            options += [f"foreign_key={field.foreign_key!r}", "ondelete='RESTRICT'"]
+        if field.unique:
+            options.append("unique=True")
+        if field.index or field.foreign_key:
+            options.append("index=True")
+    if not options:
+        return annotation
+    return f"{annotation} = Field({', '.join(options)})"
+
+
+def render_module(assets: AssetsSettings, digest: str) -> str:
+    """Python source of the table, Base, Create, Update and Public models of every asset type."""
+    lines = [_HEADER.format(digest=digest)]
+    registry = []
+    for table, asset in assets.types.items():
+        name = model_name(table, asset)
+        primary_key = primary_key_name(table, asset)
+        base = [f"    {field}: {_field_source(spec)}" for field, spec in asset.fields.items()]
+        update = [f"    {field}: {_field_source(spec, update=True)}" for field, spec in asset.fields.items()]
+        lines += [
+            "",
+            f"class {name}Base(SQLModel):",
+            *base,
+            "",
+            "",
+            f"class {name}({name}Base, Versioned, table=True):",
+            f"    __tablename__ = {table!r}",
+            f"    {primary_key}: Optional[int] = Field(default=None, primary_key=True)",
+            "",
+            "",
+            f"class {name}Public({name}Base):",
+            f"    {primary_key}: int",
+            "",
+            "",
+            f"class {name}Create({name}Base):",
+            "    pass",
+            "",
+            "",
+            f"class {name}Update(SQLModel):",
+            *update,
+            "",
+        ]
+        registry.append(f"    {table!r}: ({name}, {name}Public, {name}Create, {name}Update),")
+    lines += ["", "ASSETS = {", *registry, "}", ""]
+    return "\n".join(lines)
+
+
+def load_module(assets: AssetsSettings) -> ModuleType:
+    """Import the generated module for these definitions, generating it first on a cache miss.
+
+    Modules are cached in `cache_dir` under the definitions hash, so a restart with
+    an unchanged configuration imports the existing module (and its bytecode in
+    __pycache__) instead of generating and compiling it again.
+    """
+    digest = definitions_hash(assets)
+    module_name = f"byocruda_assets_{digest[:16]}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    # A second mapped class of the same name would make string relationship lookups ambiguous
+    mapped = {mapper.class_.__name__ for mapper in SQLModel._sa_registry.mappers}
+    clashes = (set(SQLModel.metadata.tables) & set(assets.types)) | (
+        mapped & {model_name(table, asset) for table, asset in assets.types.items()}
+    )
+    if clashes:
+        raise ValueError(f"Asset types clash with built-in tables or models: {', '.join(sorted(clashes))}")
+    path = Path(assets.cache_dir) / f"{module_name}.py"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Workers starting together may all miss; each writes its own file and the rename is atomic
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(render_module(assets, digest))
+        os.replace(temporary, path)
+        log.info("Compiled {} asset types to {}", len(assets.types), path)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running it, as pydantic resolves the models' annotations through sys.modules
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def compile_assets(assets: AssetsSettings) -> Dict[str, CompiledAsset]:
+    """Models of the configured asset types by table name; empty when none are configured."""
+    if not assets.types:
+        return {}
+    module = load_module(assets)
+    return {
+        table: CompiledAsset(
+            table=table,
+            primary_key=primary_key_name(table, asset),
+            model=module.ASSETS[table][0],
+            public=module.ASSETS[table][1],
+            create=module.ASSETS[table][2],
+            update=module.ASSETS[table][3],
+            sort=asset.sort,
+            filters=asset.filters,
+        )
+        for table, asset in assets.types.items()
+    }
@@ -0,0 +1,255 @@
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Type
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.logging import log
+from byocruda.models.versioning import utc_now
+from byocruda.schemas.schemas import BulkResult, BulkRowResult, BulkUpdateResult
+
+# Dialects with a native multi-row INSERT ... ON CONFLICT used for upserts, by the module
+# providing it; imported on first use so SQLite deployments never load the PostgreSQL dialect
+UPSERT_INSERTS = {
+    "sqlite": "sqlalchemy.dialects.sqlite",
+    "postgresql": "sqlalchemy.dialects.postgresql",
+}
+
+
+class BulkError(ValueError):
+    """A bulk write or update the request itself makes impossible."""
+
+
+class InvalidPatch(BulkError):
+    """A patch a column constraint or a missing referenced row rejects."""
+
+
+@dataclass
+class BulkRow:
+    index: int
+    key: str
+    values: Dict[str, Any]
+    # Fields the client actually sent; only these are overwritten by an upsert
+    fields: frozenset
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'record'}: {e['msg']}" for e in error.errors())
+
+
+def validate_records(
+    records: Sequence[Any], create_model: Type[SQLModel], natural_key: str
+) -> Tuple[List[BulkRow], List[BulkRowResult]]:
+    """Validate raw records against `create_model`, separating valid rows from per-row errors.
+
+    When the same natural key appears more than once, the last occurrence wins and
+    the earlier ones are reported as errors.
+    """
+    rows: Dict[str, BulkRow] = {}
+    errors: List[BulkRowResult] = []
+    for index, record in enumerate(records):
+        try:
+            item = create_model.model_validate(record)
+        except ValidationError as e:
+            errors.append(BulkRowResult(index=index, status="error", error=_format_validation_error(e)))
+            continue
+        values = item.model_dump()
+        key = values[natural_key]
+        if key in rows:
+            duplicate = rows.pop(key)
+            errors.append(BulkRowResult(index=duplicate.index, status="error", key=key, error=f"Duplicate {natural_key} later in the request"))
+        rows[key] = BulkRow(index=index, key=key, values=values, fields=frozenset(item.model_fields_set))
+    return sorted(rows.values(), key=lambda row: row.index), errors
+
+
+def _chunks(rows: Sequence[BulkRow], size: int) -> Iterator[Sequence[BulkRow]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _write_chunk(
+    session: Session, model: Type[SQLModel], chunk: Sequence[BulkRow], *,
+    natural_key: str, primary_key: str, upsert: bool
+) -> List[BulkRowResult]:
+    """Write one chunk with a single multi-row INSERT (or INSERT ... ON CONFLICT) per field set."""
+    table = model.__table__
+    key_column, pk_column = table.c[natural_key], table.c[primary_key]
+    existing = dict((session.exec(
+        select(key_column, pk_column).where(key_column.in_([row.key for row in chunk]))
+    )).all())
+
+    results = []
+    if upsert:
+        dialect = session.bind.dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise BulkError(f"Upsert is not supported on {dialect}")
+        # Rows sending the same fields share one statement, so absent fields keep their stored value
+        groups: Dict[frozenset, List[BulkRow]] = {}
+        for row in chunk:
+            groups.setdefault(row.fields, []).append(row)
+        for fields, group in groups.items():
+            statement = importlib.import_module(UPSERT_INSERTS[dialect]).insert(table)
+            update_columns = sorted(fields - {natural_key, primary_key})
+            if update_columns:
+                set_ = {column: statement.excluded[column] for column in update_columns}
+                # ON CONFLICT ... DO UPDATE ignores Column.onupdate, so versioned tables are bumped by hand
+                if "version" in table.c:
+                    set_.update(version=table.c.version + 1, updated_at=utc_now())
+                statement = statement.on_conflict_do_update(index_elements=[key_column], set_=set_)
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=[key_column])
+            returned = dict((session.exec(
+                statement.returning(key_column, pk_column), params=[row.values for row in group]
+            )).all())
+            for row in group:
+                status = "updated" if row.key in existing else "created"
+                results.append(BulkRowResult(index=row.index, status=status, key=row.key, id=returned.get(row.key, existing.get(row.key))))
+        return results
+
+    new_rows = []
+    for row in chunk:
+        if row.key in existing:
+            results.append(BulkRowResult(index=row.index, status="error", key=row.key, id=existing[row.key], error=f"{natural_key} already exists"))
+        else:
+            new_rows.append(row)
+    if new_rows:
+        returned = dict((session.exec(
+            insert(table).returning(key_column, pk_column), params=[row.values for row in new_rows]
+        )).all())
+        results.extend(
+            BulkRowResult(index=row.index, status="created", key=row.key, id=returned[row.key]) for row in new_rows
+        )
+    return results
+
+
+def _write_rows_individually(
+    session: Session, model: Type[SQLModel], chunk: Sequence[BulkRow], *, commit: bool, **options
+) -> List[BulkRowResult]:
+    """Retry a failed chunk one row per transaction to find out which rows the database rejects."""
+    results = []
+    for row in chunk:
+        try:
+            results.extend(_write_chunk(session, model, [row], **options))
+            if commit:
+                session.commit()
+            else:
+                session.rollback()
+        except DBAPIError as e:
+            session.rollback()
+            results.append(BulkRowResult(index=row.index, status="error", key=row.key, error=str(e.orig)))
+    return results
+
+
+def bulk_write(
+    session: Session,
+    model: Type[SQLModel],
+    rows: Sequence[BulkRow],
+    errors: Sequence[BulkRowResult],
+    *,
+    natural_key: str,
+    primary_key: str,
+    upsert: bool,
+    atomic: bool,
+    chunk_size: int,
+) -> BulkResult:
+    """Insert (or upsert) validated rows in chunks and report the outcome of every record.
+
+    This is synchronous so the import pipeline can share it; API handlers call it
+    through `AsyncSession.run_sync`.
+
+    In atomic mode the whole request is one transaction and any error rolls it back.
+    Otherwise every chunk is committed on its own; a chunk the database rejects is
+    retried row by row so only the offending rows fail.
+    """
+    options = dict(natural_key=natural_key, primary_key=primary_key, upsert=upsert)
+    results = list(errors)
+    if not (atomic and errors):
+        for chunk in _chunks(rows, chunk_size):
+            try:
+                chunk_results = _write_chunk(session, model, chunk, **options)
+                if not atomic:
+                    session.commit()
+            except DBAPIError as e:
+                session.rollback()
+                log.warning(f"Bulk {model.__name__} chunk failed, retrying row by row: {str(e.orig)}")
+                chunk_results = _write_rows_individually(session, model, chunk, commit=not atomic, **options)
+                if atomic:
+                    # Everything before this chunk was rolled back with it
+                    failures = [r for r in chunk_results if r.status == "error"]
+                    if not failures:
+                        # A transient error, or rows conflicting only with each other: no single row to blame
+                        failures = [
+                            BulkRowResult(index=row.index, status="error", key=row.key, error=str(e.orig)) for row in chunk
+                        ]
+                    results.extend(failures)
+                    break
+            results.extend(chunk_results)
+
+    result = BulkResult(atomic=atomic)
+    if atomic and any(r.status == "error" for r in results):
+        session.rollback()
+        failed = {r.index for r in results if r.status == "error"}
+        results = [r for r in results if r.status == "error"] + [
+            BulkRowResult(index=row.index, status="rolled_back", key=row.key) for row in rows if row.index not in failed
+        ]
+    elif atomic:
+        session.commit()
+
+    result.results = sorted(results, key=lambda r: r.index)
+    result.created = sum(r.status == "created" for r in results)
+    result.updated = sum(r.status == "updated" for r in results)
+    result.failed = sum(r.status == "error" for r in results)
+    return result
+
+
+async def check_patch(session: AsyncSession, model: Type[SQLModel], values: Dict[str, Any]) -> None:
+    """Validate a patch once for all the rows it is applied to: no NULL in required columns, referenced rows exist."""
+    table = model.__table__
+    for name, value in values.items():
+        column = table.c[name]
+        if value is None:
+            if not column.nullable:
+                raise InvalidPatch(f"{name} cannot be null")
+            continue
+        for foreign_key in column.foreign_keys:
+            referenced = (await session.exec(select(foreign_key.column).where(foreign_key.column == value))).first()
+            if referenced is None:
+                raise InvalidPatch(f"{name} {value} does not exist")
+
+
+async def bulk_update(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    values: Dict[str, Any],
+    clauses: Sequence[Any],
+    *,
+    primary_key: str,
+    return_ids: bool = False,
+) -> BulkUpdateResult:
+    """Apply one patch to every row matching `clauses` with a single UPDATE ... WHERE.
+
+    The version columns are bumped by their onupdate defaults and the row-level
+    triggers (statistics, search index, change log) fire for every updated row.
+    """
+    if not values:
+        raise BulkError("No fields to update")
+    if not clauses:
+        raise BulkError("A filter or ids is required; refusing to update every row")
+    await check_patch(session, model, values)
+    table = model.__table__
+    statement = update(table).where(*clauses).values(**values)
+    if return_ids:
+        statement = statement.returning(table.c[primary_key])
+    try:
+        result = await session.exec(statement)
+        ids = sorted(result.scalars().all()) if return_ids else None
+        await session.commit()
+    except DBAPIError as e:
+        # Constraints checked by the database, e.g. the users status CHECK
+        await session.rollback()
+        raise InvalidPatch(str(e.orig))
+    return BulkUpdateResult(updated=len(ids) if return_ids else result.rowcount, ids=ids)
@@ -0,0 +1,177 @@
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Protocol, Tuple
+
+from byocruda.core.config import settings
+from byocruda.core.logging import log
+
+# Namespaces of the reference data served through the cache
+DEPARTMENTS = "departments"
+WORKSTATION_TYPES = "workstation_types"
+
+_MISSING = object()
+
+
+class CacheBackend(Protocol):
+    """Storage used by `Cache`; implement this to plug in a shared cache (e.g. Redis)."""
+
+    def get(self, key: str) -> Any:
+        """Return the stored value, or raise KeyError when absent or expired."""
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def delete_prefix(self, prefix: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            expires, value = self._entries[key]
+            if expires < time.monotonic():
+                del self._entries[key]
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Cache:
+    """Read-through cache with hit/miss counters.
+
+    Entries are invalidated by the write handlers of this process only; with several
+    workers and the memory backend, other workers may serve stale data for up to `ttl`.
+
+    Every invalidation bumps a generation counter of the key's namespace (the part
+    before the first ":"). A loader that was running while its namespace was
+    invalidated may have read data from before the write, so its result is returned
+    but not stored.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._generations: Dict[str, int] = {}
+        # Bumped by clear(), which invalidates every namespace
+        self._epoch = 0
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(key.split(":", 1)[0], 0)
+
+    def _bump(self, key: str) -> None:
+        namespace = key.split(":", 1)[0]
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `loader` and storing its result on a miss."""
+        if not self.enabled:
+            return await loader()
+        try:
+            value = self.backend.get(key)
+        except KeyError:
+            value = _MISSING
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        generation = self._generation(key)
+        value = await loader()
+        if self._generation(key) == generation:
+            self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._bump(key)
+            self.backend.delete(key)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        self._bump(prefix)
+        self.backend.delete_prefix(prefix)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def cache_key(namespace: str, kind: str, *parts: Any) -> str:
+    """Build a cache key such as "departments:detail:3"; keys of a namespace share its prefix."""
+    return ":".join([namespace, kind, *(str(p) for p in parts)])
+
+
+def invalidate_departments(*department_ids: int) -> None:
+    """Drop cached department list pages and the details of the given departments (all when none given)."""
+    reference_cache.invalidate_prefix(cache_key(DEPARTMENTS, "list"))
+    if department_ids:
+        reference_cache.invalidate(*(cache_key(DEPARTMENTS, "detail", i) for i in department_ids))
+    else:
+        reference_cache.invalidate_prefix(cache_key(DEPARTMENTS, "detail"))
+
+
+def _create_backend() -> CacheBackend:
+    """Instantiate the configured backend: "memory" or a "package.module:Class" path."""
+    backend = settings.cache.backend
+    if backend == "memory":
+        return MemoryBackend(max_entries=settings.cache.max_entries)
+    module_name, _, class_name = backend.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    log.info(f"Using cache backend {backend}")
+    return backend_class(max_entries=settings.cache.max_entries)
+
+
+# Cache for reference tables (departments, workstation types)
+reference_cache = Cache(
+    backend=_create_backend(),
+    ttl=settings.cache.ttl_seconds,
+    enabled=settings.cache.enabled,
+)
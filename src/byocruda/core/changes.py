@@ -0,0 +1,308 @@
+import asyncio
+import contextvars
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import Connection, delete, event, exists, func, or_, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import aliased
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.logging import log
+from byocruda.models.models import ASSETS, Change
+from byocruda.models.versioning import utc_now
+
+# Response header of the change log endpoint: the `since` to pass on the next call
+CHANGE_SEQ_HEADER = "X-Change-Seq"
+PRUNE_INTERVAL_SECONDS = 3600
+
+_COLUMNS = (Change.seq, Change.table_name, Change.row_id, Change.operation, Change.changed_at)
+
+
+class UnknownTables(ValueError):
+    """A `tables` filter naming a table whose writes are not logged."""
+
+
+class ChangesExpired(Exception):
+    """The changes after a position have been pruned; the client has to reload."""
+
+
+def change_sources() -> Dict[str, str]:
+    """Tables whose writes are logged, by name, with their primary key column."""
+    return {
+        "users": "user_id",
+        "workstations": "workstation_id",
+        **{table: asset.primary_key for table, asset in ASSETS.items()},
+    }
+
+
+def _sqlite_triggers(table: str, primary_key: str) -> List[str]:
+    statements = []
+    for operation, row in (("insert", "new"), ("update", "new"), ("delete", "old")):
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_changes_{operation} AFTER {operation.upper()} ON {table} "
+            f"BEGIN INSERT INTO changes (table_name, row_id, operation) VALUES ('{table}', {row}.{primary_key}, '{operation}'); END"
+        )
+    return statements
+
+
+def _postgresql_triggers(table: str, primary_key: str) -> List[str]:
+    return [
+        f"CREATE OR REPLACE FUNCTION {table}_changes() RETURNS trigger AS $$ BEGIN "
+        f"INSERT INTO changes (table_name, row_id, operation) VALUES "
+        f"('{table}', CASE WHEN TG_OP = 'DELETE' THEN OLD.{primary_key} ELSE NEW.{primary_key} END, lower(TG_OP)); "
+        f"RETURN NULL; END $$ LANGUAGE plpgsql",
+        f"CREATE OR REPLACE TRIGGER {table}_changes AFTER INSERT OR UPDATE OR DELETE "
+        f"ON {table} FOR EACH ROW EXECUTE FUNCTION {table}_changes()",
+    ]
+
+
+def change_trigger_statements(dialect: str) -> List[str]:
+    """DDL of the triggers writing the change log; none on unsupported dialects."""
+    if dialect not in ("sqlite", "postgresql"):
+        return []
+    triggers = _sqlite_triggers if dialect == "sqlite" else _postgresql_triggers
+    return [statement for table, primary_key in change_sources().items() for statement in triggers(table, primary_key)]
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_change_triggers(target, connection: Connection, **kw) -> None:
+    """Install the triggers logging every insert, update and delete, in the writing transaction."""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        log.warning(f"The change log is not written on {dialect}")
+        return
+    for statement in change_trigger_statements(dialect):
+        connection.execute(text(statement))
+
+
+def parse_tables(tables: Optional[str]) -> List[str]:
+    """Split a `tables=users,workstations` query value, checking every name is a logged table."""
+    names = [name.strip() for name in (tables or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in change_sources()]
+    if unknown:
+        raise UnknownTables(f"Unknown tables {', '.join(unknown)}; allowed: {', '.join(change_sources())}")
+    return names
+
+
+def _age_seconds(changed_at: datetime, now: datetime) -> float:
+    # SQLite returns the UTC timestamp without a timezone
+    if changed_at.tzinfo is None:
+        changed_at = changed_at.replace(tzinfo=timezone.utc)
+    return (now - changed_at).total_seconds()
+
+
+def contiguous(changes: List[Dict[str, Any]], since: int, gap_wait: float) -> List[Dict[str, Any]]:
+    """The changes after `since` up to the first gap in seq that may still be filled.
+
+    SQLite numbers entries at commit, so gaps only appear on PostgreSQL, where a
+    sequence value is taken by a transaction that may still commit (or roll back).
+    A gap is waited for until the change after it is `gap_wait` seconds old, then
+    taken as rolled back; a transaction committing later than that is not delivered.
+    """
+    now = utc_now()
+    expected = since + 1
+    for index, change in enumerate(changes):
+        if change["seq"] != expected and _age_seconds(change["changed_at"], now) < gap_wait:
+            return changes[:index]
+        expected = change["seq"] + 1
+    return changes
+
+
+async def settled_seq(session: AsyncSession, gap_wait: float) -> int:
+    """The latest seq no earlier change can still be committed under, by the gap rule of `contiguous`."""
+    # Changes older than gap_wait have no open gap before them; only the recent ones are checked
+    cutoff = utc_now() - timedelta(seconds=gap_wait)
+    settled = (await session.exec(select(func.max(Change.seq)).where(Change.changed_at < cutoff))).one() or 0
+    previous = aliased(Change)
+    first_gap = select(func.min(Change.seq)).where(
+        Change.seq > settled + 1,
+        Change.changed_at >= cutoff,
+        ~exists().where(previous.seq == Change.seq - 1),
+    ).scalar_subquery()
+    before_gap = select(func.max(Change.seq)).where(Change.seq > settled, or_(first_gap.is_(None), Change.seq < first_gap))
+    return (await session.exec(before_gap)).one() or settled
+
+
+async def read_changes(
+    session: AsyncSession, since: int, *, tables: Sequence[str] = (), limit: int, until: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Up to `limit` changes after seq `since` (and up to `until`), oldest first."""
+    statement = select(*_COLUMNS).where(Change.seq > since).order_by(Change.seq).limit(limit)
+    if tables:
+        statement = statement.where(Change.table_name.in_(tables))
+    if until is not None:
+        statement = statement.where(Change.seq <= until)
+    return [dict(row._mapping) for row in (await session.exec(statement)).all()]
+
+
+async def check_retained(session: AsyncSession, since: int) -> None:
+    """Refuse a `since` whose following changes have already been pruned; the client has to reload."""
+    oldest = (await session.exec(select(func.min(Change.seq)))).one()
+    if oldest is not None and since < oldest - 1:
+        raise ChangesExpired(
+            f"Changes after seq {since} are no longer retained; reload and resume from the {CHANGE_SEQ_HEADER} header"
+        )
+
+
+async def prune_changes(session: AsyncSession, retention: timedelta) -> int:
+    """Delete changes older than `retention`, keeping the latest so `check_retained` still detects pruning."""
+    latest = select(func.max(Change.seq)).scalar_subquery()
+    result = await session.exec(delete(Change).where(Change.changed_at < utc_now() - retention, Change.seq < latest))
+    await session.commit()
+    return result.rowcount
+
+
+@dataclass(eq=False)
+class Subscription:
+    # Changes after `start`, in seq order; None once the feed closed the subscription
+    queue: asyncio.Queue
+    start: int
+
+
+class ChangeFeed:
+    """One tail of the change log per worker process, broadcast in memory to its subscribers.
+
+    While anyone is subscribed, a single task reads new changes every poll
+    interval and puts them on each subscriber's queue, so open streams cost the
+    database one query per worker and interval however many there are. A
+    subscriber whose queue fills up is closed rather than slowing the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        *,
+        poll_interval: float = 1.0,
+        batch_size: int = 500,
+        subscriber_buffer: int = 1000,
+        gap_wait: float = 5.0,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.subscriber_buffer = subscriber_buffer
+        self.gap_wait = gap_wait
+        self._subscribers: Set[Subscription] = set()
+        # Seq of the last change published; None while nobody is subscribed
+        self._position: Optional[int] = None
+        self._tail: Optional[asyncio.Task] = None
+        self._pruner: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self) -> Subscription:
+        if self._position is None:
+            async with self.session_factory() as session:
+                position = await settled_seq(session, self.gap_wait)
+            if self._position is None:
+                self._position = position
+        subscription = Subscription(asyncio.Queue(self.subscriber_buffer), self._position)
+        self._subscribers.add(subscription)
+        if self._tail is None or self._tail.done():
+            # A context of its own, so the tail's queries are not counted against (or logged with) this request
+            self._tail = asyncio.get_running_loop().create_task(self._run_tail(), context=contextvars.Context())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    async def _run_tail(self) -> None:
+        while self._subscribers:
+            try:
+                async with self.session_factory() as session:
+                    changes = await read_changes(session, self._position, limit=self.batch_size)
+            except Exception as e:
+                log.error("Reading the change log failed: {}", e)
+                changes = []
+            ready = contiguous(changes, self._position, self.gap_wait)
+            for change in ready:
+                self._publish(change)
+            # A full batch means more is waiting
+            if len(ready) < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+        self._position = None
+
+    def _publish(self, change: Dict[str, Any]) -> None:
+        self._position = change["seq"]
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(change)
+            except asyncio.QueueFull:
+                # Too far behind: end its stream, the client resumes from the log with Last-Event-ID
+                self._subscribers.discard(subscription)
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    def start(self, retention: timedelta) -> None:
+        """Prune the change log every hour until `stop()`."""
+        self._pruner = asyncio.get_running_loop().create_task(self._prune_periodically(retention))
+
+    async def _prune_periodically(self, retention: timedelta) -> None:
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    pruned = await prune_changes(session, retention)
+                if pruned:
+                    log.info("Pruned {} change log entries", pruned)
+            except Exception as e:
+                log.error("Pruning the change log failed: {}", e)
+            await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._pruner, self._tail) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._subscribers.clear()
+        self._position = None
+
+
+def format_event(change: Dict[str, Any]) -> str:
+    """A change as a server-sent event, its seq as the event id a reconnecting client sends back."""
+    # Imported here: serialization depends on core.database, which imports this module
+    from byocruda.core.serialization import dumps
+    return f"id: {change['seq']}\nevent: change\ndata: {dumps(change).decode()}\n\n"
+
+
+async def change_events(
+    feed: ChangeFeed, since: Optional[int], tables: Sequence[str] = (), *, heartbeat_seconds: float = 15
+) -> AsyncIterator[str]:
+    """Server-sent events of the changes after `since` read from the log, followed by live ones from `feed`.
+
+    Without `since` only changes made after subscribing are sent.
+    """
+    subscription = await feed.subscribe()
+    try:
+        last = subscription.start if since is None else since
+        if since is not None:
+            # Catch up from the log up to a settled seq, and at least to the feed's start, where live changes begin
+            async with feed.session_factory() as session:
+                until = max(await settled_seq(session, feed.gap_wait), subscription.start)
+            while True:
+                async with feed.session_factory() as session:
+                    changes = await read_changes(session, last, tables=tables, limit=feed.batch_size, until=until)
+                for change in changes:
+                    last = change["seq"]
+                    yield format_event(change)
+                if len(changes) < feed.batch_size:
+                    break
+            last = max(last, until)
+        while True:
+            try:
+                change = await asyncio.wait_for(subscription.queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if change is None:
+                return
+            if change["seq"] > last and (not tables or change["table_name"] in tables):
+                last = change["seq"]
+                yield format_event(change)
+    finally:
+        feed.unsubscribe(subscription)
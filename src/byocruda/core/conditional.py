@@ -0,0 +1,113 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import Row, inspect
+from sqlmodel import SQLModel
+
+
+@dataclass
+class Validators:
+    """ETag and Last-Modified of a response, derived from the row versions it is built from.
+
+    Collections get no Last-Modified: removing a row from a page, or an older row
+    moving into it, leaves the newest updated_at unchanged. Only the ETag sees that.
+    """
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def _with_related(rows: Iterable[SQLModel], relationships: Sequence[str]) -> Iterator[SQLModel]:
+    for row in rows:
+        yield row
+        for name in relationships:
+            related = getattr(row, name)
+            if isinstance(related, list):
+                yield from related
+            elif related is not None:
+                yield related
+
+
+def _validators(entries: Iterable[Tuple[str, Any, Any, Optional[datetime]]], detail: bool) -> Validators:
+    """Digest (table, identity, version, updated_at) entries into validators."""
+    digest = hashlib.sha1()
+    last_modified = None
+    for table, identity, version, updated_at in entries:
+        digest.update(f"{table}:{identity}:{version};".encode())
+        if updated_at is not None:
+            # SQLite hands back naive datetimes; they are stored in UTC
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            updated_at = updated_at.astimezone(timezone.utc)
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+    return Validators(etag=f'W/"{digest.hexdigest()[:32]}"', last_modified=last_modified if detail else None)
+
+
+def compute_validators(rows: Iterable[SQLModel], relationships: Sequence[str] = (), *, detail: bool = False) -> Validators:
+    """Build validators for the given rows and the (already loaded) relationships embedded with them.
+
+    The ETag is a digest of every row's identity and version, so it changes when a
+    row is updated, added to or removed from the response; it is weak because the
+    same rows may be serialized differently (e.g. with or without `expand`).
+    Last-Modified is only set for a `detail` response of a single row.
+    """
+    return _validators(
+        ((row.__tablename__, inspect(row).identity, getattr(row, "version", ""), getattr(row, "updated_at", None))
+         for row in _with_related(rows, relationships)),
+        detail,
+    )
+
+
+def compute_row_validators(table: str, rows: Iterable[Row], primary_key: str, *, detail: bool = False) -> Validators:
+    """Same validators as `compute_validators`, for plain rows selecting the primary key, version and updated_at."""
+    return _validators(((table, (getattr(row, primary_key),), row.version, row.updated_at) for row in rows), detail)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110, 13.1.2): ignore the W/ prefix on both sides
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, response: Response, validators: Validators) -> Optional[Response]:
+    """Set ETag/Last-Modified on `response`, and return a 304 if the client's copy is still current.
+
+    If-None-Match takes precedence over If-Modified-Since, as RFC 9110 requires.
+    Callers return the 304 as is, skipping serialization of the body; it carries
+    every header already set on `response` (e.g. the next page cursor).
+    """
+    response.headers["ETag"] = validators.etag
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(validators.last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, validators.etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = if_modified_since is not None and _not_modified_since(if_modified_since, validators.last_modified)
+    if not_modified:
+        # The raw list keeps repeated headers, e.g. more than one Set-Cookie
+        not_modified_response = Response(status_code=304)
+        not_modified_response.raw_headers.extend(response.raw_headers)
+        return not_modified_response
+    return None
@@ -1,6 +1,9 @@
+import keyword
+import re
+from os import getenv
 from pathlib import Path
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, field_validator
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, field_validator, model_validator
 from pydantic_settings import BaseSettings
 import tomli
 
@@ -12,10 +15,96 @@ class APISettings(BaseModel):
     project_name: str
     description: str
     version: str
+    # Serve plain list pages as rows encoded straight to JSON, skipping response_model validation
+    fast_responses: bool = False
+
+class PoolSettings(BaseModel):
+    size: int = 5
+    max_overflow: int = 10
+    # Seconds to wait for a free connection before failing
+    timeout: float = 30
+    recycle: int = 3600
+    # Test connections with a lightweight ping on checkout (drops stale server connections)
+    pre_ping: bool = False
+
+class SQLiteSettings(BaseModel):
+    """PRAGMAs applied to every new SQLite connection; None leaves SQLite's default."""
+    # WAL lets readers proceed while a write is in progress
+    journal_mode: Optional[Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"]] = None
+    synchronous: Optional[Literal["OFF", "NORMAL", "FULL", "EXTRA"]] = None
+    # Pages, or KiB when negative
+    cache_size: Optional[int] = None
+    mmap_size: Optional[int] = None
+    # Milliseconds to wait on a locked database before raising "database is locked"
+    busy_timeout: Optional[int] = None
+    temp_store: Optional[Literal["DEFAULT", "FILE", "MEMORY"]] = None
+
+class ReplicaSettings(BaseModel):
+    # Read-only database urls used by GET handlers; for SQLite a read-only pool on the
+    # primary's WAL file works as a stand-in: "sqlite:///file:./byocruda.db?mode=ro&uri=true"
+    urls: List[str] = []
+    selection: Literal["round_robin", "least_busy"] = "round_robin"
+    # How long a replica that failed to connect is skipped
+    retry_seconds: float = 30
+    # After a write, the same client reads from the primary for this long (0 disables)
+    read_your_writes_seconds: float = 5
+
+# Named performance profiles selectable with `[database] profile`; explicitly
+# configured [database.pool] / [database.sqlite] keys override the profile's values
+DATABASE_PROFILES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "dev": {
+        "pool": {"size": 5, "max_overflow": 10},
+        "sqlite": {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000},
+    },
+    "read_heavy": {
+        "pool": {"size": 10, "max_overflow": 20, "pre_ping": True},
+        "sqlite": {
+            "journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000,
+            "cache_size": -65536, "mmap_size": 268435456, "temp_store": "MEMORY",
+        },
+    },
+    "bulk_load": {
+        "pool": {"size": 2, "max_overflow": 2, "timeout": 120},
+        "sqlite": {
+            "journal_mode": "WAL", "synchronous": "OFF", "busy_timeout": 30000,
+            "cache_size": -262144, "temp_store": "MEMORY",
+        },
+    },
+}
+
+class InstrumentationSettings(BaseModel):
+    # Count statements and database time per request and report them in a Server-Timing header
+    enabled: bool = True
+    # A statement shape executed more than this many times in one request is logged as an N+1
+    n_plus_one_threshold: int = 10
+    # Statements slower than this go to the slow query log, with their parameters redacted (0 disables)
+    slow_query_ms: float = 200
 
 class DatabaseSettings(BaseModel):
     url: str
     echo: bool
+    # Async DBAPI driver used by the API routers; derived from the url scheme when unset
+    # (sqlite -> aiosqlite, postgresql -> asyncpg)
+    async_driver: Optional[str] = None
+    # One of DATABASE_PROFILES, used as the base for the pool and sqlite sections
+    profile: Optional[str] = None
+    pool: PoolSettings = PoolSettings()
+    sqlite: SQLiteSettings = SQLiteSettings()
+    replicas: ReplicaSettings = ReplicaSettings()
+    instrumentation: InstrumentationSettings = InstrumentationSettings()
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_profile(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or data.get("profile") is None:
+            return data
+        profile = DATABASE_PROFILES.get(data["profile"])
+        if profile is None:
+            raise ValueError(f"Unknown database profile '{data['profile']}'; choose one of {', '.join(DATABASE_PROFILES)}")
+        data = dict(data)
+        for section, values in profile.items():
+            data[section] = {**values, **data.get(section, {})}
+        return data
 
 class SecuritySettingsDatabase(BaseModel):
     secret_key_env_variable: str
@@ -48,12 +137,146 @@ class LoggingSettings(BaseModel):
     file_path: str
     rotation: str
     retention: str
+    # Dedicated sink for statements over [database.instrumentation] slow_query_ms
+    slow_query_file_path: str = "logs/slow_queries.log"
+    # "development": text sinks written synchronously; "production": JSON lines written
+    # by a background thread, with repeated messages rate limited
+    mode: Literal["development", "production"] = "development"
+    # The options below default to the mode's choice when unset
+    # Hand records to a queue drained by a background thread instead of writing on the caller's thread
+    enqueue: Optional[bool] = None
+    # One JSON object per line instead of `format`
+    json_output: Optional[bool] = None
+    # Records per call site and window before further ones are dropped (0 disables)
+    rate_limit_burst: Optional[int] = None
+    rate_limit_window_seconds: float = 10
+    # Share of a request's records below WARNING that are kept, by route template, e.g. {"/health" = 0.01}
+    sample_rates: Dict[str, float] = {}
+
+class BulkSettings(BaseModel):
+    # Rows written per multi-row INSERT statement
+    chunk_size: int = 500
+    # Largest number of records accepted by a single bulk request
+    max_records: int = 100000
+    # Default transaction handling: all-or-nothing when true, commit per chunk when false
+    atomic: bool = True
+
+class ImportSettings(BaseModel):
+    # Rows validated and committed per transaction
+    chunk_size: int = 1000
+    # Where uploaded files are spooled until their job has run
+    upload_dir: str = "data/imports"
+
+class LookupSettings(BaseModel):
+    # Keys resolved per IN (...) query, kept below the database's bound parameter limit
+    chunk_size: int = 500
+    # Largest number of ids or natural keys accepted by a single batch lookup
+    max_keys: int = 10000
+
+class ChangesSettings(BaseModel):
+    # How often a worker's tail of the change log reads new entries while streams are open
+    poll_interval_seconds: float = 1.0
+    # Change log entries read per query, by the tail and by catch-up
+    batch_size: int = 500
+    # Events buffered per stream; a stream falling further behind is closed and the client resumes from the log
+    subscriber_buffer: int = 1000
+    # Comment lines written to idle streams so proxies keep them open
+    heartbeat_seconds: float = 15
+    # Entries older than this are pruned, the latest one excepted
+    retention_days: float = 7
+    # PostgreSQL numbers entries before they commit, so the tail waits this long for a missing seq
+    gap_wait_seconds: float = 5
+
+class CacheSettings(BaseModel):
+    enabled: bool = True
+    # "memory" or a "package.module:Class" implementing core.cache.CacheBackend
+    backend: str = "memory"
+    max_entries: int = 1024
+    ttl_seconds: float = 300
+
+class MetricsSettings(BaseModel):
+    # Record request metrics and serve them at /metrics
+    enabled: bool = True
+    # Upper bounds of the request latency histogram buckets, in seconds
+    latency_buckets: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+    # Upper bounds of the response size histogram buckets, in bytes
+    size_buckets: List[float] = [100, 1000, 10000, 100000, 1000000, 10000000]
+    # /health reports not ready (503) once a connection pool is this saturated
+    readiness_max_saturation: float = 0.9
+
+_IDENTIFIER = re.compile(r"^[a-z][a-z0-9_]*$")
+
+class AssetFieldSettings(BaseModel):
+    type: Literal["str", "int", "float", "bool", "date", "datetime"]
+    # Fields are required on create unless optional or given a default
+    optional: bool = False
+    default: Optional[Union[bool, int, float, str]] = None
+    unique: bool = False
+    index: bool = False
+    max_length: Optional[int] = None
+    # "table.column" of the referenced row; the referenced row cannot be deleted while in use
+    foreign_key: Optional[str] = None
+
+    @field_validator("foreign_key")
+    @classmethod
+    def check_foreign_key(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not re.fullmatch(r"[a-z][a-z0-9_]*\.[a-z][a-z0-9_]*", value):
+            raise ValueError(f"foreign_key must be 'table.column', got '{value}'")
+        return value
+
+class AssetTypeSettings(BaseModel):
+    # Prefix of the generated model classes; defaults to the singular table name in CamelCase
+    model_name: Optional[str] = None
+    fields: Dict[str, AssetFieldSettings]
+    # Fields the list endpoint may be sorted (and keyset paged) by
+    sort: List[str] = []
+    # Fields the list and export endpoints may be filtered by (eq, gt/gte/lt/lte and in)
+    filters: List[str] = []
+
+    @field_validator("model_name")
+    @classmethod
+    def check_model_name(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not re.fullmatch(r"[A-Z][A-Za-z0-9]*", value):
+            raise ValueError(f"model_name must be a CamelCase identifier, got '{value}'")
+        return value
+
+    @model_validator(mode="after")
+    def check_fields(self) -> "AssetTypeSettings":
+        for name in self.fields:
+            if not _IDENTIFIER.match(name) or keyword.iskeyword(name) or name in ("version", "updated_at"):
+                raise ValueError(f"Invalid asset field name '{name}'")
+        for option in ("sort", "filters"):
+            unknown = [name for name in getattr(self, option) if name not in self.fields]
+            if unknown:
+                raise ValueError(f"{option} names unknown fields: {', '.join(unknown)}")
+        return self
+
+class AssetsSettings(BaseModel):
+    # Generated model modules, one per distinct set of asset definitions
+    cache_dir: str = "data/assets"
+    # Custom asset types by table name, served under /api/v1/assets/<table>/
+    types: Dict[str, AssetTypeSettings] = {}
+
+    @field_validator("types")
+    @classmethod
+    def check_table_names(cls, value: Dict[str, AssetTypeSettings]) -> Dict[str, AssetTypeSettings]:
+        for name in value:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid asset table name '{name}'")
+        return value
 
 class Settings(BaseSettings):
     api: APISettings
     database: DatabaseSettings
     security: SecuritySettings
     logging: LoggingSettings
+    bulk: BulkSettings = BulkSettings()
+    imports: ImportSettings = ImportSettings()
+    lookup: LookupSettings = LookupSettings()
+    changes: ChangesSettings = ChangesSettings()
+    cache: CacheSettings = CacheSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    assets: AssetsSettings = AssetsSettings()
 
     @classmethod
     def from_toml(cls, config_path: Path) -> "Settings":
@@ -67,12 +290,25 @@ class Settings(BaseSettings):
         return cls.model_validate(config_dict)
 
 def load_config() -> Settings:
-    """Load configuration from the default location."""
-    config_path = Path("config/config.toml")
+    """Load configuration from the default location (overridable with BYOCRUDA_CONFIG)."""
+    config_path = Path(getenv("BYOCRUDA_CONFIG", "config/config.toml"))
     try:
         return Settings.from_toml(config_path)
     except Exception as e:
         raise RuntimeError(f"Failed to load configuration: {str(e)}")
 
-# Create a global settings instance
-settings = load_config()
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """The global settings, loaded from the TOML file on first use."""
+    global _settings
+    if _settings is None:
+        _settings = load_config()
+    return _settings
+
+def __getattr__(name: str) -> Any:
+    # `from byocruda.core.config import settings` loads the configuration lazily, so
+    # importing the settings classes alone (tests, CLI --help) does not read the TOML
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,19 +3,30 @@ from __future__ import annotations
 from os import getenv
 
 from sqlalchemy import event
-from sqlalchemy.pool import QueuePool
-from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
-from sqlite3 import Connection as SQLite3Connection
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Generator, List, Optional, TypeVar
+# Starlette's classes (re-exported by FastAPI): importing fastapi would slow down CLI jobs
+from starlette.requests import Request
+from starlette.responses import Response
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from byocruda.core.config import settings
+from byocruda.core.config import DatabaseSettings, settings
 from byocruda.core.logging import log
+from byocruda.core.metrics import pool_status
+from byocruda.core.replicas import READ_YOUR_WRITES_COOKIE, Replica, ReplicaRouter
+from byocruda.core.schema import schema_fingerprint, store_fingerprint, stored_fingerprint
 
 from byocruda.models import models
+# Register the DDL creating the full-text search index, the statistics and the change log triggers with the tables
+from byocruda.core import changes, search, stats
+
+T = TypeVar("T")
 
 # secure_db_url = ""
 # if settings.security.database_enable:
@@ -35,30 +46,24 @@ convention = {
 metadata = SQLModel.metadata
 metadata.naming_convention = convention
 
-def create_db_engine():
-    """Create database engine with proper configuration."""
-    connect_args = {"check_same_thread": False} if settings.database.url.startswith('sqlite') else {}
-    
-    return create_engine(        
-        url=settings.database.url,
-        echo=settings.database.echo,
-        connect_args=connect_args,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=3600        
-    )
+def sqlite_pragmas(database: DatabaseSettings) -> List[str]:
+    """PRAGMA statements run on every new SQLite connection."""
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    for name, value in database.sqlite.model_dump(exclude_none=True).items():
+        pragmas.append(f"PRAGMA {name}={value}")
+    return pragmas
 
-# Create engine with connection pooling
-engine = create_db_engine()
+def install_sqlite_pragmas(sync_engine: Engine, database: DatabaseSettings) -> None:
+    """Apply the configured PRAGMAs whenever the pool opens a SQLite connection."""
+    if sync_engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(database)
 
-# Enable foreign key enforcement for SQLite
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    if isinstance(dbapi_connection, SQLite3Connection):
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma in pragmas:
+            cursor.execute(pragma)
         # if settings.security.database_enable:
         #     cursor.execute("PRAGMA cipher_compatibility = 4")
         #     cursor.execute(f"PRAGMA key = '{enc_key}'")
@@ -66,7 +71,66 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         #     cursor.execute("PRAGMA kdf_iter = 64000")
         #     cursor.execute("PRAGMA cipher_use_hmac = ON")
         cursor.close()
+
+def _pool_options(database: DatabaseSettings) -> dict:
+    return dict(
+        pool_size=database.pool.size,
+        max_overflow=database.pool.max_overflow,
+        pool_timeout=database.pool.timeout,
+        pool_recycle=database.pool.recycle,
+        pool_pre_ping=database.pool.pre_ping,
+    )
+
+def create_db_engine(database: Optional[DatabaseSettings] = None) -> Engine:
+    """Create database engine with proper configuration (from `settings.database` by default)."""
+    database = database or settings.database
+    connect_args = {"check_same_thread": False} if database.url.startswith('sqlite') else {}
     
+    db_engine = create_engine(        
+        url=database.url,
+        echo=database.echo,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        **_pool_options(database)
+    )
+    install_sqlite_pragmas(db_engine, database)
+    return db_engine
+
+# Methods that never write, so never start a read-your-writes window
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Default async DBAPI driver for each backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+def get_async_database_url(database: Optional[DatabaseSettings] = None) -> str:
+    """Rewrite the configured database url to use its async driver."""
+    database = database or settings.database
+    url = make_url(database.url)
+    driver = database.async_driver or ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver known for database backend '{url.get_backend_name()}'")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def create_async_db_engine(database: Optional[DatabaseSettings] = None) -> AsyncEngine:
+    """Create the async database engine used by the API routers."""
+    database = database or settings.database
+    db_engine = create_async_engine(
+        url=get_async_database_url(database),
+        echo=database.echo,
+        poolclass=AsyncAdaptedQueuePool,
+        **_pool_options(database)
+    )
+    install_sqlite_pragmas(db_engine.sync_engine, database)
+    return db_engine
+
+# Create engine with connection pooling
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+if settings.database.profile:
+    log.info(f"Database profile: {settings.database.profile}")
 
 # Create sessionmaker
 SessionLocal = sessionmaker(
@@ -76,6 +140,57 @@ SessionLocal = sessionmaker(
     class_=Session # Use SQLModel Session class
 )
 
+# Objects are not expired on commit so handlers can return them without an implicit (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
+
+def create_replica_engines(database: Optional[DatabaseSettings] = None) -> List[AsyncEngine]:
+    """Create an async engine per configured read replica, sharing the primary's pool settings."""
+    database = database or settings.database
+    engines = []
+    for url in database.replicas.urls:
+        # The journal mode belongs to the database file and cannot be set over a read-only connection
+        replica = database.model_copy(update={
+            "url": url,
+            "sqlite": database.sqlite.model_copy(update={"journal_mode": None}),
+        })
+        engines.append(create_async_db_engine(replica))
+    return engines
+
+replica_engines = create_replica_engines()
+replica_router = ReplicaRouter(
+    AsyncSessionLocal,
+    [
+        Replica(db_engine.url.render_as_string(hide_password=True), async_sessionmaker(
+            bind=db_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+        ))
+        for db_engine in replica_engines
+    ],
+    selection=settings.database.replicas.selection,
+    retry_seconds=settings.database.replicas.retry_seconds,
+)
+
+# Tails the change log on the primary, where the triggers write it, for this worker's /changes/stream clients
+change_feed = changes.ChangeFeed(
+    AsyncSessionLocal,
+    poll_interval=settings.changes.poll_interval_seconds,
+    batch_size=settings.changes.batch_size,
+    subscriber_buffer=settings.changes.subscriber_buffer,
+    gap_wait=settings.changes.gap_wait_seconds,
+)
+
+def pool_statuses() -> Dict[str, Dict[str, Any]]:
+    """Gauges of every connection pool: the sync engine, the async API engine and each replica."""
+    capacity = settings.database.pool.size + settings.database.pool.max_overflow
+    pools = {"primary": pool_status(engine.pool, capacity), "primary_async": pool_status(async_engine.pool, capacity)}
+    for db_engine in replica_engines:
+        pools[db_engine.url.render_as_string(hide_password=True)] = pool_status(db_engine.pool, capacity)
+    return pools
+
 
 def verify_database_connection() -> bool:
     """Verify database connection is working."""
@@ -96,20 +211,74 @@ def get_db_session() -> Generator[Session, None, None]:
         yield session
     except Exception as e:
         session.rollback()
-        log.error(f"Database session error: {str(e)}")
+        log.error("Database session error: {}", e)
         raise
     finally:
         session.close()
 
+async def get_async_db_session(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """Async database session on the primary, used by the API routers for writes."""
+    window = settings.database.replicas.read_your_writes_seconds
+    if replica_router.replicas and window and request.method not in SAFE_METHODS:
+        # Keep this client's reads on the primary until the replicas have caught up
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, "1", max_age=int(window) or 1, httponly=True, samesite="lax")
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            log.error("Database session error: {}", e)
+            raise
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this client wrote recently, so its reads must not go to a replica that may be behind."""
+    return READ_YOUR_WRITES_COOKIE in request.cookies
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Async database session for read-only handlers: a replica when one is configured and healthy."""
+    async with replica_router.session(use_primary=reads_from_primary(request)) as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            log.error("Database session error: {}", e)
+            raise
+
+async def load_on_primary(load: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run a cache loader on a primary session.
+
+    Cached entries are shared by every client, so they must not be filled from a
+    replica that is behind a write which has just invalidated them.
+    """
+    async with AsyncSessionLocal() as session:
+        return await load(session)
+
+def current_schema_fingerprint(dialect) -> str:
+    """Fingerprint of the schema this code creates, search index, statistics and change log triggers included."""
+    extras = (
+        search.search_index_statements(dialect.name)
+        + stats.stats_trigger_statements(dialect.name)
+        + changes.change_trigger_statements(dialect.name)
+    )
+    return schema_fingerprint(SQLModel.metadata, dialect, extras)
+
 def init_db() -> None:
-    """Initialize the database, creating all tables."""
+    """Initialize the database, creating all tables.
+
+    Skipped when the database records the fingerprint of the current schema, which
+    saves the per-table reflection of `create_all()` on every process start.
+    """
     try:
-        log.info("Verifying database connection...")
-        if not verify_database_connection():
-            raise Exception("Database connection verification failed")
-            
+        with engine.connect() as conn:
+            fingerprint = current_schema_fingerprint(conn.dialect)
+            if stored_fingerprint(conn) == fingerprint:
+                log.info("Database schema is up to date")
+                return
+
         log.info("Creating database tables...")
-        SQLModel.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            SQLModel.metadata.create_all(bind=conn)
+            store_fingerprint(conn, fingerprint)
         log.info("Database tables created successfully")
     except Exception as e:
         log.error(f"Error initializing database: {str(e)}")
@@ -123,3 +292,14 @@ def cleanup_db() -> None:
     except Exception as e:
         log.error(f"Error cleaning up database connections: {str(e)}")
         raise
+
+async def cleanup_async_db() -> None:
+    """Cleanup async database connections."""
+    try:
+        await async_engine.dispose()
+        for db_engine in replica_engines:
+            await db_engine.dispose()
+        log.info("Async database connections cleaned up successfully")
+    except Exception as e:
+        log.error(f"Error cleaning up async database connections: {str(e)}")
+        raise
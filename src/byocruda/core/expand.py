@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi import HTTPException
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
+from sqlmodel import SQLModel
+
+
+def parse_expand(expand: Optional[str], relationships: Dict[str, InstrumentedAttribute]) -> List[str]:
+    """Split an `expand=a,b` query value and check every name against the allowed relationships."""
+    if not expand:
+        return []
+    names = [name.strip() for name in expand.split(",") if name.strip()]
+    unknown = [name for name in names if name not in relationships]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot expand {', '.join(unknown)}; allowed: {', '.join(relationships)}"
+        )
+    return list(dict.fromkeys(names))
+
+
+def expand_options(names: Sequence[str], relationships: Dict[str, InstrumentedAttribute]) -> list:
+    """Loader options fetching each expanded relationship with one batched IN query for the whole page."""
+    return [selectinload(relationships[name]) for name in names]
+
+
+def expand_rows(rows: Sequence[SQLModel], model: Type[SQLModel], names: Sequence[str]) -> List[SQLModel]:
+    """Build response models carrying only the expanded relationships.
+
+    Relationships that were not requested are left unset (and therefore never
+    lazy-loaded); the routes drop them with `response_model_exclude_unset`.
+    """
+    expanded = []
+    for row in rows:
+        data: Dict[str, Any] = row.model_dump()
+        for name in names:
+            data[name] = getattr(row, name)
+        expanded.append(model.model_validate(data))
+    return expanded
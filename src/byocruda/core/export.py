@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from typing import AsyncGenerator, Literal, Sequence, Type
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlmodel import SQLModel
+
+from byocruda.core.database import replica_router
+from byocruda.core.logging import log
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def select_public_columns(model: Type[SQLModel], public_model: Type[SQLModel], fields: Sequence[str] = ()) -> Select:
+    """Select only the columns exposed by `public_model` (or just `fields` of them), as plain rows instead of ORM objects."""
+    table = model.__table__
+    return select(*(table.c[name] for name in fields or public_model.model_fields))
+
+
+async def _stream_rows(statement: Select, format: ExportFormat, use_primary: bool) -> AsyncGenerator[bytes, None]:
+    # The session lives inside the generator: the response outlives the request's dependencies
+    async with replica_router.session(use_primary=use_primary) as session:
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(result.keys())
+        sent = 0
+        async for partition in result.partitions():
+            if format == "csv":
+                writer.writerows(partition)
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            else:
+                chunk = "".join(json.dumps(dict(row._mapping), default=str) + "\n" for row in partition)
+            sent += len(partition)
+            yield chunk.encode()
+        if format == "csv" and not sent:
+            yield buffer.getvalue().encode()
+        log.debug("Exported {} rows as {}", sent, format)
+
+
+def export_response(
+    statement: Select, *, format: ExportFormat, filename: str, use_primary: bool = False
+) -> StreamingResponse:
+    """Stream every row of `statement` as NDJSON or CSV, one server-side cursor batch at a time.
+
+    Rows are read from a replica unless `use_primary` (see `reads_from_primary`).
+    """
+    return StreamingResponse(
+        _stream_rows(statement, format, use_primary),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
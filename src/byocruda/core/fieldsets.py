@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.conditional import compute_row_validators, conditional_response
+from byocruda.core.pagination import parse_sort
+from byocruda.core.serialization import fast_row_response, select_fast_columns
+
+
+def parse_fields(
+    fields: Optional[str], public_model: Type[SQLModel], primary_key: str, expand: Sequence[str] = ()
+) -> List[str]:
+    """Split a `fields=a,b` query value and check every name against the public fields.
+
+    The primary key is always returned, first, so clients can address the rows.
+    An empty list means no projection: every public field.
+    """
+    if not fields:
+        return []
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in public_model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields {', '.join(unknown)}; allowed: {', '.join(public_model.model_fields)}"
+        )
+    if expand:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with expand")
+    return list(dict.fromkeys([primary_key, *names]))
+
+
+def sparse_columns(
+    fields: Sequence[str],
+    *,
+    columns: Dict[str, InstrumentedAttribute],
+    primary_key: InstrumentedAttribute,
+    sort: Optional[str] = None,
+) -> List[str]:
+    """Columns a projected list page selects: its fields plus the sort column the next cursor is read from."""
+    if not fields:
+        return []
+    name, _ = parse_sort(sort, columns, primary_key)
+    return list(dict.fromkeys([*fields, name]))
+
+
+async def sparse_detail(
+    session: AsyncSession,
+    request: Request,
+    response: Response,
+    *,
+    model: Type[SQLModel],
+    public_model: Type[SQLModel],
+    primary_key: str,
+    identity: Any,
+    fields: Sequence[str],
+    not_found: str,
+) -> Response:
+    """Detail view selecting and returning only `fields` of one row, without embedded relationships."""
+    statement = select_fast_columns(model, public_model, fields).where(getattr(model, primary_key) == identity)
+    row = (await session.exec(statement)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    not_modified = conditional_response(request, response, compute_row_validators(model.__tablename__, [row], primary_key, detail=True))
+    if not_modified:
+        return not_modified
+    return fast_row_response(row, fields, response)
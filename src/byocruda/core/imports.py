@@ -0,0 +1,246 @@
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Literal, Optional, Tuple, Type
+
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel import Session, SQLModel, select
+
+from byocruda.core.bulk import bulk_write, validate_records
+from byocruda.core.cache import invalidate_departments
+from byocruda.core.config import settings
+from byocruda.core.database import SessionLocal
+from byocruda.core.logging import log
+from byocruda.models.models import (
+    Department,
+    ImportJob,
+    ImportJobError,
+    User,
+    UserCreate,
+    Workstation,
+    WorkstationCreate,
+    WorkstationType,
+)
+
+ImportFormat = Literal["csv", "ndjson"]
+ImportResourceName = Literal["users", "workstations"]
+
+
+@dataclass
+class Reference:
+    """A foreign key that import files may give by name instead of by id."""
+    field: str
+    target: str
+    column: InstrumentedAttribute
+    key: InstrumentedAttribute
+
+
+@dataclass
+class ImportResource:
+    model: Type[SQLModel]
+    create_model: Type[SQLModel]
+    natural_key: str
+    primary_key: str
+    references: List[Reference] = field(default_factory=list)
+
+
+IMPORT_RESOURCES: Dict[str, ImportResource] = {
+    "users": ImportResource(
+        model=User,
+        create_model=UserCreate,
+        natural_key="userDN",
+        primary_key="user_id",
+        references=[
+            Reference("department", "department_id", Department.name, Department.department_id),
+        ],
+    ),
+    "workstations": ImportResource(
+        model=Workstation,
+        create_model=WorkstationCreate,
+        natural_key="hostname",
+        primary_key="workstation_id",
+        references=[
+            Reference("department", "department_id", Department.name, Department.department_id),
+            Reference("workstation_type", "type_id", WorkstationType.workstation_type, WorkstationType.workstation_type_id),
+            Reference("userDN", "user_id", User.userDN, User.user_id),
+        ],
+    ),
+}
+
+
+def infer_format(filename: str) -> Optional[ImportFormat]:
+    """Guess the import format from a file name."""
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+    return None
+
+
+def _read_records(raw: BinaryIO, format: ImportFormat) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Lazily yield (row number, record) pairs; row numbers are 1-based data rows."""
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                # Empty cells mean "not given", so model defaults apply
+                yield row_number, {k: v for k, v in row.items() if k and v != ""}
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield row_number, json.loads(line)
+                except ValueError:
+                    # Passed on as-is and reported as an error row
+                    yield row_number, line.strip()
+    finally:
+        # Leave the underlying file open: progress is read from its position
+        text.detach()
+
+
+def _batches(records: Iterator[Tuple[int, Dict[str, Any]]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_lookups(session: Session, resource: ImportResource) -> Dict[str, Dict[Any, int]]:
+    """Load name -> id tables for every reference once per job."""
+    return {
+        reference.field: dict(session.exec(select(reference.column, reference.key)).all())
+        for reference in resource.references
+    }
+
+
+def _resolve_references(record: Dict[str, Any], resource: ImportResource, lookups: Dict[str, Dict[Any, int]]) -> Optional[str]:
+    """Replace reference names with ids in place, returning an error message if one is unknown."""
+    for reference in resource.references:
+        name = record.pop(reference.field, None)
+        if name is None or record.get(reference.target) is not None:
+            continue
+        resolved = lookups[reference.field].get(name)
+        if resolved is None:
+            return f"Unknown {reference.field} '{name}'"
+        record[reference.target] = resolved
+    return None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _import_batch(
+    session: Session, job: ImportJob, resource: ImportResource,
+    lookups: Dict[str, Dict[Any, int]], batch: List[Tuple[int, Dict[str, Any]]], chunk_size: int
+) -> List[ImportJobError]:
+    """Resolve, validate and write one batch, returning the rows that failed."""
+    failed: List[ImportJobError] = []
+    records, row_numbers = [], []
+    for row_number, record in batch:
+        raw = json.dumps(record, default=str) if isinstance(record, dict) else str(record)
+        error = _resolve_references(record, resource, lookups) if isinstance(record, dict) else "Record is not a JSON object"
+        if error:
+            failed.append(ImportJobError(import_job_id=job.import_job_id, row_number=row_number, error=error, record=raw))
+        else:
+            records.append(record)
+            row_numbers.append((row_number, raw))
+
+    rows, errors = validate_records(records, resource.create_model, resource.natural_key)
+    result = bulk_write(
+        session, resource.model, rows, errors,
+        natural_key=resource.natural_key,
+        primary_key=resource.primary_key,
+        upsert=job.upsert,
+        atomic=False,
+        chunk_size=chunk_size,
+    )
+    for row in result.results:
+        if row.status == "error":
+            row_number, raw = row_numbers[row.index]
+            failed.append(ImportJobError(import_job_id=job.import_job_id, row_number=row_number, error=row.error, record=raw))
+    job.imported_rows += result.created + result.updated
+    return failed
+
+
+def run_import_job(job_id: int, path: Path, *, chunk_size: Optional[int] = None, remove_file: bool = False) -> Optional[ImportJob]:
+    """Stream an import file into the database in fixed-size chunks, tracking progress on the job row.
+
+    Every chunk is committed on its own together with the job's counters and error
+    rows, so a large file never holds one long transaction.
+    """
+    chunk_size = chunk_size or settings.imports.chunk_size
+    with SessionLocal() as session:
+        job = session.get(ImportJob, job_id)
+        if job is None:
+            log.warning(f"Import job {job_id} not found; nothing to run")
+            if remove_file:
+                Path(path).unlink(missing_ok=True)
+            return None
+        # Whatever goes wrong, the job ends failed rather than running forever for clients polling it
+        try:
+            resource = IMPORT_RESOURCES[job.resource]
+            job.status = "running"
+            job.started_at = _now()
+            session.add(job)
+            session.commit()
+            log.info(f"Import job {job_id} started: {job.resource} from {job.source or path}")
+
+            lookups = build_lookups(session, resource)
+            with open(path, "rb") as raw:
+                job.bytes_total = os.fstat(raw.fileno()).st_size
+                session.add(job)
+                session.commit()
+                for batch in _batches(_read_records(raw, job.format), chunk_size):
+                    failed = _import_batch(session, job, resource, lookups, batch, chunk_size)
+                    session.add_all(failed)
+                    job.processed_rows += len(batch)
+                    job.failed_rows += len(failed)
+                    job.bytes_processed = raw.tell()
+                    session.add(job)
+                    session.commit()
+                    if job.resource == "users":
+                        invalidate_departments()
+            job.bytes_processed = job.bytes_total
+            job.status = "completed"
+        except Exception as e:
+            session.rollback()
+            log.error(f"Import job {job_id} failed: {str(e)}")
+            job = session.get(ImportJob, job_id)
+            if job is None:
+                log.warning(f"Import job {job_id} was deleted while running")
+                return None
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            if remove_file:
+                Path(path).unlink(missing_ok=True)
+
+        job.finished_at = _now()
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        log.info(
+            f"Import job {job_id} {job.status}: {job.imported_rows} imported, "
+            f"{job.failed_rows} failed of {job.processed_rows} rows"
+        )
+        return job
+
+
+def create_import_job(session: Session, resource: ImportResourceName, format: ImportFormat, source: Optional[str], upsert: bool) -> ImportJob:
+    """Register a pending job."""
+    job = ImportJob(resource=resource, format=format, source=source, upsert=upsert)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
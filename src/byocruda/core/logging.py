@@ -1,32 +1,174 @@
+import json
+import random
 import sys
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
 from loguru import logger
 from byocruda.core.config import settings
+from byocruda.core.metrics import route_template
+
+# Records at or above this level are never sampled away
+_WARNING = 30
+
+# ASGI scope of the request being handled, for per-route sampling
+_request_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_request_scope", default=None)
+
+
+class RateLimiter:
+    """Let through at most `burst` records per call site and window.
+
+    Records are keyed by where they were logged rather than by their text, so a
+    message repeated with different values counts as one. The first record of a
+    new window notes how many were dropped in the previous one.
+    """
+
+    def __init__(self, burst: int, window_seconds: float):
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self._windows: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, record) -> bool:
+        key = (record["name"], record["function"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record["message"] += f" ({suppressed} similar messages suppressed)"
+                return True
+            window[1] += 1
+            if window[1] > self.burst:
+                window[2] += 1
+                return False
+            return True
+
+
+def _sampled(record) -> bool:
+    if record["level"].no >= _WARNING or not settings.logging.sample_rates:
+        return True
+    scope = _request_scope.get()
+    # Outside requests, or before routing has picked the route
+    if scope is None or scope.get("route") is None:
+        return True
+    keep = scope.get("byocruda.log_sampled")
+    if keep is None:
+        rate = settings.logging.sample_rates.get(route_template(scope))
+        keep = scope["byocruda.log_sampled"] = rate is None or random.random() < rate
+    return keep
+
+
+def _is_slow_query(record) -> bool:
+    return "slow_query" in record["extra"]
+
+
+def _json_record(record) -> str:
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    entry.update((key, value) for key, value in record["extra"].items() if not key.startswith("_"))
+    scope = _request_scope.get()
+    if scope is not None:
+        entry["method"], entry["path"] = scope["method"], scope["path"]
+    if record["exception"] is not None:
+        exception = record["exception"]
+        entry["exception"] = "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+    return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def _json_format(record) -> str:
+    # Computed once per record and shared by every JSON sink
+    if "_json" not in record["extra"]:
+        record["extra"]["_json"] = _json_record(record)
+    return "{extra[_json]}\n"
+
 
 def setup_logging():
-    """Configure logging for the application."""
+    """Configure logging for the application (again, when the settings changed)."""
+    config = settings.logging
+    production = config.mode == "production"
+    enqueue = production if config.enqueue is None else config.enqueue
+    json_output = production if config.json_output is None else config.json_output
+    burst = (50 if production else 0) if config.rate_limit_burst is None else config.rate_limit_burst
+    rate_limiter = RateLimiter(burst, config.rate_limit_window_seconds) if burst else None
+
+    def keep(record) -> bool:
+        if _is_slow_query(record):
+            return False
+        # Decided once per record, however many sinks ask
+        decision = record["extra"].get("_keep")
+        if decision is None:
+            decision = _sampled(record) and (rate_limiter is None or rate_limiter.allow(record))
+            record["extra"]["_keep"] = decision
+        return decision
+
     # Remove default handler
     logger.remove()
 
     # Configure console logging
     logger.add(
         sys.stderr,
-        format=settings.logging.format,
-        level=settings.logging.level,
-        colorize=True,
+        format=_json_format if json_output else config.format,
+        level=config.level,
+        colorize=not json_output,
+        filter=keep,
+        enqueue=enqueue,
     )
 
     # Configure file logging
     logger.add(
-        settings.logging.file_path,
-        format=settings.logging.format,
-        level=settings.logging.level,
-        rotation=settings.logging.rotation,
-        retention=settings.logging.retention,
+        config.file_path,
+        format=_json_format if json_output else config.format,
+        level=config.level,
+        rotation=config.rotation,
+        retention=config.retention,
+        filter=keep,
+        enqueue=enqueue,
     )
 
-    # You can add more custom configurations here if needed
+    # Slow statements get a file of their own (see core.queries)
+    logger.add(
+        config.slow_query_file_path,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {message}",
+        level="WARNING",
+        rotation=config.rotation,
+        retention=config.retention,
+        filter=_is_slow_query,
+        enqueue=enqueue,
+    )
 
     return logger
 
+
+class LogContextMiddleware:
+    """ASGI middleware making the current request visible to the logging filters and JSON records."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
 # Create a global logger instance
 log = setup_logging()
+# Records bound with slow_query go to the slow query sink only
+slow_query_log = log.bind(slow_query=True)
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.serialization import FastJSONResponse, row_dicts, select_fast_columns
+
+
+def parse_ids(ids: Optional[str], max_keys: int) -> List[int]:
+    """Split an `ids=1,2,3` query value into distinct integer ids, in the order given."""
+    names = [name.strip() for name in (ids or "").split(",") if name.strip()]
+    try:
+        values = [int(name) for name in names]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"ids must be comma separated integers, got '{ids}'")
+    return distinct_keys(values, max_keys)
+
+
+def distinct_keys(keys: Sequence[Any], max_keys: int) -> List[Any]:
+    """Drop repeated keys, keeping the first occurrence, and enforce the per-request limit."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        raise HTTPException(status_code=400, detail="At least one key is required")
+    if len(keys) > max_keys:
+        raise HTTPException(status_code=413, detail=f"At most {max_keys} keys are accepted per lookup")
+    return keys
+
+
+async def lookup_rows(
+    session: AsyncSession,
+    *,
+    model: Type[SQLModel],
+    public_model: Type[SQLModel],
+    key: str,
+    keys: Sequence[Any],
+    fields: Sequence[str] = (),
+    chunk_size: int,
+) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    """Resolve `keys` of the (unique, indexed) `key` column with one IN (...) query per chunk.
+
+    Returns the public fields (or only `fields`) of the rows found, in the order of
+    `keys`, and the keys no row matched.
+    """
+    column = getattr(model, key)
+    # The key column is selected even when not requested, to match rows back to keys
+    columns = list(dict.fromkeys([*fields, key])) if fields else ()
+    found = {}
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        statement = select_fast_columns(model, public_model, columns).where(column.in_(chunk))
+        for row in (await session.exec(statement)).all():
+            found[row._mapping[key]] = row
+    rows = [found[value] for value in keys if value in found]
+    return row_dicts(rows, public_model, fields), [value for value in keys if value not in found]
+
+
+def lookup_response(found: List[Dict[str, Any]], missing: List[Any]) -> FastJSONResponse:
+    return FastJSONResponse({"found": found, "missing": missing})
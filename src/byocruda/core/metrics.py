@@ -0,0 +1,219 @@
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.pool import Pool
+
+from byocruda.core.config import settings
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests no route matched, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are stored per bucket and made cumulative on render."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        # One slot per bucket plus the +Inf overflow
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # Prometheus buckets are inclusive upper bounds ("le"), hence bisect_left
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip([*self.buckets, float("inf")], self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else _number(bound), total))
+        return result
+
+
+class RequestMetrics:
+    """Request counts, latency and response size histograms keyed by (method, route template, status).
+
+    Recording happens on the event loop without locking, so a worker process keeps
+    its own numbers; with several workers each one serves its own /metrics.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float], size_buckets: Sequence[float]):
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self._series: Dict[Tuple[str, str, str], Tuple[Histogram, Histogram]] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        key = (method, route, str(status))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = (Histogram(self.latency_buckets), Histogram(self.size_buckets))
+        series[0].observe(seconds)
+        series[1].observe(size)
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> List[str]:
+        series = sorted(self._series.items())
+        lines = [
+            "# HELP byocruda_http_requests_total Requests handled, by route template and status code.",
+            "# TYPE byocruda_http_requests_total counter",
+        ]
+        for key, (latency, _) in series:
+            lines.append(f"byocruda_http_requests_total{{{_labels(key)}}} {latency.count}")
+        for name, help_text, index in (
+            ("byocruda_http_request_duration_seconds", "Time from receiving a request to sending the last response byte.", 0),
+            ("byocruda_http_response_size_bytes", "Response body size.", 1),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for key, histograms in series:
+                histogram = histograms[index]
+                labels = _labels(key)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+
+def _labels(key: Tuple[str, str, str]) -> str:
+    method, route, status = key
+    return f'method="{method}",route="{_escape(route)}",status="{status}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def route_template(scope) -> str:
+    """The path template of the route that handled a request, including router prefixes.
+
+    Routers included with a prefix may expose only their own part of the template
+    ("/{user_id}"), so the prefix is recovered from the concrete path: whatever
+    precedes the route's part once its path parameters are filled in.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    try:
+        concrete = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + path_format
+    return path_format
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request into `metrics`.
+
+    The route label is the matched route's path template ("/api/v1/users/{user_id}"),
+    taken from the scope after routing, so ids in URLs do not create new series.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.record(scope["method"], route_template(scope), status, time.perf_counter() - start, size)
+
+
+def pool_waiters(pool: Pool) -> int:
+    """Number of checkouts currently blocked waiting for a connection.
+
+    SQLAlchemy has no public counter for this; it is read from the pool's queue
+    (threads waiting on the condition for QueuePool, pending getters of the asyncio
+    queue for AsyncAdaptedQueuePool) and reported as 0 for other pools.
+    """
+    queue = getattr(pool, "_pool", None)
+    condition = getattr(queue, "not_empty", None)
+    if condition is not None:
+        return len(getattr(condition, "_waiters", ()))
+    # The asyncio queue is created lazily on first use; do not create it here
+    async_queue = getattr(queue, "__dict__", {}).get("_queue")
+    return len(getattr(async_queue, "_getters", ()))
+
+
+def pool_status(pool: Pool, capacity: Optional[int] = None) -> Dict[str, Any]:
+    """Gauges of a queue pool; saturation is checked out connections over `capacity` (size + max overflow)."""
+    size = pool.size() if hasattr(pool, "size") else 0
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    status = {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "waiters": pool_waiters(pool),
+    }
+    capacity = capacity or size
+    status["saturation"] = round(checked_out / capacity, 4) if capacity else 0.0
+    return status
+
+
+def render_pool_metrics(pools: Dict[str, Dict[str, Any]]) -> List[str]:
+    lines = []
+    for gauge, help_text in (
+        ("size", "Connections the pool keeps open."),
+        ("checked_out", "Connections currently in use."),
+        ("overflow", "Connections open beyond the pool size."),
+        ("waiters", "Checkouts waiting for a free connection."),
+        ("saturation", "Checked out connections over pool size plus max overflow."),
+    ):
+        name = f"byocruda_db_pool_{gauge}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for pool_name, status in pools.items():
+            lines.append(f'{name}{{pool="{_escape(pool_name)}"}} {_number(status[gauge])}')
+    return lines
+
+
+def render(metrics: RequestMetrics, pools: Dict[str, Dict[str, Any]]) -> str:
+    """The text exposition of the request metrics and the pool gauges."""
+    return "\n".join([*metrics.render(), *render_pool_metrics(pools)]) + "\n"
+
+
+def readiness(pools: Dict[str, Dict[str, Any]], max_saturation: float) -> Dict[str, Any]:
+    """Ready while every pool is below `max_saturation` and nothing is waiting for a connection."""
+    saturated = [
+        name for name, status in pools.items()
+        if status["saturation"] >= max_saturation or status["waiters"]
+    ]
+    return {"ready": not saturated, "saturated_pools": saturated, "pools": pools}
+
+
+
+# Request metrics of this worker process
+request_metrics = RequestMetrics(settings.metrics.latency_buckets, settings.metrics.size_buckets)
@@ -0,0 +1,126 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel.sql.expression import SelectOfScalar
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_sort(sort: Optional[str], columns: Dict[str, InstrumentedAttribute], primary_key: InstrumentedAttribute) -> tuple[str, bool]:
+    """Validate a `sort` query value ("name" or "-name") against the whitelisted columns.
+
+    Returns the column name and whether the ordering is descending.
+    """
+    if not sort:
+        return primary_key.key, False
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name != primary_key.key and name not in columns:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by '{name}'")
+    return name, descending
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Build an opaque cursor from the sort key and the last row's key values."""
+    payload = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor`, checking it matches the requested sort and holds `size` values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort or not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+    # Only scalars can be compared against a column; anything else is a tampered cursor
+    if len(values) != size or not all(value is None or isinstance(value, (str, int, float, bool)) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _keyset_filter(column, primary_key, value, last_pk, descending: bool):
+    """Rows strictly after (value, last_pk), treating NULL as the smallest value."""
+    if descending:
+        if value is None:
+            return and_(column.is_(None), primary_key < last_pk)
+        return or_(column < value, and_(column == value, primary_key < last_pk), column.is_(None))
+    if value is None:
+        return or_(and_(column.is_(None), primary_key > last_pk), column.is_not(None))
+    return or_(column > value, and_(column == value, primary_key > last_pk))
+
+
+def order_by_sort(
+    statement,
+    *,
+    columns: Dict[str, InstrumentedAttribute],
+    primary_key: InstrumentedAttribute,
+    sort: Optional[str] = None,
+):
+    """Order a select by the requested sort column, with the primary key as tie-breaker."""
+    name, descending = parse_sort(sort, columns, primary_key)
+    if name == primary_key.key:
+        return statement.order_by(primary_key.desc() if descending else primary_key.asc())
+    column = columns[name]
+    if descending:
+        return statement.order_by(column.desc().nulls_last(), primary_key.desc())
+    return statement.order_by(column.asc().nulls_first(), primary_key.asc())
+
+
+def paginate(
+    statement: SelectOfScalar,
+    *,
+    columns: Dict[str, InstrumentedAttribute],
+    primary_key: InstrumentedAttribute,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> SelectOfScalar:
+    """Order a select and page it either by keyset (when a cursor is given) or by offset.
+
+    Keyset pages are keyed on (sort column, primary key), so every page costs a
+    single index range scan no matter how deep it is.
+    """
+    name, descending = parse_sort(sort, columns, primary_key)
+    sort_key = f"-{name}" if descending else name
+    statement = order_by_sort(statement, columns=columns, primary_key=primary_key, sort=sort)
+
+    if cursor is not None and name == primary_key.key:
+        (last_pk,) = decode_cursor(cursor, sort_key, 1)
+        statement = statement.where(primary_key < last_pk if descending else primary_key > last_pk)
+    elif cursor is not None:
+        value, last_pk = decode_cursor(cursor, sort_key, 2)
+        statement = statement.where(_keyset_filter(columns[name], primary_key, value, last_pk, descending))
+
+    if cursor is None and skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
+
+
+def next_cursor(
+    rows: Sequence[Any],
+    *,
+    columns: Dict[str, InstrumentedAttribute],
+    primary_key: InstrumentedAttribute,
+    sort: Optional[str] = None,
+    limit: int = 100,
+) -> Optional[str]:
+    """Return the cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    name, descending = parse_sort(sort, columns, primary_key)
+    sort_key = f"-{name}" if descending else name
+    last = rows[-1]
+    if name == primary_key.key:
+        return encode_cursor(sort_key, [getattr(last, name)])
+    return encode_cursor(sort_key, [getattr(last, name), getattr(last, primary_key.key)])
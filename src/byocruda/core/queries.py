@@ -0,0 +1,116 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from byocruda.core.config import settings
+from byocruda.core.logging import log, slow_query_log
+
+_WHITESPACE = re.compile(r"\s+")
+# Placeholder lists of IN clauses and multi-row VALUES vary in length with the data
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%\([^)]*\)s|\$\d+|:\w+)(\s*,\s*(\?|%\([^)]*\)s|\$\d+|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request."""
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times, most repeated first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in literals or list lengths compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+
+def redact(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so values never reach the log."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return "<redacted>"
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements run by this task (and the threads/greenlets it hands work to)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.shapes[statement_shape(statement)] += 1
+    slow_query_ms = settings.database.instrumentation.slow_query_ms
+    if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+        slow_query_log.warning(
+            f"{elapsed * 1000:.1f} ms | {_WHITESPACE.sub(' ', statement).strip()} | {redact(parameters, executemany)}"
+        )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware tracking the statements of each request.
+
+    The totals go out in a `Server-Timing: db;dur=<ms>;desc="<n> queries"` header,
+    so they cover the statements run before the response started (all of them,
+    except for streamed responses). Shapes repeated more than the N+1 threshold
+    are logged once the request is done.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", stats.server_timing().encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                threshold = settings.database.instrumentation.n_plus_one_threshold
+                for shape, count in stats.repeated(threshold):
+                    log.warning("Possible N+1 in {} {}: statement ran {} times: {}", scope["method"], scope["path"], count, shape)
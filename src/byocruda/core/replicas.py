@@ -0,0 +1,96 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.logging import log
+
+# Cookie marking a client that wrote recently, so its reads go to the primary
+READ_YOUR_WRITES_COOKIE = "byocruda_read_primary"
+
+
+class Replica:
+    """A read replica's session factory plus the state used to pick one."""
+
+    def __init__(self, name: str, sessionmaker: async_sessionmaker):
+        self.name = name
+        self.sessionmaker = sessionmaker
+        # Sessions currently checked out, for least-busy selection
+        self.in_use = 0
+        # Monotonic time until which the replica is skipped after a failed connection
+        self.unhealthy_until = 0.0
+
+
+class ReplicaRouter:
+    """Hands out read sessions from the replicas, falling back to the primary.
+
+    A replica whose connection fails is skipped for `retry_seconds`; while no
+    replica is healthy (or none is configured) reads use the primary.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[Replica] = (),
+        *,
+        selection: str = "round_robin",
+        retry_seconds: float = 30.0,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self._next = 0
+
+    def healthy(self) -> List[Replica]:
+        now = time.monotonic()
+        return [replica for replica in self.replicas if replica.unhealthy_until <= now]
+
+    def choose(self) -> Optional[Replica]:
+        """Pick a healthy replica, round-robin or least busy; None when there is none."""
+        candidates = self.healthy()
+        if not candidates:
+            return None
+        if self.selection == "least_busy":
+            return min(candidates, key=lambda replica: replica.in_use)
+        replica = candidates[self._next % len(candidates)]
+        self._next += 1
+        return replica
+
+    def mark_unhealthy(self, replica: Replica, error: Exception) -> None:
+        replica.unhealthy_until = time.monotonic() + self.retry_seconds
+        log.warning(f"Read replica {replica.name} unavailable, using the primary for {self.retry_seconds}s: {str(error)}")
+
+    @asynccontextmanager
+    async def session(self, use_primary: bool = False) -> AsyncIterator[AsyncSession]:
+        """A read session on a replica, or on the primary when asked to or when no replica answers."""
+        replica = None if use_primary else self.choose()
+        if replica is not None:
+            session = replica.sessionmaker()
+            try:
+                # Connect up front so an unreachable replica falls back instead of failing the request
+                await session.connection()
+            except (DBAPIError, OSError) as e:
+                await session.close()
+                self.mark_unhealthy(replica, e)
+                replica = None
+        if replica is None:
+            session = self.primary()
+        else:
+            replica.in_use += 1
+        try:
+            async with session:
+                yield session
+        finally:
+            if replica is not None:
+                replica.in_use -= 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {"name": replica.name, "healthy": replica.unhealthy_until <= now, "in_use": replica.in_use}
+            for replica in self.replicas
+        ]
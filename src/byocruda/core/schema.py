@@ -0,0 +1,42 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, Connection, DateTime, MetaData, String, Table, delete, inspect, insert, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import SQLModel
+
+SCHEMA_TABLE = "schema_info"
+
+# Part of the metadata, so dropping the schema drops the fingerprint with it
+schema_info = Table(
+    SCHEMA_TABLE,
+    SQLModel.metadata,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect, extra_statements: Sequence[str] = ()) -> str:
+    """Hash of the DDL `metadata.create_all()` would emit on `dialect`, plus `extra_statements`
+    for the objects created by DDL event listeners (triggers, search index)."""
+    statements = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+    statements += extra_statements
+    return hashlib.sha256("\n".join(statements).encode()).hexdigest()
+
+
+def stored_fingerprint(connection: Connection) -> Optional[str]:
+    """The fingerprint recorded by the last schema creation, or None on a database without one."""
+    if not inspect(connection).has_table(SCHEMA_TABLE):
+        return None
+    return connection.execute(select(schema_info.c.fingerprint)).scalars().first()
+
+
+def store_fingerprint(connection: Connection, fingerprint: str) -> None:
+    connection.execute(delete(schema_info))
+    connection.execute(insert(schema_info).values(fingerprint=fingerprint, created_at=datetime.now(timezone.utc)))
@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Connection, event, text
+from sqlmodel import SQLModel
+
+from byocruda.core.logging import log
+
+# SQLite FTS5 table holding one document per searchable row
+SEARCH_TABLE = "search_index"
+
+
+@dataclass
+class SearchSource:
+    """A table whose rows are searchable.
+
+    Rows are stored in the FTS table under rowid = primary key * len(SEARCH_SOURCES)
+    + `slot`, so triggers can replace a row's document by rowid without a scan.
+    """
+    kind: str
+    table: str
+    primary_key: str
+    title: Sequence[str]
+    body: Sequence[str]
+    slot: int
+
+    def _concat(self, columns: Sequence[str], prefix: str, quote: Callable[[str], str]) -> str:
+        return " || ' ' || ".join(f"coalesce({prefix}{quote(column)}, '')" for column in columns)
+
+    def title_sql(self, prefix: str = "", quote: Callable[[str], str] = str) -> str:
+        return self._concat(self.title, prefix, quote)
+
+    def body_sql(self, prefix: str = "", quote: Callable[[str], str] = str) -> str:
+        return self._concat(self.body, prefix, quote)
+
+    def document_sql(self, quote: Callable[[str], str] = str) -> str:
+        return self._concat([*self.title, *self.body], "", quote)
+
+    def rowid_sql(self, prefix: str = "") -> str:
+        return f"{prefix}{self.primary_key} * {len(SEARCH_SOURCES)} + {self.slot}"
+
+
+SEARCH_SOURCES: List[SearchSource] = [
+    SearchSource("workstations", "workstations", "workstation_id", ["hostname"], ["hardware_description", "notes"], 0),
+    SearchSource("users", "users", "user_id", ["name", "userDN"], ["notes", "office_location"], 1),
+]
+SEARCH_KINDS = {source.kind: source for source in SEARCH_SOURCES}
+
+
+@lru_cache(maxsize=None)
+def _postgresql_quote(column: str) -> str:
+    """Quote a column name PostgreSQL would otherwise fold to lower case, such as userDN."""
+    # Imported on first use so SQLite deployments never load the PostgreSQL dialect
+    from sqlalchemy.dialects import postgresql
+    return postgresql.dialect().identifier_preparer.quote(column)
+
+
+def _sqlite_triggers(source: SearchSource) -> List[str]:
+    columns = ", ".join([*source.title, *source.body])
+    insert = (
+        f"INSERT INTO {SEARCH_TABLE}(rowid, title, body) "
+        f"VALUES ({source.rowid_sql('new.')}, {source.title_sql('new.')}, {source.body_sql('new.')});"
+    )
+    delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {source.rowid_sql('old.')};"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_insert AFTER INSERT ON {source.table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_update AFTER UPDATE OF {columns} ON {source.table} BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_search_delete AFTER DELETE ON {source.table} BEGIN {delete} END",
+    ]
+
+
+def _postgresql_index(source: SearchSource) -> str:
+    return (
+        f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search ON {source.table} "
+        f"USING GIN (to_tsvector('simple', {source.document_sql(_postgresql_quote)}))"
+    )
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Re-fill the SQLite FTS table from the source tables (PostgreSQL indexes need no rebuild)."""
+    if connection.dialect.name != "sqlite":
+        return
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    for source in SEARCH_SOURCES:
+        connection.execute(text(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, title, body) "
+            f"SELECT {source.rowid_sql()}, {source.title_sql()}, {source.body_sql()} FROM {source.table}"
+        ))
+
+
+def search_index_statements(dialect: str) -> List[str]:
+    """DDL creating the search index and, on SQLite, the triggers keeping it current."""
+    if dialect == "postgresql":
+        return [_postgresql_index(source) for source in SEARCH_SOURCES]
+    if dialect != "sqlite":
+        return []
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+    for source in SEARCH_SOURCES:
+        statements += _sqlite_triggers(source)
+    return statements
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_search_index(target, connection: Connection, **kw) -> None:
+    """Create the search index with the schema; a newly created SQLite index is back-filled."""
+    dialect = connection.dialect.name
+    exists = dialect != "sqlite" or connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+    ).first()
+    for statement in search_index_statements(dialect):
+        connection.execute(text(statement))
+    if not exists:
+        rebuild_search_index(connection)
+        log.info("Search index built")
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def drop_search_index(target, connection: Connection, **kw) -> None:
+    # The triggers go with their tables; the FTS table is not part of the metadata
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted so user input cannot use (or break on) FTS5 query syntax.
+    """
+    words = [word.replace('"', '""') for word in q.split()]
+    if not words:
+        return '""'
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def _sqlite_search(kinds: Sequence[str], limit: int, offset: int):
+    slots = ", ".join(str(SEARCH_KINDS[kind].slot) for kind in kinds)
+    count = len(SEARCH_SOURCES)
+    kind_case = " ".join(f"WHEN {source.slot} THEN '{source.kind}'" for source in SEARCH_SOURCES)
+    return text(
+        f"SELECT CASE rowid % {count} {kind_case} END AS kind, rowid / {count} AS id, title, "
+        f"snippet({SEARCH_TABLE}, 1, '[', ']', '…', 12) AS snippet, "
+        # bm25 is lower for better matches; title hits weigh more than body hits
+        f"-bm25({SEARCH_TABLE}, 5.0, 1.0) AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :q AND rowid % {count} IN ({slots}) "
+        f"ORDER BY score DESC, rowid LIMIT {int(limit)} OFFSET {int(offset)}"
+    )
+
+
+def _postgresql_search(kinds: Sequence[str], limit: int, offset: int):
+    selects = []
+    for kind in kinds:
+        source = SEARCH_KINDS[kind]
+        document = f"to_tsvector('simple', {source.document_sql(_postgresql_quote)})"
+        selects.append(
+            f"SELECT '{source.kind}' AS kind, {source.primary_key} AS id, {source.title_sql(quote=_postgresql_quote)} AS title, "
+            f"ts_headline('simple', {source.body_sql(quote=_postgresql_quote)}, query, 'StartSel=[, StopSel=]') AS snippet, "
+            f"ts_rank({document}, query) AS score "
+            f"FROM {source.table}, plainto_tsquery('simple', :q) AS query WHERE {document} @@ query"
+        )
+    return text(
+        " UNION ALL ".join(selects) + f" ORDER BY score DESC, kind, id LIMIT {int(limit)} OFFSET {int(offset)}"
+    )
+
+
+async def search(session, q: str, *, kinds: Optional[Sequence[str]] = None, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    """Ranked full-text matches across users and workstations, best first."""
+    kinds = list(kinds or SEARCH_KINDS)
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        statement, params = _postgresql_search(kinds, limit, offset), {"q": q}
+    else:
+        statement, params = _sqlite_search(kinds, limit, offset), {"q": fts5_query(q)}
+    result = await session.exec(statement, params=params)
+    return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,228 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate, repeat
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Connection, Engine, Table, text
+from sqlmodel import SQLModel
+
+from byocruda.core.changes import create_change_triggers
+from byocruda.core.logging import log
+from byocruda.core.search import create_search_index, rebuild_search_index
+from byocruda.core.stats import create_stats_triggers, rebuild_stats
+from byocruda.models.models import Department, User, Workstation, WorkstationType
+
+# Fixed modification time of seeded rows, so the same seed gives the same data (and ETags)
+SEED_TIMESTAMP = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_FIRST_ARRIVAL = date(2015, 1, 1)
+
+_VIDEO_RAM_GB = (0, 8, 12, 16, 24, 48, 80)
+_SYSTEM_RAM_GB = (16, 32, 64, 128, 256, 512)
+_STORAGE_TB = (0.5, 1.0, 2.0, 4.0, 8.0)
+_BUILDINGS = ("A", "B", "C", "D", "E")
+
+
+@dataclass
+class SeedPlan:
+    """Row counts of a seeded inventory; unset counts scale with `workstations`."""
+    workstations: int
+    users: Optional[int] = None
+    departments: Optional[int] = None
+    workstation_types: int = 12
+
+    def __post_init__(self):
+        if self.users is None:
+            self.users = max(10, self.workstations * 3 // 5)
+        if self.departments is None:
+            self.departments = max(5, self.workstations // 2000)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "departments": self.departments,
+            "workstation_types": self.workstation_types,
+            "users": self.users,
+            "workstations": self.workstations,
+        }
+
+
+def _zipf_cum_weights(n: int, exponent: float) -> List[float]:
+    # A few large departments / common types and a long tail of small ones
+    return list(accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+
+def _chunks(total: int, chunk_size: int) -> Iterator[range]:
+    for start in range(1, total + 1, chunk_size):
+        yield range(start, min(start + chunk_size, total + 1))
+
+
+def _insert(connection: Connection, table: Table, columns: Dict[str, Any]) -> None:
+    """Insert column-wise generated values as one executemany of a compiled core INSERT.
+
+    Values are sequences, or a scalar shared by every row. The rows go to the driver
+    as they are: bind processing is applied per column up front (once for scalars),
+    which skips SQLAlchemy's per-row parameter handling, most of the cost.
+    """
+    compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(columns))
+    count = next(len(v) for v in columns.values() if isinstance(v, (list, range)))
+    values = {}
+    for name, column_values in columns.items():
+        processor = table.c[name].type.dialect_impl(connection.dialect).bind_processor(connection.dialect)
+        if not isinstance(column_values, (list, range)):
+            values[name] = repeat(processor(column_values) if processor else column_values, count)
+        else:
+            values[name] = [processor(v) for v in column_values] if processor else column_values
+    if compiled.positional:
+        rows = list(zip(*(values[name] for name in compiled.positiontup)))
+    else:
+        rows = [dict(zip(values, row)) for row in zip(*values.values())]
+    connection.exec_driver_sql(str(compiled), rows)
+
+
+def _secondary_indexes(tables: Sequence[Table]) -> list:
+    return [index for table in tables for index in table.indexes]
+
+
+def _disable_triggers(connection: Connection, tables: Sequence[Table]) -> None:
+    """Stop the search, statistics and change log triggers; the first two are rebuilt in one pass after loading."""
+    if connection.dialect.name == "sqlite":
+        names = [name for name in connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )).scalars()]
+        for name in names:
+            connection.execute(text(f'DROP TRIGGER "{name}"'))
+    elif connection.dialect.name == "postgresql":
+        for table in tables:
+            connection.execute(text(f"ALTER TABLE {table.name} DISABLE TRIGGER USER"))
+
+
+def _enable_triggers(connection: Connection, tables: Sequence[Table]) -> None:
+    if connection.dialect.name == "postgresql":
+        for table in tables:
+            connection.execute(text(f"ALTER TABLE {table.name} ENABLE TRIGGER USER"))
+    else:
+        create_search_index(SQLModel.metadata, connection)
+        create_stats_triggers(SQLModel.metadata, connection)
+        create_change_triggers(SQLModel.metadata, connection)
+    rebuild_search_index(connection)
+    rebuild_stats(connection)
+
+
+def _reset_sequences(connection: Connection, tables: Sequence[Table]) -> None:
+    """Move PostgreSQL's primary key sequences past the explicitly inserted ids, so later inserts do not collide."""
+    if connection.dialect.name != "postgresql":
+        return
+    for table in tables:
+        primary_key = table.primary_key.columns[0].name
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', '{primary_key}'), "
+            f"coalesce(max({primary_key}), 1), max({primary_key}) IS NOT NULL) FROM {table.name}"
+        ))
+
+
+def seed_database(
+    engine: Engine,
+    plan: SeedPlan,
+    *,
+    seed: int = 0,
+    chunk_size: int = 50000,
+    drop_indexes: bool = False,
+) -> Dict[str, int]:
+    """Replace the database contents with a generated inventory.
+
+    The same `plan` and `seed` always produce the same rows, whatever the chunk size.
+    Values are generated a column at a time per chunk and written with one core executemany INSERT per
+    table and chunk, each chunk in its own transaction. Primary keys are assigned
+    here, so every foreign key points at an existing row: users belong to a
+    department, and a workstation belongs to a user and that user's department.
+
+    Row-level triggers (search index, statistics, change log) are suspended while
+    loading; the search index and statistics are rebuilt once at the end and the
+    change log starts empty. With `drop_indexes`, secondary indexes are dropped
+    too and recreated after the load, which is faster for large loads. Both are
+    restored even when loading fails, leaving a partial inventory to seed again.
+    """
+    # One random stream per generated column, so the data does not depend on the chunk size
+    streams: Dict[str, random.Random] = {}
+
+    def rng(column: str) -> random.Random:
+        if column not in streams:
+            streams[column] = random.Random(f"{seed}:{column}")
+        return streams[column]
+
+    tables = [Department.__table__, WorkstationType.__table__, User.__table__, Workstation.__table__]
+    indexes = _secondary_indexes(tables) if drop_indexes else []
+    started = time.perf_counter()
+
+    SQLModel.metadata.drop_all(bind=engine)
+    SQLModel.metadata.create_all(bind=engine)
+    try:
+        with engine.begin() as connection:
+            _disable_triggers(connection, tables)
+            for index in indexes:
+                index.drop(connection)
+            _insert(connection, Department.__table__, {
+                "department_id": range(1, plan.departments + 1),
+                "name": [f"department{i}" for i in range(1, plan.departments + 1)],
+                "version": 1,
+                "updated_at": SEED_TIMESTAMP,
+            })
+            _insert(connection, WorkstationType.__table__, {
+                "workstation_type_id": range(1, plan.workstation_types + 1),
+                "workstation_type": [f"Type{i}" for i in range(1, plan.workstation_types + 1)],
+            })
+
+        department_weights = _zipf_cum_weights(plan.departments, 0.8)
+        type_weights = _zipf_cum_weights(plan.workstation_types, 1.0)
+        department_ids = range(1, plan.departments + 1)
+        # Needed again for the workstations, which follow their user's department
+        user_departments: List[int] = [0]
+        for ids in _chunks(plan.users, chunk_size):
+            departments = rng("users.department_id").choices(department_ids, cum_weights=department_weights, k=len(ids))
+            user_departments += departments
+            arrivals = rng("users.date_of_arrival").choices(range(3650), k=len(ids))
+            with engine.begin() as connection:
+                _insert(connection, User.__table__, {
+                    "user_id": ids,
+                    "userDN": [f"user{i:07d}" for i in ids],
+                    "name": [f"User {i}" for i in ids],
+                    "department_id": departments,
+                    "status": rng("users.status").choices((0, 1, 2), weights=(1, 18, 1), k=len(ids)),
+                    "office_location": [f"Building {b}" for b in rng("users.office_location").choices(_BUILDINGS, k=len(ids))],
+                    "date_of_arrival": [str(_FIRST_ARRIVAL + timedelta(days=d)) for d in arrivals],
+                    "version": 1,
+                    "updated_at": SEED_TIMESTAMP,
+                })
+
+        for ids in _chunks(plan.workstations, chunk_size):
+            users = rng("workstations.user_id").choices(range(1, plan.users + 1), k=len(ids))
+            video_ram = rng("workstations.video_ram_gb").choices(_VIDEO_RAM_GB, k=len(ids))
+            arrivals = rng("workstations.date_of_arrival").choices(range(3650), k=len(ids))
+            with engine.begin() as connection:
+                _insert(connection, Workstation.__table__, {
+                    "workstation_id": ids,
+                    "hostname": [f"ws{i:08d}" for i in ids],
+                    "type_id": rng("workstations.type_id").choices(range(1, plan.workstation_types + 1), cum_weights=type_weights, k=len(ids)),
+                    "user_id": users,
+                    "department_id": [user_departments[u] for u in users],
+                    "video_ram_gb": video_ram,
+                    "system_ram_gb": rng("workstations.system_ram_gb").choices(_SYSTEM_RAM_GB, k=len(ids)),
+                    "total_storage_tb": rng("workstations.total_storage_tb").choices(_STORAGE_TB, k=len(ids)),
+                    "hardware_description": [f"Workstation model {i % 13} with {v} GB GPU" for i, v in zip(ids, video_ram)],
+                    "date_of_arrival": [str(_FIRST_ARRIVAL + timedelta(days=d)) for d in arrivals],
+                    "version": 1,
+                    "updated_at": SEED_TIMESTAMP,
+                })
+    except Exception:
+        log.error("Seeding failed; the database holds a partial inventory, seed it again")
+        raise
+    finally:
+        with engine.begin() as connection:
+            for index in indexes:
+                index.create(connection, checkfirst=True)
+            _enable_triggers(connection, tables)
+            _reset_sequences(connection, tables)
+    counts = plan.counts()
+    log.info("Seeded {} in {:.1f}s", counts, time.perf_counter() - started)
+    return counts
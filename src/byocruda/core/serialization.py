@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Sequence, Type, TypeVar
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row, Select
+from sqlmodel import SQLModel
+
+from byocruda.core.export import select_public_columns
+
+ResponseT = TypeVar("ResponseT", bound=Response)
+
+try:
+    import orjson
+except ImportError:  # optional, see the "fast" extra
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Encode to compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_isoformat).encode()
+
+
+def _isoformat(value: Any) -> str:
+    # Dates and datetimes as ISO 8601 strings, as orjson and pydantic write them
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with `dumps` instead of the standard library encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def select_fast_columns(model: Type[SQLModel], public_model: Type[SQLModel], fields: Sequence[str] = ()) -> Select:
+    """Select the public columns (or only `fields`) plus the version columns the conditional GET validators need."""
+    table = model.__table__
+    return select_public_columns(model, public_model, fields).add_columns(table.c.version, table.c.updated_at)
+
+
+def fast_rows_response(
+    rows: Sequence[Row], public_model: Type[SQLModel], response: Response, fields: Sequence[str] = ()
+) -> FastJSONResponse:
+    """Encode plain rows straight to JSON, bypassing response_model validation.
+
+    Only the `public_model` fields (or the requested `fields`) are written, so the
+    body is the same as the regular path produces; headers already set on
+    `response` are carried over.
+    """
+    return with_headers_of(response, FastJSONResponse(row_dicts(rows, public_model, fields)))
+
+
+def row_dicts(rows: Sequence[Row], public_model: Type[SQLModel], fields: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """The `public_model` fields (or only `fields`) of plain rows, ready for `dumps`."""
+    fields = fields or list(public_model.model_fields)
+    return [_row_dict(row, fields) for row in rows]
+
+
+def fast_row_response(row: Row, fields: Sequence[str], response: Response) -> FastJSONResponse:
+    """`fast_rows_response` for a single row, e.g. a detail view."""
+    return with_headers_of(response, FastJSONResponse(_row_dict(row, fields)))
+
+
+def with_headers_of(response: Response, target: ResponseT) -> ResponseT:
+    """Add every header set on `response` to `target`, keeping repeated ones such as Set-Cookie."""
+    target.raw_headers.extend(response.raw_headers)
+    return target
+
+
+def _row_dict(row: Row, fields: Iterable[str]) -> Dict[str, Any]:
+    mapping = row._mapping
+    return {name: mapping[name] for name in fields}
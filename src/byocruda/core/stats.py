@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Connection, event, func, select, text
+from sqlmodel import SQLModel
+
+from byocruda.core.logging import log
+from byocruda.models.models import (
+    Department,
+    DepartmentStats,
+    UserStatusStats,
+    WorkstationType,
+    WorkstationTypeStats,
+)
+
+
+@dataclass
+class Summary:
+    """One summary table row keyed by an expression over a source row.
+
+    Expressions use "{row}" for the source row: NEW/OLD in triggers, the table in rebuilds.
+    """
+    table: str
+    key: str
+    key_expr: str
+    measures: Dict[str, str]
+
+
+@dataclass
+class StatsSource:
+    table: str
+    # Columns the summaries depend on; updates touching none of them skip the triggers
+    columns: Sequence[str]
+    summaries: List[Summary]
+
+
+STATS_SOURCES: List[StatsSource] = [
+    StatsSource("workstations", ["department_id", "type_id", "video_ram_gb", "system_ram_gb", "total_storage_tb"], [
+        Summary("stats_departments", "department_id", "{row}.department_id", {
+            "workstations": "1",
+            "video_ram_gb": "coalesce({row}.video_ram_gb, 0)",
+            "system_ram_gb": "coalesce({row}.system_ram_gb, 0)",
+            "total_storage_tb": "coalesce({row}.total_storage_tb, 0)",
+        }),
+        Summary("stats_workstation_types", "type_id", "{row}.type_id", {"workstations": "1"}),
+    ]),
+    StatsSource("users", ["department_id", "status"], [
+        Summary("stats_departments", "department_id", "{row}.department_id", {"users": "1"}),
+        Summary("stats_user_status", "status", "coalesce({row}.status, -1)", {"users": "1"}),
+    ]),
+]
+
+# Summary rows removed together with the row they describe: owner table -> (owner key, summary table, summary key)
+STATS_OWNERS = {
+    "departments": ("department_id", "stats_departments", "department_id"),
+    "workstation_types": ("workstation_type_id", "stats_workstation_types", "type_id"),
+}
+
+SUMMARY_TABLES = ["stats_departments", "stats_workstation_types", "stats_user_status"]
+DEPARTMENT_MEASURES = ["workstations", "users", "video_ram_gb", "system_ram_gb", "total_storage_tb"]
+
+
+def _upsert(summary: Summary, values: str) -> str:
+    columns = ", ".join([summary.key, *summary.measures])
+    updates = ", ".join(f"{m} = {summary.table}.{m} + excluded.{m}" for m in summary.measures)
+    return f"INSERT INTO {summary.table} ({columns}) {values} ON CONFLICT ({summary.key}) DO UPDATE SET {updates}"
+
+
+def _delta(summary: Summary, row: str, sign: int) -> str:
+    """Add (sign=1) or subtract (sign=-1) one source row's contribution to its summary row."""
+    expressions = [summary.key_expr.format(row=row)]
+    for expression in summary.measures.values():
+        expression = expression.format(row=row)
+        expressions.append(expression if sign > 0 else f"-({expression})")
+    return _upsert(summary, f"VALUES ({', '.join(expressions)})") + ";"
+
+
+def _sqlite_triggers(source: StatsSource) -> List[str]:
+    added = " ".join(_delta(summary, "new", 1) for summary in source.summaries)
+    removed = " ".join(_delta(summary, "old", -1) for summary in source.summaries)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_stats_insert AFTER INSERT ON {source.table} BEGIN {added} END",
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_stats_update AFTER UPDATE OF {', '.join(source.columns)} "
+        f"ON {source.table} BEGIN {removed} {added} END",
+        f"CREATE TRIGGER IF NOT EXISTS {source.table}_stats_delete AFTER DELETE ON {source.table} BEGIN {removed} END",
+    ]
+
+
+def _postgresql_triggers(source: StatsSource) -> List[str]:
+    added = " ".join(_delta(summary, "NEW", 1) for summary in source.summaries)
+    removed = " ".join(_delta(summary, "OLD", -1) for summary in source.summaries)
+    return [
+        f"CREATE OR REPLACE FUNCTION {source.table}_stats() RETURNS trigger AS $$ BEGIN "
+        f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {removed} END IF; "
+        f"IF TG_OP IN ('INSERT', 'UPDATE') THEN {added} END IF; "
+        f"RETURN NULL; END $$ LANGUAGE plpgsql",
+        f"CREATE OR REPLACE TRIGGER {source.table}_stats AFTER INSERT OR UPDATE OF {', '.join(source.columns)} OR DELETE "
+        f"ON {source.table} FOR EACH ROW EXECUTE FUNCTION {source.table}_stats()",
+    ]
+
+
+def _owner_triggers(dialect: str) -> List[str]:
+    statements = []
+    for owner, (key_column, table, key) in STATS_OWNERS.items():
+        if dialect == "sqlite":
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {owner}_stats_delete AFTER DELETE ON {owner} "
+                f"BEGIN DELETE FROM {table} WHERE {key} = old.{key_column}; END"
+            )
+        else:
+            statements += [
+                f"CREATE OR REPLACE FUNCTION {owner}_stats() RETURNS trigger AS $$ BEGIN "
+                f"DELETE FROM {table} WHERE {key} = OLD.{key_column}; RETURN NULL; END $$ LANGUAGE plpgsql",
+                f"CREATE OR REPLACE TRIGGER {owner}_stats AFTER DELETE ON {owner} FOR EACH ROW EXECUTE FUNCTION {owner}_stats()",
+            ]
+    return statements
+
+
+def rebuild_stats(connection: Connection) -> None:
+    """Recompute every summary table from scratch with GROUP BY over the source tables."""
+    for table in SUMMARY_TABLES:
+        connection.execute(text(f"DELETE FROM {table}"))
+    for source in STATS_SOURCES:
+        for summary in source.summaries:
+            key = summary.key_expr.format(row=source.table)
+            measures = ", ".join(f"sum({m.format(row=source.table)})" for m in summary.measures.values())
+            # "WHERE true" keeps SQLite from reading ON CONFLICT as a join constraint
+            connection.execute(text(_upsert(
+                summary, f"SELECT {key}, {measures} FROM {source.table} WHERE true GROUP BY {key}"
+            )))
+
+
+def stats_trigger_statements(dialect: str) -> List[str]:
+    """DDL of the triggers maintaining the summary tables; none on unsupported dialects."""
+    if dialect not in ("sqlite", "postgresql"):
+        return []
+    statements = []
+    for source in STATS_SOURCES:
+        statements += _sqlite_triggers(source) if dialect == "sqlite" else _postgresql_triggers(source)
+    return statements + _owner_triggers(dialect)
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_stats_triggers(target, connection: Connection, **kw) -> None:
+    """Install the triggers maintaining the summary tables; newly created tables are filled first."""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        log.warning(f"Inventory statistics are not maintained on {dialect}")
+        return
+    created = kw.get("tables") or []
+    if any(table.name in SUMMARY_TABLES for table in created):
+        rebuild_stats(connection)
+    for statement in stats_trigger_statements(dialect):
+        connection.execute(text(statement))
+
+
+async def get_stats(session) -> Dict[str, Any]:
+    """Read the summary tables, naming departments and types; zero rows are left out of users by status."""
+    departments = (await session.exec(
+        select(
+            Department.department_id, Department.name,
+            *(func.coalesce(getattr(DepartmentStats, m), 0).label(m) for m in DEPARTMENT_MEASURES)
+        )
+        .outerjoin(DepartmentStats, DepartmentStats.department_id == Department.department_id)
+        .order_by(Department.department_id)
+    )).all()
+    types = (await session.exec(
+        select(
+            WorkstationType.workstation_type_id.label("type_id"), WorkstationType.workstation_type,
+            func.coalesce(WorkstationTypeStats.workstations, 0).label("workstations"),
+        )
+        .outerjoin(WorkstationTypeStats, WorkstationTypeStats.type_id == WorkstationType.workstation_type_id)
+        .order_by(WorkstationType.workstation_type_id)
+    )).all()
+    statuses = (await session.exec(
+        select(UserStatusStats.status, UserStatusStats.users).where(UserStatusStats.users != 0).order_by(UserStatusStats.status)
+    )).all()
+
+    departments = [dict(row._mapping) for row in departments]
+    for row in departments:
+        # Float sums drift slightly when maintained incrementally
+        row["total_storage_tb"] = round(row["total_storage_tb"], 6)
+    totals = {m: sum(row[m] for row in departments) for m in DEPARTMENT_MEASURES}
+    totals["total_storage_tb"] = round(totals["total_storage_tb"], 6)
+    return {
+        "totals": totals,
+        "departments": departments,
+        "workstation_types": [dict(row._mapping) for row in types],
+        "users_by_status": [{"status": None if row.status == -1 else row.status, "users": row.users} for row in statuses],
+    }
@@ -1,23 +1,28 @@
-from random import choice
-
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import Dict, Any
-# from sqlalchemy.orm import Session
-from sqlmodel import Session, delete, select
 
 from byocruda.core.config import settings
-from byocruda.core.logging import log
-from byocruda.core.database import init_db, get_db_session, cleanup_db
+from byocruda.core.logging import LogContextMiddleware, log
+from byocruda.core.cache import reference_cache
+from byocruda.core.database import change_feed, init_db, cleanup_db, cleanup_async_db, pool_statuses
+from byocruda.core import metrics
+from byocruda.core.queries import QueryStatsMiddleware
 
 # from byocruda.models.departments import Department, DepartmentBase, DepartmentCreate, DepartmentPublic
 
 from byocruda.api.v1.endpoints.endpoints import (
     users_router, 
     departments_router,
-    workstations_router
+    workstations_router,
+    imports_router,
+    search_router,
+    stats_router,
+    changes_router,
+    other_assets_router
 )
 
 @asynccontextmanager
@@ -34,9 +39,8 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize database
         init_db()
-        if settings.api.debug:
-            app_debug()
         log.info("Database initialized successfully")
+        change_feed.start(timedelta(days=settings.changes.retention_days))
         yield
         
     except Exception as e:
@@ -46,9 +50,13 @@ async def lifespan(app: FastAPI):
         # Cleanup operations
         log.info("Shutting down API...")
         try:
+            await change_feed.stop()
+            await cleanup_async_db()
             cleanup_db()
         except Exception as e:
             log.error(f"Error during shutdown: {str(e)}")
+        # Let the background sinks write out what is still queued
+        await log.complete()
 
 def create_application() -> FastAPI:
     """
@@ -73,11 +81,17 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(LogContextMiddleware)
+    if settings.database.instrumentation.enabled:
+        app.add_middleware(QueryStatsMiddleware)
+    # Added last so it is the outermost middleware and times the whole request
+    if settings.metrics.enabled:
+        app.add_middleware(metrics.MetricsMiddleware, metrics=metrics.request_metrics)
 
     # Add exception handlers
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
-        log.error(f"HTTP error occurred: {exc.status_code} - {exc.detail}")
+        log.error("HTTP error occurred: {} - {}", exc.status_code, exc.detail)
         return JSONResponse(
             status_code=exc.status_code,
             content={
@@ -90,7 +104,7 @@ def create_application() -> FastAPI:
 
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
-        log.exception(f"Unexpected error occurred: {str(exc)}")
+        log.exception("Unexpected error occurred: {}", exc)
         return JSONResponse(
             status_code=500,
             content={
@@ -117,16 +131,30 @@ def create_application() -> FastAPI:
     # Health check endpoint
     @app.get("/health", response_model=Dict[str, Any])
     async def health_check():
-        """Health check endpoint for monitoring."""
+        """Health check endpoint for monitoring; answers 503 when the database pools are saturated."""
         log.debug("Health check performed")
-        return {
-            "status": "healthy",
+        readiness = metrics.readiness(pool_statuses(), settings.metrics.readiness_max_saturation)
+        content = {
+            "status": "healthy" if readiness["ready"] else "saturated",
             "version": settings.api.version,
             "api": {
                 "name": settings.api.project_name,
                 "debug": settings.api.debug
-            }
+            },
+            "cache": reference_cache.stats(),
+            "readiness": readiness
         }
+        if not readiness["ready"]:
+            return JSONResponse(status_code=503, content=content)
+        return content
+
+    if settings.metrics.enabled:
+        @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+        async def metrics_endpoint():
+            """Request and connection pool metrics in the Prometheus text format."""
+            return PlainTextResponse(
+                metrics.render(metrics.request_metrics, pool_statuses()), media_type=metrics.CONTENT_TYPE
+            )
     app.include_router(
         departments_router,
         prefix="/api/v1/departments"
@@ -139,53 +167,31 @@ def create_application() -> FastAPI:
         workstations_router,
         prefix="/api/v1/workstations"
     )
+    app.include_router(
+        imports_router,
+        prefix="/api/v1/imports"
+    )
+    app.include_router(
+        search_router,
+        prefix="/api/v1/search"
+    )
+    app.include_router(
+        stats_router,
+        prefix="/api/v1/stats"
+    )
+    app.include_router(
+        changes_router,
+        prefix="/api/v1/changes"
+    )
+    app.include_router(
+        other_assets_router,
+        prefix="/api/v1/assets"
+    )
     return app
 
 # Create the application instance
 app = create_application()
 
-if settings.api.debug:
-    from .models.models import *
-    def app_debug():
-        session: Session = next(get_db_session())
-        for table in [Workstation, WorkstationType, User, Department]:
-            statement=delete(table)
-            session.exec(statement)
-    
-        workstation_types_range = range(1,5)
-        department_range = range(1,4)
-        user_range = range(1,31)
-        workstation_range = range(1,60)
-    
-        for workstation_type_id in workstation_types_range:
-                # session: Session = next(get_db_session())
-                session.add(WorkstationType(workstation_type=f"Type{workstation_type_id}"))
-                # session.commit()
-                # session.close()
-        for department_index in department_range:
-            # session: Session = next(get_db_session())
-            session.add(Department(name=f"department{department_index}"))
-            # session.commit()
-            # session.close()
-        for user_index in user_range:
-            department_id=choice(department_range)
-            # session: Session = next(get_db_session())
-            session.add(User(userDN=f"user{user_index}_department{department_id}", name=f"user{user_index}_{department_id}",department_id=department_id))
-            # session.commit()
-            # session.close()
-        for workstation_id in workstation_range:
-            department_id=choice(department_range)
-            user_id=choice(user_range)
-            type_id=choice(workstation_types_range)
-            # session: Session = next(get_db_session())
-            session.add(Workstation(hostname=f"Workstation_{workstation_id}", type_id=type_id, user_id=user_id, department_id=department_id))
-        session.commit()
-        session.close()
-    
-        
-        
-    
-
 if __name__ == "__main__":
     import uvicorn
     log.info(f"Starting server on {settings.api.host}:{settings.api.port}")
@@ -0,0 +1,6 @@
+from byocruda.core.assets import compile_assets
+from byocruda.core.config import settings
+
+# Models of the asset types defined in [assets.types], generated once per configuration
+# and cached on disk (see core/assets.py); imported after the built-in models they may reference
+ASSETS = compile_assets(settings.assets)
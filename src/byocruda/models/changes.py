@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, func
+from sqlmodel import Field, SQLModel
+
+# Change log written by database triggers (see core/changes.py); never written by the API
+
+class ChangeBase(SQLModel):
+    __tablename__ = 'changes'
+    # Never reused, so a subscriber's last seen seq stays a valid resume point after pruning
+    __table_args__ = {"sqlite_autoincrement": True}
+    table_name: str
+    row_id: int
+    # insert | update | delete
+    operation: str
+    changed_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True))
+
+class Change(ChangeBase, table=True):
+    seq: int | None = Field(default=None, sa_column=Column(Integer, primary_key=True, autoincrement=True))
+
+class ChangePublic(ChangeBase):
+    seq: int
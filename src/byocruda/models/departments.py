@@ -4,6 +4,7 @@ from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime, timezone
 from sqlalchemy import UniqueConstraint
 
+from byocruda.models.versioning import Versioned
 from byocruda.models.users import UserBase, User, UserPublic
 from byocruda.models.workstations import WorkstationBase, Workstation, WorkstationPublic
 
@@ -11,7 +12,7 @@ class DepartmentBase(SQLModel):
     __tablename__ = 'departments'
     name: str = Field(unique=True, index=True)
 
-class Department(DepartmentBase, table=True):
+class Department(DepartmentBase, Versioned, table=True):
     department_id: int | None = Field(primary_key=True, default=None)
     users: List['User'] = Relationship(back_populates='department', passive_deletes="all")
     workstations: List['Workstation'] = Relationship(back_populates='department', passive_deletes="all")
@@ -0,0 +1,40 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel
+from datetime import datetime, timezone
+
+class ImportJobBase(SQLModel):
+    __tablename__ = 'import_jobs'
+    resource: str
+    format: str
+    source: Optional[str] = None
+    upsert: bool = False
+    status: str = Field(default="pending", index=True)
+    bytes_total: int = 0
+    bytes_processed: int = 0
+    processed_rows: int = 0
+    imported_rows: int = 0
+    failed_rows: int = 0
+    error: Optional[str] = None
+    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+class ImportJob(ImportJobBase, table=True):
+    import_job_id: int | None = Field(primary_key=True, default=None)
+
+class ImportJobPublic(ImportJobBase):
+    import_job_id: int
+
+
+class ImportJobErrorBase(SQLModel):
+    __tablename__ = 'import_job_errors'
+    import_job_id: int = Field(foreign_key='import_jobs.import_job_id', ondelete='CASCADE', index=True)
+    row_number: int
+    error: str
+    record: Optional[str] = None
+
+class ImportJobError(ImportJobErrorBase, table=True):
+    import_job_error_id: int | None = Field(primary_key=True, default=None)
+
+class ImportJobErrorPublic(ImportJobErrorBase):
+    import_job_error_id: int
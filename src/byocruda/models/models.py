@@ -7,6 +7,10 @@ from sqlalchemy import UniqueConstraint
 from byocruda.models.users import *
 from byocruda.models.departments import *
 from byocruda.models.workstations import *
+from byocruda.models.imports import *
+from byocruda.models.stats import *
+from byocruda.models.changes import *
+from byocruda.models.assets import ASSETS
 
 class DepartmentPublicWithUsers(DepartmentPublic):
     users: List["UserPublic"] | None = []
@@ -19,4 +23,17 @@ class UserPublicWithEverything(UserPublicWithDepartment):
 
 class WorkstationPublicWithUserAndDepartment(WorkstationPublic):
     user: Optional["UserPublic"] | None = None
-    department: Optional["DepartmentPublic"] | None = None
\ No newline at end of file
+    department: Optional["DepartmentPublic"] | None = None
+
+class WorkstationPublicExpanded(WorkstationPublic):
+    user: Optional["UserPublic"] | None = None
+    department: Optional["DepartmentPublic"] | None = None
+    workstation_type: Optional["WorkstationTypePublic"] | None = None
+
+class UserPublicExpanded(UserPublic):
+    department: Optional["DepartmentPublic"] | None = None
+    workstations: List["WorkstationPublic"] | None = None
+
+class DepartmentPublicExpanded(DepartmentPublic):
+    users: List["UserPublic"] | None = None
+    workstations: List["WorkstationPublic"] | None = None
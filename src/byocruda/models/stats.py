@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy import text
+from sqlmodel import Field, SQLModel
+
+# Summary tables maintained by database triggers (see core/stats.py); never written by the API
+
+class DepartmentStatsBase(SQLModel):
+    __tablename__ = 'stats_departments'
+    workstations: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    users: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    video_ram_gb: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    system_ram_gb: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    total_storage_tb: float = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+
+class DepartmentStats(DepartmentStatsBase, table=True):
+    department_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+
+class DepartmentStatsPublic(DepartmentStatsBase):
+    department_id: int
+    name: Optional[str] = None
+
+
+class WorkstationTypeStatsBase(SQLModel):
+    __tablename__ = 'stats_workstation_types'
+    workstations: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+
+class WorkstationTypeStats(WorkstationTypeStatsBase, table=True):
+    type_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+
+class WorkstationTypeStatsPublic(WorkstationTypeStatsBase):
+    type_id: int
+    workstation_type: Optional[str] = None
+
+
+class UserStatusStatsBase(SQLModel):
+    __tablename__ = 'stats_user_status'
+    users: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+
+class UserStatusStats(UserStatusStatsBase, table=True):
+    # Users without a status are counted under -1
+    status: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+
+class UserStatusStatsPublic(UserStatusStatsBase):
+    status: Optional[int]
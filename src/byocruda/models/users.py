@@ -6,6 +6,7 @@ from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime, timezone
 from sqlalchemy import UniqueConstraint
 
+from byocruda.models.versioning import Versioned
 from byocruda.models.workstations import *
 
 class UserBase(SQLModel):
@@ -15,7 +16,7 @@ class UserBase(SQLModel):
     __tablename__ = 'users'
     userDN: str = Field(unique=True, index=True, schema_extra={'examples': ['a123z']})
     name: str = Field(nullable=False, index=True)
-    department_id: int = Field(foreign_key='departments.department_id', ondelete='RESTRICT')
+    department_id: int = Field(foreign_key='departments.department_id', ondelete='RESTRICT', index=True)
     notes: Optional[str] = Field(default=None)
     status: Optional[int] = Field(default=1)
     office_location: Optional[str] = Field(default=None)
@@ -23,7 +24,7 @@ class UserBase(SQLModel):
     date_of_leave: Optional[str] = Field(default=None)
     # picture: Optional[bytes] = Field(default=None, sa_column=Column('picture', LargeBinary))
 
-class User(UserBase, table=True):
+class User(UserBase, Versioned, table=True):
     user_id: int | None = Field(primary_key=True, default= None)
     department: Optional['Department'] = Relationship(back_populates='users')
     workstations: List['Workstation'] = Relationship(back_populates='user', passive_deletes="all")
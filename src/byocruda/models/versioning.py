@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+from sqlalchemy import literal_column, text
+from sqlmodel import Field, SQLModel
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+class Versioned(SQLModel):
+    """Row version and modification time, bumped by every UPDATE (ORM or core) and used for ETags.
+
+    Mixed into table models only, so neither field is accepted from or returned to clients.
+    """
+    version: int = Field(default=1, sa_column_kwargs={"server_default": text("1"), "onupdate": literal_column("version") + 1})
+    updated_at: datetime = Field(default_factory=utc_now, sa_column_kwargs={"onupdate": utc_now})
@@ -4,7 +4,9 @@ from pydantic import StringConstraints, field_validator
 from sqlalchemy import CheckConstraint, Column, ForeignKey, Integer, LargeBinary, Text, text
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime, timezone
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
+
+from byocruda.models.versioning import Versioned
 
 class WorkstationTypeBase(SQLModel):
     __tablename__ = 'workstation_types'
@@ -36,7 +38,16 @@ class WorkstationBase(SQLModel):
     notes: str | None = None
 
     
-class Workstation(WorkstationBase, table=True):
+class Workstation(WorkstationBase, Versioned, table=True):
+    # Composite indexes for the common list filters: equality on department/type
+    # first, then the range-filtered or sorted hardware column
+    __table_args__ = (
+        Index("ix_workstations_department_type_video_ram", "department_id", "type_id", "video_ram_gb"),
+        Index("ix_workstations_department_type_system_ram", "department_id", "type_id", "system_ram_gb"),
+        Index("ix_workstations_type_video_ram", "type_id", "video_ram_gb"),
+        Index("ix_workstations_system_ram_gb", "system_ram_gb"),
+        Index("ix_workstations_total_storage_tb", "total_storage_tb"),
+    )
     workstation_id: int | None = Field(primary_key=True, default= None)
     workstation_type: Optional['WorkstationType'] = Relationship(back_populates="workstations")
     user: Optional['User'] = Relationship(back_populates="workstations")
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List
+
+from sqlmodel import SQLModel
+
+from byocruda.models.stats import DepartmentStatsPublic, UserStatusStatsPublic, WorkstationTypeStatsPublic
+
+
+class BulkRowResult(SQLModel):
+    index: int
+    # created | updated | error | rolled_back
+    status: str
+    id: int | None = None
+    key: str | None = None
+    error: str | None = None
+
+class BulkResult(SQLModel):
+    atomic: bool
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: List[BulkRowResult] = []
+
+class BulkUpdateResult(SQLModel):
+    updated: int
+    # Primary keys of the updated rows, when requested with return_ids=true
+    ids: List[int] | None = None
+
+class SearchResult(SQLModel):
+    # users | workstations
+    kind: str
+    id: int
+    title: str
+    # Matching excerpt with the hits wrapped in [brackets]
+    snippet: str | None = None
+    # Higher is a better match; only comparable within one response
+    score: float
+
+class InventoryTotals(SQLModel):
+    workstations: int
+    users: int
+    video_ram_gb: int
+    system_ram_gb: int
+    total_storage_tb: float
+
+class InventoryStats(SQLModel):
+    totals: InventoryTotals
+    departments: List[DepartmentStatsPublic]
+    workstation_types: List[WorkstationTypeStatsPublic]
+    users_by_status: List[UserStatusStatsPublic]
+
+class LookupResult(SQLModel):
+    # Public fields (or the requested fields) of the rows found, in the order of the keys
+    found: List[Dict[str, Any]]
+    # Keys no row matched
+    missing: List[int | str]
+
+class WorkstationLookup(SQLModel):
+    hostname: List[str]
+
+class UserLookup(SQLModel):
+    userDN: List[str]
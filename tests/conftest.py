@@ -0,0 +1,80 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Point the application at a throwaway database before byocruda.core.config is imported
+_tmp_dir = Path(tempfile.mkdtemp(prefix="byocruda-tests-"))
+_config = Path("config/config.toml").read_text()
+_config = _config.replace('url = "sqlite:///./byocruda.db"', f'url = "sqlite:///{_tmp_dir / "test.db"}"')
+_config = _config.replace('debug = true', 'debug = false')
+_config = _config.replace('file_path = "logs/byocruda.log"', f'file_path = "{_tmp_dir / "byocruda.log"}"')
+_config = _config.replace('slow_query_file_path = "logs/slow_queries.log"', f'slow_query_file_path = "{_tmp_dir / "slow_queries.log"}"')
+_config = _config.replace('upload_dir = "data/imports"', f'upload_dir = "{_tmp_dir / "imports"}"')
+# A read-only pool on the same WAL file stands in for a read replica
+_config = _config.replace('urls = []', f'urls = ["sqlite:///file:{_tmp_dir / "test.db"}?mode=ro&uri=true"]')
+_config = _config.replace('cache_dir = "data/assets"', f'cache_dir = "{_tmp_dir / "assets"}"')
+# A configured asset type, compiled into models and routers like any deployment's
+_config += """
+[assets.types.monitors]
+sort = ["serial_number"]
+filters = ["size_inches", "workstation_id"]
+[assets.types.monitors.fields]
+serial_number = { type = "str", unique = true, index = true, max_length = 64 }
+manufacturer = { type = "str", optional = true }
+size_inches = { type = "float", optional = true }
+workstation_id = { type = "int", optional = true, foreign_key = "workstations.workstation_id" }
+"""
+(_tmp_dir / "config.toml").write_text(_config)
+os.environ["BYOCRUDA_CONFIG"] = str(_tmp_dir / "config.toml")
+
+
+@pytest.fixture
+def session():
+    """A session on a freshly created schema."""
+    from sqlmodel import SQLModel
+    from byocruda.core.cache import reference_cache
+    from byocruda.core.database import SessionLocal, engine
+
+    reference_cache.clear()
+    SQLModel.metadata.drop_all(bind=engine)
+    SQLModel.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(session):
+    from fastapi.testclient import TestClient
+    from byocruda.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def inventory(session):
+    """A small inventory: 3 departments, 2 workstation types, 6 users and 25 workstations."""
+    from byocruda.models.models import Department, User, Workstation, WorkstationType
+
+    session.add_all([Department(name=f"department{i}") for i in range(1, 4)])
+    session.add_all([WorkstationType(workstation_type=f"Type{i}") for i in range(1, 3)])
+    session.commit()
+    session.add_all([
+        User(userDN=f"user{i}", name=f"User {i}", department_id=i % 3 + 1)
+        for i in range(1, 7)
+    ])
+    session.commit()
+    session.add_all([
+        Workstation(
+            hostname=f"ws{i:03d}",
+            type_id=i % 2 + 1,
+            user_id=i % 6 + 1,
+            department_id=i % 3 + 1,
+            video_ram_gb=None if i % 5 == 0 else 8 * (i % 4),
+            system_ram_gb=16 * (i % 3 + 1),
+        )
+        for i in range(1, 26)
+    ])
+    session.commit()
+    return session
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from byocruda.core.assets import definitions_hash, load_module, render_module
+from byocruda.core.config import AssetsSettings, settings
+
+
+def test_asset_crud(client, inventory):
+    created = client.post("/api/v1/assets/monitors/", json={
+        "serial_number": "MON-1", "size_inches": 27.0, "workstation_id": 1,
+    })
+    assert created.status_code == 200
+    monitor = created.json()
+    assert monitor == {
+        "monitor_id": 1, "serial_number": "MON-1", "manufacturer": None, "size_inches": 27.0, "workstation_id": 1,
+    }
+    client.post("/api/v1/assets/monitors/", json={"serial_number": "MON-2", "size_inches": 24.0})
+    assert client.post("/api/v1/assets/monitors/", json={"size_inches": 24.0}).status_code == 422
+
+    listed = client.get("/api/v1/assets/monitors/", params={"sort": "-serial_number", "size_inches__gte": 20})
+    assert [m["serial_number"] for m in listed.json()] == ["MON-2", "MON-1"]
+    assert [m["serial_number"] for m in client.get("/api/v1/assets/monitors/", params={"workstation_id": 1}).json()] == ["MON-1"]
+
+    detail = client.get("/api/v1/assets/monitors/1")
+    assert client.get("/api/v1/assets/monitors/1", headers={"If-None-Match": detail.headers["etag"]}).status_code == 304
+
+    patched = client.patch("/api/v1/assets/monitors/1", json={"manufacturer": "Acme"})
+    assert patched.json()["manufacturer"] == "Acme"
+    assert patched.json()["size_inches"] == 27.0
+    assert client.get("/api/v1/assets/monitors/1").headers["etag"] != detail.headers["etag"]
+
+    exported = client.get("/api/v1/assets/monitors/export").text.splitlines()
+    assert len(exported) == 2
+
+    assert client.delete("/api/v1/assets/monitors/1").json() == {"deleted": True}
+    assert client.get("/api/v1/assets/monitors/1").status_code == 404
+
+
+def test_compiled_module_is_cached_by_definitions():
+    assets = settings.assets
+    digest = definitions_hash(assets)
+    path = Path(assets.cache_dir) / f"byocruda_assets_{digest[:16]}.py"
+    assert f"Definitions hash: {digest}" in path.read_text()
+    modified = path.stat().st_mtime_ns
+    # Loading the same definitions again reuses the module and does not regenerate the file
+    assert load_module(assets) is load_module(assets)
+    assert path.stat().st_mtime_ns == modified
+
+    changed = assets.model_copy(deep=True)
+    changed.types["monitors"].fields["size_inches"].optional = False
+    assert definitions_hash(changed) != digest
+    assert "size_inches: float\n" in render_module(changed, definitions_hash(changed))
+
+
+def test_asset_definitions_are_validated():
+    with pytest.raises(ValueError, match="unknown fields"):
+        AssetsSettings.model_validate({"types": {"racks": {"fields": {"name": {"type": "str"}}, "sort": ["height"]}}})
+    with pytest.raises(ValueError, match="Invalid asset table name"):
+        AssetsSettings.model_validate({"types": {"Racks": {"fields": {"name": {"type": "str"}}}}})
+    with pytest.raises(ValueError, match="clash"):
+        load_module(AssetsSettings.model_validate({"types": {"users": {"fields": {"name": {"type": "str"}}}}}))
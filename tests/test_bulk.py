@@ -0,0 +1,120 @@
+import json
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _workstation(hostname, **extra):
+    return {"hostname": hostname, "type_id": 1, "user_id": 1, "department_id": 1, **extra}
+
+
+def test_bulk_create_json_array(client, inventory):
+    response = client.post("/api/v1/workstations/bulk", json=[_workstation(f"bulk{i}") for i in range(10)])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 10 and body["failed"] == 0
+    assert [r["index"] for r in body["results"]] == list(range(10))
+    assert client.get(f"/api/v1/workstations/{body['results'][3]['id']}").json()["hostname"] == "bulk3"
+
+
+def test_bulk_create_ndjson(client, inventory):
+    lines = "\n".join(json.dumps({"userDN": f"bulkuser{i}", "name": f"Bulk {i}", "department_id": 2}) for i in range(5))
+    response = client.post("/api/v1/users/bulk", content=lines, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.json()["created"] == 5
+
+
+def test_bulk_atomic_rolls_back_everything(client, inventory):
+    records = [_workstation("ok1"), _workstation("ok2", department_id=999), _workstation("ws001")]
+    response = client.post("/api/v1/workstations/bulk", json=records)
+    assert response.status_code == 422
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["rolled_back", "error", "error"]
+    hostnames = {w["hostname"] for w in client.get("/api/v1/workstations/", params={"limit": 100}).json()}
+    assert "ok1" not in hostnames
+
+
+def test_bulk_best_effort_keeps_good_rows(client, inventory):
+    records = [_workstation("ok1"), _workstation("ok2", department_id=999), {"hostname": "missing-fields"}, _workstation("ok3")]
+    response = client.post("/api/v1/workstations/bulk", params={"atomic": False}, json=records)
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == ["created", "error", "error", "created"]
+    assert body["created"] == 2 and body["failed"] == 2
+
+
+def test_bulk_upsert_updates_only_sent_fields(client, inventory):
+    before = client.get("/api/v1/users/1").json()
+    records = [
+        {"userDN": "user1", "name": "Renamed", "department_id": before["department_id"]},
+        {"userDN": "brand-new", "name": "New", "department_id": 1},
+    ]
+    response = client.post("/api/v1/users/bulk", params={"upsert": True}, json=records)
+    assert response.status_code == 200
+    assert [(r["status"], r["id"]) for r in response.json()["results"]][0] == ("updated", 1)
+    assert response.json()["results"][1]["status"] == "created"
+    after = client.get("/api/v1/users/1").json()
+    assert after["name"] == "Renamed"
+    assert after["date_of_arrival"] == before["date_of_arrival"]
+
+
+def test_bulk_patch_runs_one_update(client, inventory):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.patch("/api/v1/workstations/", params={"user_id": 2, "return_ids": True}, json={"user_id": 3})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 5, "ids": [1, 7, 13, 19, 25]}
+    assert len([s for s in statements if s.startswith("UPDATE workstations")]) == 1
+    # The foreign key was checked once, not per row
+    assert len([s for s in statements if "FROM users" in s]) == 1
+    moved = client.get("/api/v1/workstations/", params={"user_id": 3, "limit": 100}).json()
+    assert len(moved) == 9
+
+    by_ids = client.patch("/api/v1/users/", params={"ids": "1,2", "department_id": 2}, json={"notes": "moved"})
+    assert by_ids.json() == {"updated": 1, "ids": None}
+    assert client.get("/api/v1/users/1").json()["notes"] == "moved"
+
+
+def test_bulk_patch_rejects_invalid_patches(client, inventory):
+    assert client.patch("/api/v1/workstations/", json={"notes": "everything"}).status_code == 400
+    assert client.patch("/api/v1/workstations/", params={"user_id": 2}, json={}).status_code == 400
+    missing = client.patch("/api/v1/workstations/", params={"user_id": 2}, json={"department_id": 999})
+    assert missing.status_code == 422 and "999" in missing.json()["error"]["message"]
+    assert client.patch("/api/v1/users/", params={"ids": "1"}, json={"department_id": None}).status_code == 422
+    assert client.patch("/api/v1/users/", params={"ids": "1"}, json={"status": 7}).status_code == 422
+    assert client.get("/api/v1/workstations/", params={"department_id": 999}).json() == []
+
+
+def test_bulk_atomic_fails_whole_request_on_transient_chunk_error(client, inventory, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    from byocruda.core import bulk
+    from byocruda.core.config import settings
+
+    write_chunk = bulk._write_chunk
+    calls = []
+
+    def flaky_write_chunk(session, model, chunk, **options):
+        calls.append(len(chunk))
+        # The second chunk fails as a whole, but each of its rows succeeds on the retry
+        if len(calls) == 2:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return write_chunk(session, model, chunk, **options)
+
+    monkeypatch.setattr(settings.bulk, "chunk_size", 2)
+    monkeypatch.setattr(bulk, "_write_chunk", flaky_write_chunk)
+    response = client.post("/api/v1/workstations/bulk", json=[_workstation(f"flaky{i}") for i in range(4)])
+    assert response.status_code == 422
+    body = response.json()
+    assert body["created"] == 0 and body["failed"] == 2
+    assert [r["status"] for r in body["results"]] == ["rolled_back", "rolled_back", "error", "error"]
+    assert "database is locked" in body["results"][2]["error"]
+    hostnames = {w["hostname"] for w in client.get("/api/v1/workstations/", params={"limit": 100}).json()}
+    assert not any(hostname.startswith("flaky") for hostname in hostnames)
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from byocruda.core.cache import Cache, MemoryBackend, reference_cache
+
+
+def test_memory_backend_lru_and_ttl(monkeypatch):
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", 1, ttl=10)
+    backend.set("b", 2, ttl=10)
+    backend.get("a")
+    backend.set("c", 3, ttl=10)
+    with pytest.raises(KeyError):
+        backend.get("b")
+    assert backend.get("a") == 1
+
+    backend.set("d", 4, ttl=-1)
+    with pytest.raises(KeyError):
+        backend.get("d")
+
+
+def test_department_reads_are_cached_and_invalidated(client, inventory):
+    reference_cache.hits = reference_cache.misses = 0
+    assert client.get("/api/v1/departments/1").json()["name"] == "department1"
+    assert client.get("/api/v1/departments/1").json()["name"] == "department1"
+    client.get("/api/v1/departments/")
+    client.get("/api/v1/departments/")
+    assert (reference_cache.hits, reference_cache.misses) == (2, 2)
+
+    client.patch("/api/v1/departments/1", json={"name": "renamed"})
+    assert client.get("/api/v1/departments/1").json()["name"] == "renamed"
+    assert client.get("/api/v1/departments/").json()[0]["name"] == "renamed"
+
+    # Moving a user changes the users embedded in both departments
+    user_ids = {u["user_id"] for u in client.get("/api/v1/departments/1").json()["users"]}
+    moved = next(iter(user_ids))
+    client.patch(f"/api/v1/users/{moved}", json={"department_id": 2})
+    assert moved not in {u["user_id"] for u in client.get("/api/v1/departments/1").json()["users"]}
+    assert moved in {u["user_id"] for u in client.get("/api/v1/departments/2").json()["users"]}
+
+    assert client.get("/health").json()["cache"]["hits"] == reference_cache.hits
+
+
+def test_workstation_types_invalidated_on_create(client, inventory):
+    assert len(client.get("/api/v1/workstations/types/").json()) == 2
+    client.post("/api/v1/workstations/types/", json={"workstation_type": "Type3"})
+    assert len(client.get("/api/v1/workstations/types/").json()) == 3
+
+
+def test_invalidation_during_a_load_is_not_overwritten():
+    cache = Cache(MemoryBackend(), ttl=60)
+    loading, write_done = asyncio.Event(), asyncio.Event()
+
+    async def slow_loader():
+        loading.set()
+        await write_done.wait()
+        return "stale"
+
+    async def write():
+        await loading.wait()
+        cache.invalidate_prefix("departments:detail")
+        write_done.set()
+
+    async def run():
+        value, _ = await asyncio.gather(cache.get_or_load("departments:detail:1", slow_loader), write())
+        assert value == "stale"
+        # The result read before the write is not kept; the next read loads again
+        assert await cache.get_or_load("departments:detail:1", lambda: asyncio.sleep(0, "fresh")) == "fresh"
+        assert await cache.get_or_load("departments:detail:1", lambda: asyncio.sleep(0, "unused")) == "fresh"
+
+    asyncio.run(run())
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.changes import ChangeFeed, change_events
+from byocruda.core.config import settings
+from byocruda.core.database import create_async_db_engine
+from byocruda.models.models import User
+
+# The inventory fixture logs 6 users and 25 workstations
+INVENTORY_SEQ = 31
+
+
+def test_writes_are_logged_and_read_back_since_a_seq(client, inventory):
+    start = client.get("/api/v1/changes/")
+    assert start.json() == [] and start.headers["x-change-seq"] == str(INVENTORY_SEQ)
+
+    client.patch("/api/v1/users/1", json={"name": "Renamed"})
+    client.delete("/api/v1/workstations/25")
+    changes = client.get("/api/v1/changes/", params={"since": INVENTORY_SEQ})
+    assert [(c["seq"], c["table_name"], c["row_id"], c["operation"]) for c in changes.json()] == [
+        (32, "users", 1, "update"),
+        (33, "workstations", 25, "delete"),
+    ]
+    assert changes.headers["x-change-seq"] == "33"
+
+    users = client.get("/api/v1/changes/", params={"since": INVENTORY_SEQ, "tables": "users"})
+    assert [c["seq"] for c in users.json()] == [32] and users.headers["x-change-seq"] == "33"
+    page = client.get("/api/v1/changes/", params={"since": 0, "limit": 2})
+    assert page.headers["x-change-seq"] == "2"
+    assert client.get("/api/v1/changes/", params={"tables": "passwords"}).status_code == 400
+
+    # A position whose following changes were pruned cannot be resumed
+    inventory.execute(text("DELETE FROM changes WHERE seq < 20"))
+    inventory.commit()
+    assert client.get("/api/v1/changes/", params={"since": 5}).status_code == 410
+    assert client.get("/api/v1/changes/", params={"since": 19}).status_code == 200
+
+
+def test_position_stops_before_a_seq_that_may_still_commit(client, inventory, monkeypatch):
+    # On PostgreSQL a seq taken by a transaction not yet committed shows as a gap
+    log_change = text("INSERT INTO changes (seq, table_name, row_id, operation) VALUES (:seq, 'users', 1, 'update')")
+    inventory.execute(log_change, {"seq": INVENTORY_SEQ + 2})
+    inventory.commit()
+    changes = client.get("/api/v1/changes/", params={"since": INVENTORY_SEQ})
+    assert changes.json() == [] and changes.headers["x-change-seq"] == str(INVENTORY_SEQ)
+
+    inventory.execute(log_change, {"seq": INVENTORY_SEQ + 1})
+    inventory.commit()
+    changes = client.get("/api/v1/changes/", params={"since": INVENTORY_SEQ})
+    assert [c["seq"] for c in changes.json()] == [32, 33] and changes.headers["x-change-seq"] == "33"
+
+    # A gap older than gap_wait is taken as a rolled back transaction
+    inventory.execute(log_change, {"seq": INVENTORY_SEQ + 4})
+    inventory.commit()
+    monkeypatch.setattr(settings.changes, "gap_wait_seconds", 0)
+    assert client.get("/api/v1/changes/", params={"since": 33}).headers["x-change-seq"] == "35"
+
+
+def test_streams_catch_up_then_share_one_live_tail(session, inventory):
+    engine = create_async_db_engine()
+    feed = ChangeFeed(async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession), poll_interval=0.01)
+
+    async def stream():
+        replay = change_events(feed, INVENTORY_SEQ - 2, heartbeat_seconds=0.2)
+        live_users = change_events(feed, None, ["users"], heartbeat_seconds=5)
+        caught_up = [await anext(replay), await anext(replay)]
+        assert [event.splitlines()[0] for event in caught_up] == ["id: 30", "id: 31"]
+
+        waiting = asyncio.ensure_future(anext(live_users))
+        while feed.subscribers < 2:
+            await asyncio.sleep(0.01)
+        inventory.add(User(userDN="user7", name="User 7", department_id=1))
+        inventory.commit()
+        event = await asyncio.wait_for(anext(replay), 2)
+        assert event.startswith("id: 32\nevent: change\ndata: ")
+        data = json.loads(event.splitlines()[2].removeprefix("data: "))
+        assert (data["table_name"], data["row_id"], data["operation"]) == ("users", 7, "insert")
+        assert (await asyncio.wait_for(waiting, 2)) == event
+
+        # Idle streams get keep-alive comments
+        assert await asyncio.wait_for(anext(replay), 2) == ": keep-alive\n\n"
+        await replay.aclose()
+        await live_users.aclose()
+        assert feed.subscribers == 0
+        await feed.stop()
+        await engine.dispose()
+
+    asyncio.run(stream())
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+
+def test_detail_not_modified_until_updated(client, inventory):
+    first = client.get("/api/v1/workstations/1")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"') and "Last-Modified" in first.headers
+
+    cached = client.get("/api/v1/workstations/1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.patch("/api/v1/workstations/1", json={"notes": "moved"})
+    changed = client.get("/api/v1/workstations/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_detail_etag_covers_embedded_rows(client, inventory):
+    etag = client.get("/api/v1/workstations/1").headers["ETag"]
+    user_id = client.get("/api/v1/workstations/1").json()["user"]["user_id"]
+    client.patch(f"/api/v1/users/{user_id}", json={"name": "Renamed"})
+    assert client.get("/api/v1/workstations/1", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_page_etag(client, inventory):
+    page = client.get("/api/v1/users/?limit=3")
+    etag = page.headers["ETag"]
+    cached = client.get("/api/v1/users/?limit=3", headers={"If-None-Match": f'"other", {etag}'})
+    assert cached.status_code == 304
+    assert cached.headers["X-Next-Cursor"] == page.headers["X-Next-Cursor"]
+
+    # Rows outside the page do not invalidate it
+    client.patch("/api/v1/users/6", json={"name": "Renamed"})
+    assert client.get("/api/v1/users/?limit=3", headers={"If-None-Match": etag}).status_code == 304
+
+    # A new row entering the page does
+    etag = client.get("/api/v1/users/?limit=3&sort=-user_id").headers["ETag"]
+    client.post("/api/v1/users/", json={"userDN": "user7", "name": "User 7", "department_id": 1})
+    assert client.get("/api/v1/users/?limit=3&sort=-user_id", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_if_modified_since(client, inventory):
+    last_modified = client.get("/api/v1/users/1").headers["Last-Modified"]
+    assert client.get("/api/v1/users/1", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    assert client.get("/api/v1/users/1", headers={"If-Modified-Since": earlier}).status_code == 200
+    # If-None-Match wins over If-Modified-Since
+    headers = {"If-Modified-Since": last_modified, "If-None-Match": '"stale"'}
+    assert client.get("/api/v1/users/1", headers=headers).status_code == 200
+
+
+def test_list_pages_have_no_last_modified(client, inventory):
+    # A deleted row leaves the newest updated_at of the page as it was
+    first = client.get("/api/v1/workstations/?limit=5")
+    assert "Last-Modified" not in first.headers
+    since = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    client.delete("/api/v1/workstations/2")
+    page = client.get("/api/v1/workstations/?limit=5", headers={"If-Modified-Since": since})
+    assert page.status_code == 200 and 2 not in [w["workstation_id"] for w in page.json()]
+
+
+def test_cached_department_validators(client, inventory):
+    etag = client.get("/api/v1/departments/1").headers["ETag"]
+    assert client.get("/api/v1/departments/1", headers={"If-None-Match": etag}).status_code == 304
+    list_etag = client.get("/api/v1/departments/").headers["ETag"]
+    assert client.get("/api/v1/departments/", headers={"If-None-Match": list_etag}).status_code == 304
+
+    client.patch("/api/v1/departments/1", json={"name": "renamed"})
+    assert client.get("/api/v1/departments/1", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/v1/departments/", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_bulk_upsert_bumps_version(client, inventory, session):
+    from byocruda.models.models import User
+
+    etag = client.get("/api/v1/users/1").headers["ETag"]
+    response = client.post("/api/v1/users/bulk?upsert=true", json=[{"userDN": "user1", "name": "Bulk", "department_id": 2}])
+    assert response.json()["updated"] == 1
+    assert session.get(User, 1).version == 2
+    assert client.get("/api/v1/users/1", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,102 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+from byocruda.core.config import DatabaseSettings
+from byocruda.core.database import (
+    async_engine, create_db_engine, current_schema_fingerprint, engine, init_db, sqlite_pragmas
+)
+from byocruda.core.schema import stored_fingerprint
+
+
+def test_profile_is_overridden_by_explicit_keys():
+    database = DatabaseSettings.model_validate({
+        "url": "sqlite://", "echo": False, "profile": "read_heavy",
+        "pool": {"size": 3}, "sqlite": {"synchronous": "FULL"},
+    })
+    assert database.pool.size == 3
+    assert database.pool.max_overflow == 20
+    assert database.sqlite.synchronous == "FULL"
+    assert database.sqlite.mmap_size == 268435456
+
+
+def test_unknown_profile_and_invalid_pragma_are_rejected():
+    with pytest.raises(ValueError, match="Unknown database profile"):
+        DatabaseSettings.model_validate({"url": "sqlite://", "echo": False, "profile": "turbo"})
+    with pytest.raises(ValueError):
+        DatabaseSettings.model_validate({"url": "sqlite://", "echo": False, "sqlite": {"journal_mode": "WAL; DROP TABLE users"}})
+
+
+def test_no_profile_only_enables_foreign_keys():
+    assert sqlite_pragmas(DatabaseSettings(url="sqlite://", echo=False)) == ["PRAGMA foreign_keys=ON"]
+
+
+def test_pragmas_applied_to_both_engines(tmp_path):
+    # The test configuration uses the "dev" profile shipped in config.toml
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    async def async_pragmas():
+        async with async_engine.connect() as conn:
+            pragmas = (
+                (await conn.execute(text("PRAGMA synchronous"))).scalar(),
+                (await conn.execute(text("PRAGMA foreign_keys"))).scalar(),
+            )
+        # Pooled aiosqlite connections are bound to this event loop
+        await async_engine.dispose()
+        return pragmas
+    # synchronous NORMAL is 1
+    assert asyncio.run(async_pragmas()) == (1, 1)
+
+    database = DatabaseSettings(url=f"sqlite:///{tmp_path / 'bulk.db'}", echo=False, profile="bulk_load")
+    bulk_engine = create_db_engine(database)
+    with bulk_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 0
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -262144
+    assert bulk_engine.pool.size() == 2
+    bulk_engine.dispose()
+
+
+def test_init_db_skips_schema_creation_when_fingerprint_matches(session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    init_db()
+    with engine.connect() as conn:
+        assert stored_fingerprint(conn) == current_schema_fingerprint(conn.dialect)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        init_db()
+        # Only the fingerprint table is looked up; no table is reflected or created
+        assert [s for s in statements if "table_info" in s or s.lstrip().upper().startswith("CREATE")] == [
+            'PRAGMA main.table_info("schema_info")'
+        ]
+
+        # A schema changed since the fingerprint was stored is created again
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE stats_user_status"))
+            conn.execute(text("UPDATE schema_info SET fingerprint = 'outdated'"))
+        init_db()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    with engine.connect() as conn:
+        assert inspect(conn).has_table("stats_user_status")
+        assert stored_fingerprint(conn) == current_schema_fingerprint(conn.dialect)
+
+
+def test_cli_jobs_do_not_import_fastapi():
+    # A fresh interpreter: this one loaded FastAPI for the API tests long ago
+    modules = [
+        "byocruda.cli", "byocruda.core.database", "byocruda.core.imports",
+        "byocruda.core.seeding", "byocruda.core.search", "byocruda.core.stats",
+    ]
+    code = "; ".join(["import sys", *(f"import {module}" for module in modules), "print('fastapi' in sys.modules)"])
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-1] == "False"
@@ -0,0 +1,65 @@
+def test_create_and_patch_workstation(client, inventory):
+    response = client.post("/api/v1/workstations/", json={
+        "hostname": "new-ws", "type_id": 1, "user_id": 1, "department_id": 1, "video_ram_gb": 24
+    })
+    assert response.status_code == 200
+    workstation_id = response.json()["workstation_id"]
+
+    response = client.patch(f"/api/v1/workstations/{workstation_id}", json={"video_ram_gb": 48, "notes": "upgraded"})
+    assert response.status_code == 200
+    assert response.json()["video_ram_gb"] == 48
+    assert response.json()["notes"] == "upgraded"
+
+
+def test_detail_endpoints_include_relationships(client, inventory):
+    workstation = client.get("/api/v1/workstations/1").json()
+    assert workstation["user"]["user_id"] == workstation["user_id"]
+    assert workstation["department"]["department_id"] == workstation["department_id"]
+
+    user = client.get("/api/v1/users/1").json()
+    assert user["department"]["department_id"] == user["department_id"]
+    assert {w["user_id"] for w in user["workstations"]} == {1}
+    assert len(user["workstations"]) == 4
+
+    department = client.get("/api/v1/departments/1").json()
+    assert {u["department_id"] for u in department["users"]} == {1}
+
+
+def test_delete_and_not_found(client, inventory):
+    assert client.delete("/api/v1/workstations/25").json() == {"deleted": True}
+    assert client.get("/api/v1/workstations/25").status_code == 404
+    assert client.patch("/api/v1/users/999", json={"name": "x"}).status_code == 404
+    assert client.delete("/api/v1/departments/999").status_code == 404
+
+
+def test_expand_loads_relationships_in_batches(client, inventory):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Reads may be served by the primary or a replica
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        response = client.get("/api/v1/workstations/", params={"expand": "user,department,workstation_type", "limit": 20})
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert len(rows) == 20
+    assert all(w["user"]["user_id"] == w["user_id"] for w in rows)
+    assert all(w["workstation_type"]["workstation_type_id"] == w["type_id"] for w in rows)
+    # One query for the page plus one per expanded relationship, regardless of page size
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 4
+
+
+def test_list_without_expand_omits_relationships(client, inventory):
+    rows = client.get("/api/v1/users/", params={"expand": "workstations"}).json()
+    assert sum(len(u["workstations"]) for u in rows) == 25
+    assert "department" not in rows[0]
+    assert "users" not in client.get("/api/v1/departments/").json()[0]
+    assert client.get("/api/v1/workstations/", params={"expand": "notes"}).status_code == 400
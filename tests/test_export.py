@@ -0,0 +1,29 @@
+import csv
+import io
+import json
+
+
+def test_export_ndjson_streams_every_row(client, inventory):
+    response = client.get("/api/v1/workstations/export", params={"sort": "-hostname"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 25
+    assert rows[0]["hostname"] == "ws025"
+    assert set(rows[0]) == {
+        "workstation_id", "hostname", "type_id", "user_id", "department_id", "date_of_arrival", "video_ram_gb",
+        "system_ram_gb", "total_storage_tb", "hardware_description", "reserved", "notes",
+    }
+
+
+def test_export_csv(client, inventory):
+    response = client.get("/api/v1/users/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="users.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["userDN"] for r in rows] == [f"user{i}" for i in range(1, 7)]
+
+
+def test_export_rejects_unknown_format_and_sort(client, inventory):
+    assert client.get("/api/v1/departments/export", params={"format": "xml"}).status_code == 422
+    assert client.get("/api/v1/departments/export", params={"sort": "notes"}).status_code == 400
@@ -0,0 +1,58 @@
+import json
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def test_list_selects_and_returns_only_requested_fields(client, inventory):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Reads may go to the primary or a replica engine
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/workstations/", params={"fields": "hostname,user_id", "limit": 3})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.json() == [
+        {"workstation_id": 1, "hostname": "ws001", "user_id": 2},
+        {"workstation_id": 2, "hostname": "ws002", "user_id": 3},
+        {"workstation_id": 3, "hostname": "ws003", "user_id": 4},
+    ]
+    select = next(s for s in statements if "FROM workstations" in s)
+    assert "hardware_description" not in select and "notes" not in select
+
+    # Keyset paging sorted by a column that is not returned still yields a cursor
+    page = client.get("/api/v1/workstations/", params={"fields": "user_id", "sort": "-hostname", "limit": 2})
+    assert [row["workstation_id"] for row in page.json()] == [25, 24]
+    assert list(page.json()[0]) == ["workstation_id", "user_id"]
+    following = client.get("/api/v1/workstations/", params={
+        "fields": "user_id", "sort": "-hostname", "limit": 2, "cursor": page.headers["x-next-cursor"],
+    })
+    assert [row["workstation_id"] for row in following.json()] == [23, 22]
+
+    # Projected pages are still conditional
+    etag = client.get("/api/v1/users/", params={"fields": "name"}).headers["etag"]
+    assert client.get("/api/v1/users/", params={"fields": "name"}, headers={"If-None-Match": etag}).status_code == 304
+    departments = client.get("/api/v1/departments/", params={"fields": "name", "sort": "name"}).json()
+    assert departments[0] == {"department_id": 1, "name": "department1"}
+
+
+def test_detail_and_export_fields(client, inventory):
+    assert client.get("/api/v1/users/1", params={"fields": "userDN"}).json() == {"user_id": 1, "userDN": "user1"}
+    assert client.get("/api/v1/departments/2", params={"fields": "name"}).json() == {"department_id": 2, "name": "department2"}
+    assert client.get("/api/v1/workstations/999", params={"fields": "hostname"}).status_code == 404
+
+    lines = client.get("/api/v1/workstations/export", params={"fields": "hostname"}).text.splitlines()
+    assert json.loads(lines[0]) == {"workstation_id": 1, "hostname": "ws001"}
+    csv = client.get("/api/v1/users/export", params={"fields": "name", "format": "csv"}).text.splitlines()
+    assert csv[:2] == ["user_id,name", "1,User 1"]
+
+
+def test_unknown_fields_and_expand_are_rejected(client, inventory):
+    response = client.get("/api/v1/workstations/", params={"fields": "hostname,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["error"]["message"]
+    assert client.get("/api/v1/users/", params={"fields": "name", "expand": "department"}).status_code == 400
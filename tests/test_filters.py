@@ -0,0 +1,65 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def test_filters_match_client_side_filtering(client, inventory):
+    everything = client.get("/api/v1/workstations/").json()
+    expected = [
+        w["hostname"] for w in everything
+        if w["department_id"] == 3 and w["type_id"] in (1, 2) and (w["video_ram_gb"] or 0) >= 16
+    ]
+    rows = client.get(
+        "/api/v1/workstations/",
+        params={"department_id": 3, "type_id__in": "1,2", "video_ram_gb__gte": 16},
+    ).json()
+    assert [w["hostname"] for w in rows] == expected
+    assert expected
+
+    users = client.get("/api/v1/users/", params={"department_id": 2}).json()
+    assert {u["userDN"] for u in users} == {"user1", "user4"}
+
+
+def test_filtered_keyset_pages(client, inventory):
+    params = {"system_ram_gb__lte": 32, "sort": "-system_ram_gb", "limit": 4}
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/v1/workstations/", params={**params, **({"cursor": cursor} if cursor else {})})
+        seen += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len({w["workstation_id"] for w in seen}) == 17
+    assert [w["system_ram_gb"] for w in seen] == sorted((w["system_ram_gb"] for w in seen), reverse=True)
+
+
+def test_invalid_filters(client, inventory):
+    assert client.get("/api/v1/workstations/", params={"video_ram_gb__gte": "lots"}).status_code == 422
+    assert client.get("/api/v1/workstations/", params={"type_id__in": "1,x"}).status_code == 400
+    # Filters are documented as typed query parameters
+    parameters = client.app.openapi()["paths"]["/api/v1/workstations/"]["get"]["parameters"]
+    assert {"name": "video_ram_gb__gte", "type": "integer"} in [
+        {"name": p["name"], "type": p["schema"].get("anyOf", [{}])[0].get("type")} for p in parameters
+    ]
+
+
+def test_common_filter_uses_composite_index(client, inventory, session):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM workstations" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        client.get(
+            "/api/v1/workstations/",
+            params={"video_ram_gb__gte": 24, "department_id": 3, "type_id": 2, "sort": "system_ram_gb"},
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[0]
+    connection = session.connection().connection.dbapi_connection
+    plan = " | ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+    assert "USING INDEX ix_workstations_department_type_" in plan, plan
+    assert "SCAN workstations" not in plan.replace("SCAN workstations USING", ""), plan
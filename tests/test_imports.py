@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+
+CSV = """hostname,userDN,department,workstation_type,video_ram_gb,notes
+imp001,user1,department1,Type1,24,
+imp002,user2,department2,Type2,,spare
+imp003,user3,nowhere,Type1,8,
+imp004,user4,department1,Type1,lots,
+imp005,user5,department3,Type2,48,
+"""
+
+
+def test_import_csv_through_upload_endpoint(client, inventory):
+    response = client.post(
+        "/api/v1/imports/workstations",
+        params={"format": "csv"},
+        content=CSV,
+    )
+    assert response.status_code == 202
+    job_id = response.json()["import_job_id"]
+
+    # The background task has run by the time the test client returns
+    job = client.get(f"/api/v1/imports/{job_id}").json()
+    assert job["status"] == "completed"
+    assert (job["processed_rows"], job["imported_rows"], job["failed_rows"]) == (5, 3, 2)
+    assert job["bytes_processed"] == job["bytes_total"] == len(CSV)
+
+    errors = client.get(f"/api/v1/imports/{job_id}/errors").json()
+    assert [e["row_number"] for e in errors] == [3, 4]
+    assert "Unknown department 'nowhere'" in errors[0]["error"]
+    assert "video_ram_gb" in errors[1]["error"]
+
+    imported = client.get("/api/v1/workstations/", params={"sort": "hostname", "limit": 3}).json()
+    assert [w["hostname"] for w in imported] == ["imp001", "imp002", "imp005"]
+    workstation = imported[2]
+    assert (workstation["department_id"], workstation["type_id"], workstation["user_id"]) == (3, 2, 5)
+
+
+def test_import_ndjson_from_cli(tmp_path, inventory):
+    from byocruda.cli import main
+
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join([
+        json.dumps({"userDN": "cli1", "name": "Cli One", "department": "department2"}),
+        "not json",
+        json.dumps({"userDN": "user1", "name": "Renamed", "department_id": 1}),
+    ]))
+    assert main(["import", "users", str(path), "--chunk-size", "2"]) == 0
+
+    from sqlmodel import select
+    from byocruda.models.models import ImportJob, User
+    job = inventory.exec(select(ImportJob)).one()
+    assert (job.imported_rows, job.failed_rows) == (1, 2)
+    assert inventory.exec(select(User).where(User.userDN == "cli1")).one().department_id == 2
+
+    assert main(["import", "users", str(path), "--upsert"]) == 0
+    inventory.expire_all()
+    assert inventory.exec(select(User).where(User.userDN == "user1")).one().name == "Renamed"
+
+
+def test_failed_jobs_end_failed_and_leave_no_spooled_file(client, inventory, tmp_path, monkeypatch):
+    from byocruda.api.v1.endpoints import imports as endpoint
+    from byocruda.core import imports
+    from byocruda.core.config import settings
+
+    monkeypatch.setattr(settings.imports, "upload_dir", str(tmp_path))
+    # Fails before the first chunk, outside the per-chunk handling
+    monkeypatch.delitem(imports.IMPORT_RESOURCES, "workstations")
+    job = client.post("/api/v1/imports/workstations", params={"format": "csv"}, content=CSV).json()
+    job = client.get(f"/api/v1/imports/{job['import_job_id']}").json()
+    assert job["status"] == "failed" and "workstations" in job["error"]
+    assert list(tmp_path.iterdir()) == []
+
+    def no_job(*args):
+        raise RuntimeError("database is down")
+    monkeypatch.setattr(endpoint, "create_import_job", no_job)
+    with pytest.raises(RuntimeError):
+        client.post("/api/v1/imports/users", params={"format": "csv"}, content=CSV)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_missing_job_is_skipped(tmp_path, inventory):
+    from byocruda.core.imports import run_import_job
+
+    path = tmp_path / "users.csv"
+    path.write_text(CSV)
+    assert run_import_job(999, path, remove_file=True) is None
+    assert not path.exists()
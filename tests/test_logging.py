@@ -0,0 +1,58 @@
+import json
+import time
+from contextlib import contextmanager
+
+from byocruda.core.config import settings
+from byocruda.core.logging import log, setup_logging
+
+
+@contextmanager
+def logging_settings(**changes):
+    """Reconfigure the sinks with changed [logging] settings, restoring them afterwards."""
+    original = settings.logging
+    settings.logging = original.model_copy(update=changes)
+    try:
+        setup_logging()
+        yield
+    finally:
+        log.complete()
+        settings.logging = original
+        setup_logging()
+
+
+def read_json_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_production_mode_queues_json_and_rate_limits(tmp_path):
+    path = tmp_path / "app.log"
+    with logging_settings(mode="production", file_path=str(path), rate_limit_burst=3, rate_limit_window_seconds=0.2):
+        for i in range(11):
+            if i == 10:
+                time.sleep(0.25)
+            log.info("Processed item {}", i, job="import")
+        log.complete()
+        records = read_json_lines(path)
+
+    assert [r["message"] for r in records] == [
+        "Processed item 0", "Processed item 1", "Processed item 2",
+        "Processed item 10 (7 similar messages suppressed)",
+    ]
+    assert records[0]["level"] == "INFO" and records[0]["job"] == "import"
+    assert not any(key.startswith("_") for key in records[0])
+
+
+def test_sampling_by_route_keeps_warnings(client, tmp_path):
+    path = tmp_path / "app.log"
+    with logging_settings(file_path=str(path), json_output=True, sample_rates={"/": 0.0, "/api/v1/users/{user_id}": 0.0}):
+        client.get("/")
+        client.get("/health")
+        client.get("/api/v1/users/999")
+        records = read_json_lines(path)
+
+    messages = [r["message"] for r in records]
+    assert "Root endpoint accessed" not in messages
+    assert "Health check performed" in messages
+    # Errors are never sampled away, and carry the request they belong to
+    error = next(r for r in records if r["message"] == "HTTP error occurred: 404 - User not found")
+    assert (error["method"], error["path"]) == ("GET", "/api/v1/users/999")
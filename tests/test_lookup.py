@@ -0,0 +1,50 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from byocruda.core.config import settings
+
+
+def test_batch_by_ids_reports_missing_in_one_query_per_chunk(client, inventory, monkeypatch):
+    monkeypatch.setattr(settings.lookup, "chunk_size", 2)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM workstations" in statement:
+            statements.append(statement)
+
+    # Reads may go to the primary or a replica engine
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/workstations/batch", params={"ids": "3,999,1,3,2", "fields": "hostname"})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json() == {
+        "found": [
+            {"workstation_id": 3, "hostname": "ws003"},
+            {"workstation_id": 1, "hostname": "ws001"},
+            {"workstation_id": 2, "hostname": "ws002"},
+        ],
+        "missing": [999],
+    }
+    # Four distinct ids in chunks of two
+    assert len(statements) == 2 and all(" IN (" in statement for statement in statements)
+
+    users = client.get("/api/v1/users/batch", params={"ids": "2"}).json()
+    assert users["found"][0]["userDN"] == "user2" and users["missing"] == []
+
+
+def test_lookup_by_natural_keys(client, inventory):
+    response = client.post("/api/v1/workstations/lookup", json={"hostname": ["ws010", "nope", "ws002"]})
+    assert [row["hostname"] for row in response.json()["found"]] == ["ws010", "ws002"]
+    assert response.json()["missing"] == ["nope"]
+
+    response = client.post("/api/v1/users/lookup", params={"fields": "name"}, json={"userDN": ["user5", "user9"]})
+    assert response.json() == {"found": [{"user_id": 5, "name": "User 5"}], "missing": ["user9"]}
+
+
+def test_lookup_rejects_bad_input(client, inventory, monkeypatch):
+    assert client.get("/api/v1/workstations/batch", params={"ids": "1,x"}).status_code == 400
+    assert client.post("/api/v1/users/lookup", json={"userDN": []}).status_code == 400
+    monkeypatch.setattr(settings.lookup, "max_keys", 2)
+    assert client.get("/api/v1/users/batch", params={"ids": "1,2,3"}).status_code == 413
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from byocruda.core.metrics import Histogram, RequestMetrics, pool_status, readiness
+
+
+def test_histogram_buckets_are_inclusive_and_cumulative():
+    histogram = Histogram([0.1, 1])
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.count == 4 and histogram.sum == 3.65
+
+
+def test_metrics_endpoint_uses_route_templates(client, inventory):
+    from byocruda.core.metrics import request_metrics
+
+    request_metrics.clear()
+    for user_id in (1, 2, 999):
+        client.get(f"/api/v1/users/{user_id}")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'byocruda_http_requests_total{method="GET",route="/api/v1/users/{user_id}",status="200"} 2' in lines
+    assert 'byocruda_http_requests_total{method="GET",route="/api/v1/users/{user_id}",status="404"} 1' in lines
+    assert 'byocruda_http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in lines
+    assert 'byocruda_http_request_duration_seconds_bucket{method="GET",route="/api/v1/users/{user_id}",status="200",le="+Inf"} 2' in lines
+    size = next(l for l in lines if l.startswith('byocruda_http_response_size_bytes_sum{method="GET",route="/api/v1/users/{user_id}",status="200"}'))
+    assert float(size.split()[-1]) > 0
+    assert any(l.startswith('byocruda_db_pool_checked_out{pool="primary_async"}') for l in lines)
+
+
+def test_pool_status_counts_waiters():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=5)
+    held = engine.connect()
+    waiter = threading.Thread(target=lambda: engine.connect().close())
+    waiter.start()
+    try:
+        for _ in range(100):
+            if pool_status(engine.pool)["waiters"]:
+                break
+            time.sleep(0.01)
+        status = pool_status(engine.pool, capacity=1)
+        assert status == {"size": 1, "checked_out": 1, "overflow": 0, "waiters": 1, "saturation": 1.0}
+        assert readiness({"primary": status}, 0.9)["saturated_pools"] == ["primary"]
+    finally:
+        held.close()
+        waiter.join()
+        engine.dispose()
+    assert pool_status(engine.pool, capacity=1)["waiters"] == 0
+
+
+def test_health_reports_readiness(client, monkeypatch):
+    from byocruda.core.config import settings
+
+    body = client.get("/health").json()
+    assert body["readiness"]["ready"] is True
+    assert {"primary", "primary_async"} <= set(body["readiness"]["pools"])
+
+    monkeypatch.setattr(settings.metrics, "readiness_max_saturation", 0)
+    response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "saturated"
@@ -0,0 +1,54 @@
+import re
+
+from sqlalchemy import text
+
+from byocruda.core.queries import redact, statement_shape, track_queries
+
+
+def test_statement_shape_ignores_literals_and_list_lengths():
+    assert statement_shape("SELECT *\n  FROM users WHERE user_id IN (?, ?, ?) LIMIT 10") == \
+        statement_shape("SELECT * FROM users WHERE user_id IN (?) LIMIT 20")
+    assert statement_shape("SELECT * FROM users WHERE id = ?") != statement_shape("SELECT * FROM departments WHERE id = ?")
+
+
+def test_redact_keeps_types_only():
+    assert redact(("alice", 3)) == "(<str>, <int>)"
+    assert redact({"q": "secret"}) == "{q: <str>}"
+    assert redact([(1,), (2,)], executemany=True) == "<2 parameter sets>"
+
+
+def test_track_queries_flags_repeated_shapes(inventory):
+    from byocruda.core.database import engine
+
+    with track_queries() as stats, engine.connect() as connection:
+        for user_id in range(1, 7):
+            connection.execute(text(f"SELECT name FROM users WHERE user_id = {user_id}"))
+        connection.execute(text("SELECT count(*) FROM workstations"))
+    assert stats.count == 7
+    assert stats.seconds > 0
+    assert stats.repeated(5) == [("SELECT name FROM users WHERE user_id = N", 6)]
+    assert stats.repeated(6) == []
+
+
+def test_server_timing_header_counts_request_statements(client, inventory):
+    response = client.get("/api/v1/users/1")
+    match = re.fullmatch(r'db;dur=([\d.]+);desc="(\d+) queries"', response.headers["server-timing"])
+    # The user, then its department and workstations loaded with selectin
+    assert match and int(match.group(2)) == 3
+
+
+def test_slow_queries_are_logged_without_parameters(inventory, monkeypatch):
+    from byocruda.core.config import settings
+    from byocruda.core.database import engine
+    from byocruda.core.logging import log
+
+    records = []
+    sink = log.add(records.append, filter=lambda record: "slow_query" in record["extra"], format="{message}")
+    monkeypatch.setattr(settings.database.instrumentation, "slow_query_ms", 0.000001)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT user_id FROM users WHERE userDN = :dn"), {"dn": "user1"})
+    finally:
+        log.remove(sink)
+    assert any("WHERE userDN = ? | (<str>)" in record for record in records)
+    assert not any("user1" in record for record in records)
@@ -0,0 +1,100 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from byocruda.core.database import AsyncSessionLocal, create_replica_engines, replica_engines, replica_router
+from byocruda.core.replicas import READ_YOUR_WRITES_COOKIE, Replica, ReplicaRouter
+
+
+def test_reads_use_replica_and_writes_make_reads_sticky(client, inventory):
+    replica = replica_router.replicas[0]
+    assert "mode=ro" in replica.name
+
+    statements = []
+    replica_engine = replica_engines[0].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(replica_engine, "before_cursor_execute", listener)
+    try:
+        fresh = TestClient(client.app)
+        assert fresh.get("/api/v1/users/1").status_code == 200
+        assert READ_YOUR_WRITES_COOKIE not in fresh.cookies
+        assert statements
+        statements.clear()
+
+        response = fresh.patch("/api/v1/users/1", json={"name": "Renamed"})
+        assert response.status_code == 200
+        assert READ_YOUR_WRITES_COOKIE in response.cookies
+        assert fresh.get("/api/v1/users/1").json()["name"] == "Renamed"
+        assert statements == []
+    finally:
+        event.remove(replica_engine, "before_cursor_execute", listener)
+
+
+def test_replica_is_read_only(inventory):
+    replica_engine = create_replica_engines()[0]
+
+    async def write_on_replica():
+        try:
+            async with replica_engine.begin() as conn:
+                await conn.execute(text("DELETE FROM workstations"))
+        except Exception as e:
+            return str(e)
+        finally:
+            await replica_engine.dispose()
+    assert "readonly" in asyncio.run(write_on_replica())
+
+
+def test_selection_and_fallback(tmp_path):
+    engines = []
+
+    def sessionmaker(url):
+        engines.append(create_async_engine(url))
+        return async_sessionmaker(bind=engines[-1], class_=AsyncSession)
+
+    ok = [Replica(f"r{i}", sessionmaker(f"sqlite+aiosqlite:///{tmp_path / 'ok.db'}")) for i in range(2)]
+    router = ReplicaRouter(AsyncSessionLocal, ok)
+    assert [router.choose().name for _ in range(3)] == ["r0", "r1", "r0"]
+
+    ok[0].in_use = 2
+    router.selection = "least_busy"
+    assert router.choose().name == "r1"
+
+    broken = Replica("broken", sessionmaker(f"sqlite+aiosqlite:///file:{tmp_path / 'missing.db'}?mode=ro&uri=true"))
+    router = ReplicaRouter(AsyncSessionLocal, [broken], retry_seconds=60)
+
+    async def read():
+        async with router.session() as session:
+            on_primary = session.bind is AsyncSessionLocal.kw["bind"]
+        for engine in [*engines, AsyncSessionLocal.kw["bind"]]:
+            await engine.dispose()
+        return on_primary
+    # The missing file cannot be opened read-only, so the primary answers
+    assert asyncio.run(read()) is True
+    assert router.healthy() == []
+    assert router.stats() == [{"name": "broken", "healthy": False, "in_use": 0}]
+
+
+def test_cache_fills_and_own_exports_read_the_primary(client, inventory):
+    statements = []
+    replica_engine = replica_engines[0].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(replica_engine, "before_cursor_execute", listener)
+    try:
+        # Cached entries are shared by all clients, so even a client without the cookie fills them from the primary
+        fresh = TestClient(client.app)
+        assert fresh.get("/api/v1/departments/1").status_code == 200
+        assert fresh.get("/api/v1/departments/").status_code == 200
+        assert fresh.get("/api/v1/workstations/types/").status_code == 200
+        assert statements == []
+
+        assert fresh.get("/api/v1/users/export").status_code == 200
+        assert statements
+        statements.clear()
+        fresh.patch("/api/v1/users/1", json={"name": "Renamed"})
+        assert "Renamed" in fresh.get("/api/v1/users/export").text
+        assert statements == []
+    finally:
+        event.remove(replica_engine, "before_cursor_execute", listener)
@@ -0,0 +1,63 @@
+from sqlalchemy.dialects import postgresql
+
+from byocruda.core.search import _postgresql_search, fts5_query, search_index_statements
+
+
+def test_fts5_query_quotes_user_input():
+    assert fts5_query('RTX 40') == '"RTX" "40"*'
+    assert fts5_query('fan" OR x') == '"fan""" "OR" "x"*'
+
+
+def test_postgresql_sql_quotes_mixed_case_columns():
+    # Unquoted, PostgreSQL folds userDN to a userdn column that does not exist
+    statements = [
+        *search_index_statements("postgresql"),
+        str(_postgresql_search(["users", "workstations"], 20, 0).compile(dialect=postgresql.dialect())),
+    ]
+    for statement in statements:
+        assert "coalesce(userDN" not in statement
+    assert all('coalesce("userDN", \'\')' in statement for statement in statements if "users" in statement)
+    assert 'coalesce(hostname' in statements[0]
+
+
+def test_search_ranks_and_tracks_writes(client, inventory):
+    client.patch("/api/v1/workstations/3", json={"hardware_description": "Dual RTX 4090, 128 GB", "notes": "broken fan"})
+    client.patch("/api/v1/workstations/4", json={"notes": "replaced the RTX 4090 fan"})
+    client.patch("/api/v1/users/2", json={"office_location": "Building C, room 4090"})
+    client.post("/api/v1/workstations/", json={"hostname": "rtx-render", "type_id": 1, "user_id": 1, "department_id": 1})
+
+    results = client.get("/api/v1/search/", params={"q": "rtx 4090"}).json()
+    assert {(r["kind"], r["id"]) for r in results} == {("workstations", 3), ("workstations", 4)}
+    assert results[0]["score"] >= results[1]["score"] > 0
+    assert all("[RTX]" in r["snippet"] for r in results)
+    # Title (hostname) hits outrank body hits
+    assert client.get("/api/v1/search/", params={"q": "rtx"}).json()[0]["title"] == "rtx-render"
+
+    # Prefix match on the last word, title match on the hostname
+    assert {r["title"] for r in client.get("/api/v1/search/", params={"q": "rtx-ren"}).json()} == {"rtx-render"}
+    users = client.get("/api/v1/search/", params={"q": "building", "kind": "users"}).json()
+    assert [(r["kind"], r["id"]) for r in users] == [("users", 2)]
+    assert client.get("/api/v1/search/", params={"q": "4090", "kind": "users"}).json()[0]["id"] == 2
+
+    client.patch("/api/v1/workstations/4", json={"notes": "fine"})
+    client.delete("/api/v1/workstations/3")
+    assert client.get("/api/v1/search/", params={"q": "rtx 4090"}).json() == []
+
+
+def test_search_pagination_and_validation(client, inventory):
+    pages = [client.get("/api/v1/search/", params={"q": "ws0", "limit": 10, "offset": offset}).json() for offset in (0, 10, 20)]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert len({r["id"] for page in pages for r in page}) == 25
+    assert client.get("/api/v1/search/", params={"q": ""}).status_code == 422
+    assert client.get("/api/v1/search/", params={"q": 'unbalanced "quote'}).status_code == 200
+
+
+def test_rebuild_search_index(session, inventory):
+    from sqlalchemy import text
+    from byocruda.core.database import engine
+    from byocruda.core.search import SEARCH_TABLE, rebuild_search_index
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        rebuild_search_index(connection)
+        assert connection.execute(text(f"SELECT count(*) FROM {SEARCH_TABLE}")).scalar() == 31
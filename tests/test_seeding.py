@@ -0,0 +1,83 @@
+import hashlib
+
+import pytest
+from sqlalchemy import text
+
+from byocruda.cli import main
+from byocruda.core import seeding
+from byocruda.core.seeding import SeedPlan, seed_database
+
+
+def index_count(connection) -> int:
+    return connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'")).scalar()
+
+
+def table_digest(connection, table: str) -> str:
+    rows = connection.execute(text(f"SELECT * FROM {table} ORDER BY 1")).all()
+    return hashlib.sha1(repr(rows).encode()).hexdigest()
+
+
+def test_seeding_is_deterministic_and_consistent(session):
+    from byocruda.core.database import engine
+
+    plan = SeedPlan(500, users=120, departments=7, workstation_types=4)
+    counts = seed_database(engine, plan, seed=3, chunk_size=64)
+    assert counts == {"departments": 7, "workstation_types": 4, "users": 120, "workstations": 500}
+    with engine.connect() as connection:
+        first = {table: table_digest(connection, table) for table in ("users", "workstations")}
+        indexes = index_count(connection)
+        # Every workstation is in its user's department; foreign keys all resolve
+        assert connection.execute(text(
+            "SELECT count(*) FROM workstations w JOIN users u ON u.user_id = w.user_id "
+            "JOIN departments d ON d.department_id = w.department_id "
+            "JOIN workstation_types t ON t.workstation_type_id = w.type_id "
+            "WHERE w.department_id = u.department_id"
+        )).scalar() == 500
+        assert connection.execute(text("PRAGMA foreign_key_check")).all() == []
+        # Search index and statistics were rebuilt after the load
+        assert connection.execute(text("SELECT count(*) FROM search_index")).scalar() == 620
+        assert connection.execute(text("SELECT sum(workstations), sum(users) FROM stats_departments")).one() == (500, 120)
+
+    seed_database(engine, plan, seed=3, chunk_size=500, drop_indexes=True)
+    with engine.connect() as connection:
+        assert {table: table_digest(connection, table) for table in ("users", "workstations")} == first
+        assert index_count(connection) == indexes > 0
+
+    seed_database(engine, plan, seed=4)
+    with engine.connect() as connection:
+        assert table_digest(connection, "workstations") != first["workstations"]
+
+
+def test_triggers_are_restored_after_seeding(client):
+    from byocruda.core.database import engine
+
+    seed_database(engine, SeedPlan(50, users=10, departments=2, workstation_types=2))
+    client.post("/api/v1/workstations/", json={"hostname": "after-seed", "type_id": 1, "user_id": 1, "department_id": 1})
+    assert client.get("/api/v1/stats/").json()["totals"]["workstations"] == 51
+    assert [r["title"] for r in client.get("/api/v1/search/", params={"q": "after-seed"}).json()] == ["after-seed"]
+
+
+def test_failed_seed_restores_triggers_and_indexes(session, monkeypatch):
+    from byocruda.core.database import engine
+
+    with engine.connect() as connection:
+        indexes = index_count(connection)
+        triggers = connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar()
+    insert = seeding._insert
+
+    def failing_insert(connection, table, columns):
+        if table.name == "workstations":
+            raise RuntimeError("disk full")
+        insert(connection, table, columns)
+    monkeypatch.setattr(seeding, "_insert", failing_insert)
+
+    with pytest.raises(RuntimeError):
+        seed_database(engine, SeedPlan(50, users=10, departments=2, workstation_types=2), drop_indexes=True)
+    with engine.connect() as connection:
+        assert index_count(connection) == indexes
+        assert connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar() == triggers
+
+
+def test_seed_command_requires_confirmation(capsys):
+    assert main(["seed", "--workstations", "10"]) == 2
+    assert "--yes" in capsys.readouterr().err
@@ -0,0 +1,57 @@
+import pytest
+
+from byocruda.core.config import settings
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/workstations/?limit=10",
+    "/api/v1/workstations/?limit=7&sort=-video_ram_gb",
+    "/api/v1/users/?limit=4&sort=name",
+])
+def test_fast_path_matches_regular_path(client, inventory, monkeypatch, path):
+    regular = client.get(path)
+    monkeypatch.setattr(settings.api, "fast_responses", True)
+    fast = client.get(path)
+
+    assert fast.status_code == 200
+    assert fast.json() == regular.json()
+    for header in ("ETag", "Last-Modified", "X-Next-Cursor"):
+        assert fast.headers.get(header) == regular.headers.get(header)
+
+    following = client.get(path, params={"cursor": fast.headers["X-Next-Cursor"]})
+    monkeypatch.setattr(settings.api, "fast_responses", False)
+    assert following.json() == client.get(path, params={"cursor": fast.headers["X-Next-Cursor"]}).json()
+
+
+def test_fast_path_conditional_and_expand(client, inventory, monkeypatch):
+    monkeypatch.setattr(settings.api, "fast_responses", True)
+    etag = client.get("/api/v1/workstations/").headers["ETag"]
+    assert client.get("/api/v1/workstations/", headers={"If-None-Match": etag}).status_code == 304
+    # Expanded pages keep using the regular path
+    assert "user" in client.get("/api/v1/workstations/?expand=user").json()[0]
+
+
+def test_fast_path_keeps_repeated_headers():
+    from fastapi import Response
+    from starlette.requests import Request
+
+    from byocruda.core.conditional import Validators, conditional_response
+    from byocruda.core.replicas import READ_YOUR_WRITES_COOKIE
+    from byocruda.core.serialization import fast_rows_response
+    from byocruda.models.models import UserPublic
+
+    response = Response()
+    # As FastAPI does for the response it injects into endpoints
+    del response.headers["content-length"]
+    response.set_cookie(READ_YOUR_WRITES_COOKIE, "1")
+    response.set_cookie("session", "abc")
+    assert len(fast_rows_response([], UserPublic, response).headers.getlist("set-cookie")) == 2
+
+    request = Request({"type": "http", "headers": [(b"if-none-match", b'W/"x"')]})
+    not_modified = conditional_response(request, response, Validators(etag='W/"x"'))
+    assert not_modified.status_code == 304 and len(not_modified.headers.getlist("set-cookie")) == 2
+
+
+def test_openapi_schema_unchanged(client):
+    schema = client.app.openapi()["paths"]["/api/v1/workstations/"]["get"]["responses"]["200"]
+    assert "WorkstationPublicExpanded" in str(schema)
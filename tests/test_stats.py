@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text
+
+from byocruda.core.database import engine
+from byocruda.core.stats import rebuild_stats
+
+
+def group_by_stats():
+    """The statistics computed directly from the source tables."""
+    with engine.connect() as conn:
+        departments = {
+            row.department_id: dict(row._mapping) for row in conn.execute(text(
+                "SELECT d.department_id, d.name,"
+                " (SELECT count(*) FROM workstations w WHERE w.department_id = d.department_id) AS workstations,"
+                " (SELECT count(*) FROM users u WHERE u.department_id = d.department_id) AS users,"
+                " (SELECT coalesce(sum(video_ram_gb), 0) FROM workstations w WHERE w.department_id = d.department_id) AS video_ram_gb,"
+                " (SELECT coalesce(sum(system_ram_gb), 0) FROM workstations w WHERE w.department_id = d.department_id) AS system_ram_gb,"
+                " (SELECT coalesce(sum(total_storage_tb), 0) FROM workstations w WHERE w.department_id = d.department_id) AS total_storage_tb"
+                " FROM departments d"
+            ))
+        }
+        types = dict(conn.execute(text(
+            "SELECT t.workstation_type_id, count(w.workstation_id) FROM workstation_types t"
+            " LEFT JOIN workstations w ON w.type_id = t.workstation_type_id GROUP BY t.workstation_type_id"
+        )).all())
+        statuses = dict(conn.execute(text("SELECT status, count(*) FROM users GROUP BY status")).all())
+    return departments, types, statuses
+
+
+def assert_consistent(stats):
+    departments, types, statuses = group_by_stats()
+    assert len(stats["departments"]) == len(departments)
+    for row in stats["departments"]:
+        assert row == pytest.approx(departments[row["department_id"]])
+    assert {t["type_id"]: t["workstations"] for t in stats["workstation_types"]} == types
+    assert {s["status"]: s["users"] for s in stats["users_by_status"]} == statuses
+    assert stats["totals"]["workstations"] == sum(types.values())
+
+
+def test_stats_follow_every_write_path(client, inventory):
+    assert_consistent(client.get("/api/v1/stats/").json())
+
+    client.patch("/api/v1/workstations/1", json={"department_id": 3, "type_id": 1, "video_ram_gb": 48, "total_storage_tb": 2.5})
+    client.patch("/api/v1/workstations/2", json={"notes": "no effect on stats"})
+    client.delete("/api/v1/workstations/5")
+    client.post("/api/v1/workstations/", json={"hostname": "new", "type_id": 2, "user_id": 1, "department_id": 1, "system_ram_gb": 256})
+    client.patch("/api/v1/users/3", json={"status": 0, "department_id": 1})
+    client.post("/api/v1/users/", json={"userDN": "user7", "name": "User 7", "department_id": 2})
+    client.patch("/api/v1/users/4", json={"status": None})
+    client.post("/api/v1/users/bulk?upsert=true", json=[
+        {"userDN": "user1", "name": "User 1", "department_id": 3, "status": 2},
+        {"userDN": "user9", "name": "User 9", "department_id": 3},
+    ])
+    client.post("/api/v1/workstations/bulk", json=[
+        {"hostname": f"bulk{i}", "type_id": 1, "user_id": 2, "department_id": 2, "video_ram_gb": 12, "total_storage_tb": 0.1}
+        for i in range(10)
+    ])
+    client.post("/api/v1/departments/", json={"name": "empty"})
+
+    stats = client.get("/api/v1/stats/").json()
+    assert_consistent(stats)
+    assert stats["totals"]["workstations"] == 35
+    assert {s["status"] for s in stats["users_by_status"]} == {None, 0, 1, 2}
+    assert stats["departments"][-1] == {
+        "department_id": 4, "name": "empty", "workstations": 0, "users": 0,
+        "video_ram_gb": 0, "system_ram_gb": 0, "total_storage_tb": 0,
+    }
+
+
+def test_rebuild_recomputes_from_scratch(client, inventory):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE stats_departments SET workstations = 999"))
+        conn.execute(text("DELETE FROM stats_user_status"))
+    with engine.begin() as conn:
+        rebuild_stats(conn)
+    assert_consistent(client.get("/api/v1/stats/").json())